@@ -0,0 +1,178 @@
+###################################################################################################################
+########################################### Ejecución completa del pipeline ######################################
+###################################################################################################################
+
+# Declara cada script del pipeline con sus entradas y salidas, y los ejecuta con utils/pipeline.py:
+# solo se vuelven a correr las etapas cuyo script, módulos o entradas cambiaron, y las independientes
+# (por ejemplo las visualizaciones 04.x de Apriori y los gráficos 04–08 de K-Means) corren en paralelo.
+#
+# Uso (desde la raíz del repositorio):
+#   python ejecutar_pipeline.py                      → todo el pipeline, omitiendo lo que está al día
+#   python ejecutar_pipeline.py "02. K-means/05*"    → solo esas etapas y las que necesitan antes
+#   python ejecutar_pipeline.py --forzar             → vuelve a correr todo
+#   python ejecutar_pipeline.py --listar             → muestra las etapas en orden y sus dependencias
+#
+# "01. A priori/02.2 actualizacion_incremental.py" no es una etapa: se corre a mano cuando llega un lote de órdenes
+# nuevas, y reescribe las reglas 03. / 07. y los estados 03a. / 07a. de las etapas de minería (02.3 también
+# reescribe 03. con EXPORTAR_REGLAS). Por eso esos archivos se declaran como salidas compartidas: la próxima
+# ejecución no vuelve a minar (lo que desharía el lote incorporado) y sí vuelve a correr lo que los lee.
+
+import argparse
+import fnmatch
+import sys
+
+from utils.pipeline import Etapa, dependencias, ejecutar, orden_topologico
+
+CRUDOS = "data/datos/"
+PROC = "data/procesados/"
+ALMACEN = PROC + "01b. almacen_transacciones/"
+
+# cluster.npy lo reescribe el cruce, por eso no forma parte de las salidas del preprocesamiento
+ALMACEN_BASE = [ALMACEN + f for f in ["offsets.npy", "productos.npy", "order_id.npy", "user_id.npy",
+                                      "dow.npy", "hora.npy", "productos.parquet", "meta.json"]]
+
+CARACTERISTICAS = [PROC + "02b. caracteristicas_clientes/" + f
+                   for f in ["user_id.npy", "caracteristicas.npy", "pca.npy", "meta.json"]]
+
+APRIORI = "scripts/01. A priori/"
+KMEANS = "scripts/02. K-means/"
+CRUCE = "scripts/03. Cruce Apriori y K-means/"
+
+SALIDA_APRIORI = "output/01. A priori/"
+SALIDA_VALIDACION = "output/02. K-means validacion/"
+SALIDA_KMEANS = "output/03. K-means/"
+SALIDA_CRUCE = "output/04. Cruce A priori y K-means/"
+
+ETAPAS = [
+    ################################ 01. A priori ################################
+    Etapa(APRIORI + "01. preprocessing.py",
+          entradas=[CRUDOS + f"{t}.csv" for t in ["orders", "order_products__prior", "order_products__train",
+                                                  "products", "departments", "aisles"]],
+          salidas=[PROC + "01. transacciones_apriori.parquet", PROC + "02. clientes_clustering.parquet"]
+          + ALMACEN_BASE),
+    Etapa(APRIORI + "01.1 traduccion_catalogo.py",
+          entradas=[CRUDOS + f"{t}.csv" for t in ["products", "aisles", "departments"]] + ALMACEN_BASE,
+          salidas=[PROC + "01c. catalogo_traducido.parquet"]),
+    Etapa(APRIORI + "02. analisis_apriori.py",
+          entradas=ALMACEN_BASE,
+          salidas=[PROC + "03. reglas_apriori.parquet", PROC + "03a. itemsets_apriori.parquet",
+                   PROC + "03a. itemsets_apriori.json"],
+          # Reescritas por 02.2 actualizacion_incremental.py (y 03. por 02.3 con EXPORTAR_REGLAS)
+          compartidas=[PROC + "03. reglas_apriori.parquet", PROC + "03a. itemsets_apriori.parquet",
+                       PROC + "03a. itemsets_apriori.json"]),
+    Etapa(APRIORI + "02.3 barrido_umbrales.py",
+          entradas=[PROC + "03a. itemsets_apriori.parquet", PROC + "03a. itemsets_apriori.json"],
+          salidas=[PROC + "03c. barrido_umbrales_reglas.parquet"]),
+    Etapa(APRIORI + "02.4 coocurrencia_productos.py",
+          entradas=ALMACEN_BASE + [ALMACEN + "cluster.npy"],
+          salidas=[PROC + "03d. pares_productos.parquet", PROC + "07d. pares_productos_cluster_*.parquet"]),
+    Etapa(APRIORI + "03. traductor_reglas_apriori.py",
+          entradas=[PROC + "03. reglas_apriori.parquet", PROC + "01c. catalogo_traducido.parquet"],
+          salidas=[PROC + "03T. diccionario_productos_apriori.parquet"]),
+    Etapa(APRIORI + "04.1 visualizacion_apriori.py",
+          entradas=[PROC + "03. reglas_apriori.parquet"],
+          salidas=[SALIDA_APRIORI + "01. apriori_reglas_de_asociacion.png"]),
+    Etapa(APRIORI + "04.2 visualizacion_red_apriori_amplio.py",
+          entradas=[PROC + "03. reglas_apriori.parquet", PROC + "03T. diccionario_productos_apriori.parquet"],
+          salidas=[SALIDA_APRIORI + "02. gráfico_de_reglas_red_amplio.png"]),
+    Etapa(APRIORI + "04.3 visualizacion_red_apriori_reducido.py",
+          entradas=[PROC + "03. reglas_apriori.parquet", PROC + "03T. diccionario_productos_apriori.parquet"],
+          salidas=[SALIDA_APRIORI + "03. gráfico_de_reglas_red_reducido.png"]),
+    Etapa(APRIORI + "04.4 visualizacion_apriori_barras.py",
+          entradas=[PROC + "03. reglas_apriori.parquet", PROC + "03T. diccionario_productos_apriori.parquet"],
+          salidas=[SALIDA_APRIORI + "04. apriori_grafico_de_barras.png"]),
+    Etapa(APRIORI + "04.5 visualizacion_apriori_heatmap.py",
+          entradas=[PROC + "03. reglas_apriori.parquet", PROC + "03T. diccionario_productos_apriori.parquet",
+                    PROC + "03d. pares_productos.parquet"],
+          salidas=[SALIDA_APRIORI + "05. apriori_matriz_de_calor.png"]),
+
+    ################################ 02. K-means ################################
+    # Modo "ordenes": orders.csv + almacén de transacciones en lugar de las líneas de 02. clientes_clustering
+    Etapa(KMEANS + "00. caracteristicas_clientes.py",
+          entradas=[PROC + "02. clientes_clustering.parquet"]
+          + [CRUDOS + f"{t}.csv" for t in ["orders", "products", "departments"]] + ALMACEN_BASE,
+          salidas=CARACTERISTICAS),
+    Etapa(KMEANS + "01. validación.py",
+          entradas=CARACTERISTICAS,
+          salidas=[SALIDA_VALIDACION + f for f in ["01.1 heatmap_correlacion_variables.png",
+                                                   "01.2 correlaciones_variables.csv",
+                                                   "01.3 metodo_del_codo.png",
+                                                   "01.4 silueta_por_k.png",
+                                                   "01.5 resumen_k_silueta_inercia.csv"]],
+          # Barrido de k con KMeans y silueta: no es solo dibujar
+          redibujable=False),
+    Etapa(KMEANS + "02. clustering_clientes.py",
+          entradas=CARACTERISTICAS,
+          salidas=[PROC + "04. clientes_clusterizados.parquet", PROC + "05. clientes_clusterizados_reducido.csv",
+                   SALIDA_KMEANS + "01. distribucion_clusters.png"]),
+    Etapa(KMEANS + "03. explo_validacion_modelo_PCA.py",
+          entradas=[PROC + "04. clientes_clusterizados.parquet", PROC + "02b. caracteristicas_clientes/pca.npy"],
+          salidas=[SALIDA_KMEANS + "01. Exporación del modelo . Distribución de clientes por clúster.png"]),
+    Etapa(KMEANS + "04. comport_compra_hora_promedio_por_cluster.py",
+          entradas=[PROC + "04. clientes_clusterizados.parquet"],
+          salidas=[SALIDA_KMEANS + "03. Comportamiento de compra. Promedio de hora de compra por clúster.png"]),
+    Etapa(KMEANS + "05. comport_compra _ número_de_pedidos_por_clúster.py",
+          entradas=[PROC + "04. clientes_clusterizados.parquet"],
+          salidas=[SALIDA_KMEANS + "04. Comportamiento de compra. Número de pedidos por clúster.png"]),
+    Etapa(KMEANS + "06. prefe_compra_departamento_más_comprado_por_clúster.py",
+          entradas=[PROC + "04. clientes_clusterizados.parquet"],
+          salidas=[SALIDA_KMEANS + "05.b Preferencias de compra. Departamento más comprado por clúster.png"]),
+    Etapa(KMEANS + "07. prefe_compra_proporción_compras_por_departamento.py",
+          entradas=[PROC + "04. clientes_clusterizados.parquet"],
+          salidas=[SALIDA_KMEANS + "06. Preferencias de compra. Proporción de compras por departamento por clúster.png"]),
+    Etapa(KMEANS + "08. perfil_agregado_radar_chart_por_cluster.py",
+          entradas=[PROC + "04. clientes_clusterizados.parquet"],
+          salidas=[SALIDA_KMEANS + "07. Perfil agregado. Radar Chart por clúster.png"]),
+    Etapa(KMEANS + "Prueba PCA 3d.py",
+          entradas=[PROC + "04. clientes_clusterizados.parquet", PROC + "02b. caracteristicas_clientes/pca.npy"],
+          salidas=[SALIDA_KMEANS + "Prueba PCA 3d.html"]),
+
+    ################################ 03. Cruce Apriori y K-means ################################
+    Etapa(CRUCE + "01. cruce_apriori_kmeans.py",
+          entradas=[ALMACEN + "user_id.npy", PROC + "04. clientes_clusterizados.parquet"],
+          salidas=[ALMACEN + "cluster.npy"]),
+    Etapa(CRUCE + "02. reglas_apriori_por_cluster.py",
+          entradas=ALMACEN_BASE + [ALMACEN + "cluster.npy"],
+          salidas=[PROC + "07. reglas_apriori_cluster_*.parquet", PROC + "07a. itemsets_apriori_cluster_*.parquet"],
+          # Reescritas por 02.2 actualizacion_incremental.py
+          compartidas=[PROC + "07. reglas_apriori_cluster_*.parquet",
+                       PROC + "07a. itemsets_apriori_cluster_*.parquet"]),
+    Etapa(CRUCE + "03. unir_reglas_apriori_clusters.py",
+          entradas=[PROC + "07. reglas_apriori_cluster_*.parquet"],
+          salidas=[PROC + "08. resumen_reglas_apriori_clusters.parquet"]),
+    Etapa(CRUCE + "04. traducir_resumen_reglas_clusters.py",
+          entradas=[PROC + "08. resumen_reglas_apriori_clusters.parquet", PROC + "01c. catalogo_traducido.parquet"],
+          salidas=[PROC + "08T. diccionario_productos_clusters.parquet"]),
+    Etapa(CRUCE + "05. top_reglas_por_cluster.py",
+          entradas=[PROC + "08. resumen_reglas_apriori_clusters.parquet",
+                    PROC + "08T. diccionario_productos_clusters.parquet"],
+          salidas=[SALIDA_CRUCE + "01. Top reglas por clúster.png"]),
+    Etapa(CRUCE + "06. red_reglas_por_cluster.py",
+          entradas=[PROC + "08. resumen_reglas_apriori_clusters.parquet",
+                    PROC + "08T. diccionario_productos_clusters.parquet"],
+          salidas=[SALIDA_CRUCE + "03T. Red por clúster *.png"]),
+]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ejecuta el pipeline omitiendo las etapas que están al día.")
+    parser.add_argument("objetivos", nargs="*", help='etapas (patrones), por ejemplo "02. K-means/0[4-8]*"')
+    parser.add_argument("--forzar", action="store_true", help="volver a correr aunque no haya cambios")
+    parser.add_argument("--trabajadores", type=int, default=None, help="procesos en paralelo")
+    parser.add_argument("--listar", action="store_true", help="mostrar las etapas y sus dependencias")
+    args = parser.parse_args()
+
+    nombres = orden_topologico(ETAPAS)
+
+    if args.listar:
+        deps = dependencias(ETAPAS)
+        for nombre in nombres:
+            print(f"{nombre}  ←  {', '.join(sorted(deps[nombre])) or '(datos crudos)'}")
+        sys.exit(0)
+
+    objetivos = [n for n in nombres if any(fnmatch.fnmatch(n.replace("\\", "/"), p) for p in args.objetivos)]
+    if args.objetivos and not objetivos:
+        sys.exit(f"Ninguna etapa coincide con {args.objetivos}")
+
+    ok = ejecutar(ETAPAS, objetivos or None, forzar=args.forzar, trabajadores=args.trabajadores)
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,11 @@
+@echo off
+REM Ir a la carpeta donde está este .bat
+cd /d "%~dp0"
+
+REM Ruta explícita al python del entorno virtual
+set PYTHON_VENV=%~dp0.venv\Scripts\python.exe
+
+echo Ejecutando el pipeline (solo las etapas con cambios)...
+"%PYTHON_VENV%" "ejecutar_pipeline.py" %*
+
+pause
@@ -0,0 +1,7 @@
+"""
+Motores de minería de conjuntos frecuentes y reglas de asociación.
+
+Trabajan directamente sobre cestas codificadas como enteros en formato CSR (offsets, productos),
+el mismo formato del almacén de transacciones (utils/transacciones.py), y devuelven los conjuntos
+frecuentes con las columnas de mlxtend (support, itemsets) para poder usar association_rules() igual que antes.
+"""
@@ -0,0 +1,105 @@
+###################################################################################################################
+##################################### Conjuntos cerrados / maximales y reglas no redundantes ######################
+###################################################################################################################
+
+# Con soportes bajos association_rules() genera muchas reglas que no aportan información: si {A} y {A, B} tienen el
+# mismo soporte, A → C, A → B C, A B → C ... dicen lo mismo. Este módulo reduce la salida sin perder información:
+# - conjunto cerrado:  ningún superconjunto tiene su mismo soporte. Con los cerrados y sus soportes se recupera el
+#                      soporte de cualquier conjunto frecuente (el de su cierre, el cerrado más soportado que lo
+#                      contiene)
+# - conjunto maximal:  ningún superconjunto es frecuente. Es la representación más chica, pero pierde los soportes
+# - generador:         ningún subconjunto de un ítem menos tiene su mismo soporte (antecedentes mínimos)
+#
+# reglas_no_redundantes() arma la base min-max de reglas (Pasquier et al.): g → f − g para cada cerrado f y cada
+# generador g ⊊ f. Antecedente mínimo y consecuente máximo: con confianza 1 si el cierre de g es f (base exacta)
+# y menor si no (base aproximada). Toda regla de association_rules() se deduce de ellas con su soporte y confianza.
+#
+# Los tres tipos se calculan en una pasada sobre los conjuntos frecuentes: para cada Z y cada ítem i de Z,
+# Z − {i} es un subconjunto inmediato (también frecuente) y se compara su soporte con el de Z.
+
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from mineria.reglas import completar_metricas
+
+TIPOS_CONJUNTOS = ["todos", "cerrados", "maximales"]
+
+
+def _subconjuntos_inmediatos(frecuentes: pd.DataFrame):
+    """
+    Conjuntos no cerrados y no maximales: los que tienen un superconjunto inmediato de igual soporte / frecuente.
+    """
+    soportes = dict(zip(map(frozenset, frecuentes["itemsets"]), frecuentes["support"].astype(float)))
+    no_cerrados, no_maximales = set(), set()
+    for conjunto, soporte in soportes.items():
+        if len(conjunto) < 2:
+            continue
+        for i in conjunto:
+            sub = conjunto - {i}
+            no_maximales.add(sub)
+            # Mismo soporte = mismas órdenes: sub siempre aparece junto con i
+            if soportes.get(sub) == soporte:
+                no_cerrados.add(sub)
+    return no_cerrados, no_maximales
+
+
+def filtrar_conjuntos(frecuentes: pd.DataFrame, tipo: str = "todos") -> pd.DataFrame:
+    """
+    Solo los conjuntos "cerrados" o "maximales" de todos los conjuntos frecuentes (formato de mlxtend).
+    Necesita la tabla completa, tal como la devuelven los motores ("todos" la deja igual).
+    """
+    if tipo not in TIPOS_CONJUNTOS:
+        raise ValueError(f"Tipo de conjuntos desconocido: {tipo} (opciones: {TIPOS_CONJUNTOS})")
+    if tipo == "todos" or frecuentes.empty:
+        return frecuentes
+
+    no_cerrados, no_maximales = _subconjuntos_inmediatos(frecuentes)
+    descartar = no_cerrados if tipo == "cerrados" else no_maximales
+    mascara = np.fromiter((frozenset(s) not in descartar for s in frecuentes["itemsets"]), dtype=bool,
+                          count=len(frecuentes))
+    return frecuentes[mascara].reset_index(drop=True)
+
+
+def reglas_no_redundantes(frecuentes: pd.DataFrame, min_confianza: float = 0.0, min_lift: float = 0.0) -> pd.DataFrame:
+    """
+    Base min-max de reglas (g → f − g, g generador, f cerrado) con confianza y elevación sobre los umbrales.
+    Acepta todos los conjuntos frecuentes o solo los cerrados. Mismas columnas que association_rules().
+    """
+    cerrados = filtrar_conjuntos(frecuentes, "cerrados")
+    cerrados = cerrados.sort_values("support", ascending=False, kind="stable")
+
+    # 1️⃣ Soporte de todo conjunto frecuente: el del primer cerrado (el más soportado) que lo contiene
+    soportes = {frozenset(): 1.0}
+    for conjunto, soporte in zip(map(tuple, map(sorted, cerrados["itemsets"])), cerrados["support"].astype(float)):
+        for largo in range(1, len(conjunto) + 1):
+            for sub in itertools.combinations(conjunto, largo):
+                soportes.setdefault(frozenset(sub), soporte)
+
+    # 2️⃣ Generadores: todo subconjunto de un ítem menos tiene soporte mayor
+    generadores = {s for s, soporte in soportes.items()
+                   if s and all(soportes[s - {i}] > soporte for i in s)}
+
+    # 3️⃣ Una regla por cada cerrado f y cada generador g contenido estrictamente en f
+    antecedentes, consecuentes = [], []
+    for conjunto in map(frozenset, cerrados["itemsets"]):
+        if len(conjunto) < 2:
+            continue
+        for largo in range(1, len(conjunto)):
+            for g in map(frozenset, itertools.combinations(sorted(conjunto), largo)):
+                if g in generadores:
+                    antecedentes.append(g)
+                    consecuentes.append(conjunto - g)
+
+    reglas = pd.DataFrame({
+        "antecedents": antecedentes,
+        "consequents": consecuentes,
+        "antecedent support": [soportes[a] for a in antecedentes],
+        "consequent support": [soportes[c] for c in consecuentes],
+        "support": [soportes[a | c] for a, c in zip(antecedentes, consecuentes)],
+    }, columns=["antecedents", "consequents", "antecedent support", "consequent support", "support"])
+    reglas["confidence"] = reglas["support"] / reglas["antecedent support"]
+    reglas["lift"] = reglas["confidence"] / reglas["consequent support"]
+    reglas = reglas[(reglas["confidence"] >= min_confianza) & (reglas["lift"] >= min_lift)].reset_index(drop=True)
+    return completar_metricas(reglas)
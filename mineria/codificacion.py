@@ -0,0 +1,36 @@
+###################################################################################################################
+############################## Codificación one-hot dispersa de cestas (scipy.sparse) #############################
+###################################################################################################################
+
+# TransactionEncoder().transform() arma una matriz booleana densa órdenes × productos y luego se envuelve en un
+# DataFrame: con 10.000 órdenes y miles de productos ya son cientos de MB, y con un clúster completo no cabe.
+#
+# Las cestas del almacén ya están en formato CSR (offsets + códigos de producto ordenados), que es exactamente
+# la estructura interna de scipy.sparse.csr_matrix: offsets = indptr y productos = indices. La codificación
+# one-hot dispersa es entonces casi gratuita (solo se agrega el arreglo data de unos).
+
+import numpy as np
+from scipy import sparse
+
+
+def codificar_disperso(offsets: np.ndarray, productos: np.ndarray, n_columnas: int = None) -> sparse.csr_matrix:
+    """
+    Matriz one-hot dispersa (órdenes × códigos de producto) de las cestas (offsets, productos).
+    La columna j corresponde al código de producto j.
+    """
+    offsets = np.asarray(offsets, dtype=np.int64)
+    productos = np.asarray(productos, dtype=np.int32)
+    if n_columnas is None:
+        n_columnas = int(productos.max(initial=-1)) + 1
+
+    matriz = sparse.csr_matrix(
+        (np.ones(len(productos), dtype=bool), productos, offsets),
+        shape=(len(offsets) - 1, n_columnas),
+        copy=False,
+    )
+    # Cestas con productos desordenados o repetidos (el almacén ya las guarda ordenadas y sin repetir)
+    if not matriz.has_canonical_format:
+        matriz = matriz.copy()
+        matriz.sum_duplicates()
+    return matriz
+
@@ -0,0 +1,232 @@
+###################################################################################################################
+############################ dEclat vertical: tid-lists en bits / enteros y diffsets ##############################
+###################################################################################################################
+
+# Minería vertical (Eclat) pensada para problemas medianos, como las reglas por clúster:
+# - cada producto frecuente guarda las órdenes en que aparece (tid-list):
+#     · como bitset empaquetado en uint64 si es denso (≥ 1 de cada 32 órdenes: ocupa menos que la lista)
+#     · como arreglo int32 ordenado si es disperso
+# - el soporte de una extensión se cuenta con AND + popcount (np.bitwise_count) de una sola vez para todas
+#   las extensiones de una clase: las tid-lists en bits se apilan en una matriz y las listas en un arreglo continuo
+# - en cada clase se cambia automáticamente a diffsets (d(PXY) = t(PX) − t(PY)) cuando ocupan menos que
+#   las tid-lists, y desde ahí se sigue con diffsets: d(PXYZ) = d(PXZ) − d(PXY)
+#
+# El resultado tiene el formato de mlxtend (support, itemsets), igual que mineria/fpgrowth.py.
+
+import numpy as np
+import pandas as pd
+
+from mineria.fpgrowth import cuenta_minima, formato_mlxtend, preparar
+
+# Un conjunto con al menos 1 de cada DENSIDAD_BITS órdenes se guarda como bitset (32 bits por entrada int32)
+DENSIDAD_BITS = 32
+
+# Tamaño máximo (bytes) del AND temporal entre una tid-list y las filas de la matriz de bits de una clase
+BYTES_POR_BLOQUE = 32 * 2**20
+
+_UNO = np.uint64(1)
+
+
+################################################ Conjuntos de órdenes ################################################
+
+# Un conjunto es un np.ndarray: uint64 → bitset empaquetado; int32 → lista ordenada de órdenes
+
+
+def _es_bits(conjunto: np.ndarray) -> bool:
+    return conjunto.dtype == np.uint64
+
+
+def _tamano(conjunto: np.ndarray) -> int:
+    return int(np.bitwise_count(conjunto).sum()) if _es_bits(conjunto) else len(conjunto)
+
+
+def _bits_de_lista(tids: np.ndarray, palabras: int) -> np.ndarray:
+    marcas = np.zeros(palabras * 64, dtype=bool)
+    marcas[tids] = True
+    return np.packbits(marcas, bitorder="little").view(np.uint64)
+
+
+def _lista_de_bits(bits: np.ndarray) -> np.ndarray:
+    return np.flatnonzero(np.unpackbits(bits.view(np.uint8), bitorder="little")).astype(np.int32)
+
+
+def _pertenece(bits: np.ndarray, tids: np.ndarray) -> np.ndarray:
+    return ((bits[tids >> 6] >> (tids & 63).astype(np.uint64)) & _UNO).astype(bool)
+
+
+def _compactar(bits: np.ndarray) -> np.ndarray:
+    """
+    Pasa un bitset a lista cuando queda disperso.
+    """
+    if _tamano(bits) * DENSIDAD_BITS < len(bits) * 64:
+        return _lista_de_bits(bits)
+    return bits
+
+
+def _interseccion(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    if _es_bits(a) and _es_bits(b):
+        return _compactar(a & b)
+    if _es_bits(a):
+        a, b = b, a
+    if _es_bits(b):
+        return a[_pertenece(b, a)]
+    return np.intersect1d(a, b, assume_unique=True)
+
+
+def _diferencia(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    a − b
+    """
+    if _es_bits(a):
+        return _compactar(a & ~(b if _es_bits(b) else _bits_de_lista(b, len(a))))
+    if _es_bits(b):
+        return a[~_pertenece(b, a)]
+    return np.setdiff1d(a, b, assume_unique=True)
+
+
+################################################ Minería por clases ################################################
+
+
+class _Clase:
+    """
+    Extensiones de un prefijo: ítems, conjuntos (tid-lists o diffsets), soportes y tamaños de los conjuntos.
+    Los bitsets se apilan en una matriz y las listas en un arreglo continuo para contar todo de una vez.
+    """
+
+    def __init__(self, items, conjuntos, soportes, tamanos):
+        self.items = np.asarray(items)
+        self.soportes = np.asarray(soportes, dtype=np.int64)
+        self.tamanos = np.asarray(tamanos, dtype=np.int64)
+
+        es_bits = np.array([_es_bits(c) for c in conjuntos], dtype=bool)
+        self.filas_bits = np.flatnonzero(es_bits)
+        self.filas_lista = np.flatnonzero(~es_bits)
+        self.bits = np.stack([conjuntos[j] for j in self.filas_bits]) if len(self.filas_bits) else None
+        self.lista = (np.concatenate([conjuntos[j] for j in self.filas_lista]) if len(self.filas_lista)
+                      else np.empty(0, dtype=np.int32))
+        self.inicio_lista = np.zeros(len(self.filas_lista) + 1, dtype=np.int64)
+        np.cumsum(self.tamanos[self.filas_lista], out=self.inicio_lista[1:])
+
+        # Los conjuntos pasan a ser vistas de la matriz / arreglo continuo (sin duplicar memoria)
+        self.conjuntos = list(conjuntos)
+        for r, j in enumerate(self.filas_bits):
+            self.conjuntos[j] = self.bits[r]
+        for r, j in enumerate(self.filas_lista):
+            self.conjuntos[j] = self.lista[self.inicio_lista[r]:self.inicio_lista[r + 1]]
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def intersecciones(self, k: int, palabras: int) -> np.ndarray:
+        """
+        |conjunto_k ∩ conjunto_j| para todos los j > k (las posiciones ≤ k quedan en 0).
+        """
+        mascara = self.conjuntos[k]
+        if not _es_bits(mascara):
+            mascara = _bits_de_lista(mascara, palabras)
+        resultado = np.zeros(len(self), dtype=np.int64)
+
+        # Bitsets: AND + popcount por bloques de filas
+        desde = np.searchsorted(self.filas_bits, k, side="right")
+        paso = max(1, BYTES_POR_BLOQUE // (8 * palabras))
+        for a in range(desde, len(self.filas_bits), paso):
+            b = min(a + paso, len(self.filas_bits))
+            resultado[self.filas_bits[a:b]] = np.bitwise_count(self.bits[a:b] & mascara).sum(axis=1)
+
+        # Listas: prueba de pertenencia de todas las listas restantes de una vez, y suma por segmento
+        desde = np.searchsorted(self.filas_lista, k, side="right")
+        if desde < len(self.filas_lista):
+            base = self.inicio_lista[desde]
+            aciertos = np.zeros(self.inicio_lista[-1] - base + 1, dtype=np.int64)
+            np.cumsum(_pertenece(mascara, self.lista[base:]), out=aciertos[1:])
+            limites = self.inicio_lista[desde:] - base
+            resultado[self.filas_lista[desde:]] = aciertos[limites[1:]] - aciertos[limites[:-1]]
+        return resultado
+
+
+def minar_clase(prefijo: tuple, clase: _Clase, diffsets: bool, min_cuenta: int, max_len, palabras: int,
+                salida: list, posiciones=None) -> None:
+    """
+    Agrega a salida los pares (conjunto de rangos, cuenta) de la clase y sus descendientes.
+    posiciones limita los miembros de la clase que se expanden (reparto del trabajo en mineria/paralelo.py).
+    """
+    for k in (range(len(clase)) if posiciones is None else posiciones):
+        conjunto = prefijo + (int(clase.items[k]),)
+        soporte_k = int(clase.soportes[k])
+        salida.append((conjunto, soporte_k))
+        if k == len(clase) - 1 or (max_len is not None and len(conjunto) >= max_len):
+            continue
+
+        comunes = clase.intersecciones(k, palabras)[k + 1:]
+        if diffsets:
+            # d(PXY) = d(PY) − d(PX) → |d(PXY)| = |d(PY)| − |d(PY) ∩ d(PX)|, soporte = sop(PX) − |d(PXY)|
+            soportes = soporte_k - (clase.tamanos[k + 1:] - comunes)
+        else:
+            soportes = comunes
+        hijos = np.flatnonzero(soportes >= min_cuenta) + k + 1
+        if not len(hijos):
+            continue
+        soportes = soportes[hijos - k - 1]
+
+        ck = clase.conjuntos[k]
+        if diffsets:
+            usar_diff = True
+            conjuntos = [_diferencia(clase.conjuntos[j], ck) for j in hijos]
+        else:
+            # Cambio a diffsets si en total ocupan menos que las tid-lists de los hijos
+            usar_diff = (soporte_k - soportes).sum() < soportes.sum()
+            if usar_diff:
+                conjuntos = [_diferencia(ck, clase.conjuntos[j]) for j in hijos]
+            else:
+                conjuntos = [_interseccion(ck, clase.conjuntos[j]) for j in hijos]
+
+        tamanos = soporte_k - soportes if usar_diff else soportes
+        minar_clase(conjunto, _Clase(clase.items[hijos], conjuntos, soportes, tamanos), usar_diff,
+                    min_cuenta, max_len, palabras, salida)
+
+
+def vista_vertical(offsets_r: np.ndarray, rangos: np.ndarray, n_items: int):
+    """
+    Órdenes de cada producto frecuente (rango 0 = más frecuente), ordenadas: las del rango r son
+    tids[inicio[r]:inicio[r + 1]].
+    """
+    fila = np.repeat(np.arange(len(offsets_r) - 1, dtype=np.int32), np.diff(offsets_r))
+    tids = fila[np.argsort(rangos, kind="stable")]
+    inicio = np.zeros(n_items + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rangos, minlength=n_items), out=inicio[1:])
+    return tids, inicio
+
+
+def clase_raiz(tids: np.ndarray, inicio: np.ndarray, palabras: int) -> _Clase:
+    """
+    Clase raíz en orden de soporte creciente (las clases de los ítems raros son las más pequeñas).
+    """
+    items = np.arange(len(inicio) - 1)[::-1]
+    conjuntos, soportes = [], []
+    for r in items:
+        t = tids[inicio[r]:inicio[r + 1]]
+        conjuntos.append(_bits_de_lista(t, palabras) if len(t) * DENSIDAD_BITS >= palabras * 64 else t)
+        soportes.append(len(t))
+    return _Clase(items, conjuntos, soportes, soportes)
+
+
+def declat(offsets: np.ndarray, productos: np.ndarray, min_support: float = 0.005,
+           max_len: int = None, nombres: np.ndarray = None) -> pd.DataFrame:
+    """
+    Conjuntos frecuentes de las cestas (offsets, productos) con dEclat, en el formato de mlxtend.
+    nombres (arreglo indexado por código de producto) cumple el rol de use_colnames=True.
+    """
+    n = len(offsets) - 1
+    min_cuenta = cuenta_minima(min_support, n)
+    palabras = max(1, -(-n // 64))
+
+    offsets_r, rangos, codigo_de_rango = preparar(offsets, productos, min_cuenta)
+    tids, inicio = vista_vertical(offsets_r, rangos, len(codigo_de_rango))
+    del offsets_r, rangos
+    raiz = clase_raiz(tids, inicio, palabras)
+    del tids
+
+    salida = []
+    if len(raiz):
+        minar_clase((), raiz, False, min_cuenta, max_len, palabras, salida)
+    return formato_mlxtend(salida, codigo_de_rango, n, nombres)
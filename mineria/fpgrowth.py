@@ -0,0 +1,200 @@
+###################################################################################################################
+################################# FP-Growth sobre cestas codificadas como enteros #################################
+###################################################################################################################
+
+# mlxtend necesita una matriz one-hot densa (órdenes × productos), por eso Apriori se limitaba al top 100 de
+# productos y a 20.000 órdenes. Este motor trabaja directamente sobre el formato CSR (offsets, productos):
+# 1. cuenta el soporte de cada producto y descarta los infrecuentes
+# 2. recodifica los productos frecuentes por rango de frecuencia y ordena cada cesta por rango (por bloques)
+# 3. construye el FP-tree como arreglos (ítem, padre, cuenta, profundidad), un nivel de profundidad a la vez:
+#    los nodos de profundidad d son los pares distintos (nodo padre, ítem) de las cestas → np.unique
+# 4. mina recursivamente: los caminos prefijo de cada ítem (base condicional) forman un árbol más pequeño
+#
+# La memoria queda acotada por el árbol (≈ 18 bytes por nodo) y no por órdenes × productos.
+
+import math
+
+import numpy as np
+import pandas as pd
+
+# Líneas de cestas que se recodifican por bloque al preparar el árbol principal
+LINEAS_POR_BLOQUE = 4_000_000
+
+
+class ArbolFP:
+    """
+    FP-tree en arreglos: el nodo k tiene ítem item[k], padre padre[k] (-1 = raíz),
+    cuenta cuenta[k] y profundidad prof[k] (0 = hijo de la raíz).
+    """
+
+    def __init__(self, item, padre, cuenta, prof, n_items: int):
+        self.item, self.padre, self.cuenta, self.prof = item, padre, cuenta, prof
+        self.n_items = n_items
+        self.soporte = np.bincount(item, weights=cuenta, minlength=n_items).astype(np.int64)
+        # Nodos agrupados por ítem (equivalente a la lista enlazada de la tabla de cabeceras)
+        self._por_item = np.argsort(item, kind="stable").astype(np.int32)
+        self._inicio = np.zeros(n_items + 1, dtype=np.int64)
+        np.cumsum(np.bincount(item, minlength=n_items), out=self._inicio[1:])
+
+    @property
+    def n_nodos(self) -> int:
+        return len(self.item)
+
+    def caminos(self, i: int):
+        """
+        Base condicional del ítem i: caminos prefijo (raíz → padre) en CSR, con la cuenta de cada nodo como peso.
+        """
+        nodos = self._por_item[self._inicio[i]:self._inicio[i + 1]]
+        nodos = nodos[self.prof[nodos] > 0]
+        prof = self.prof[nodos].astype(np.int64)
+        offsets = np.zeros(len(nodos) + 1, dtype=np.int64)
+        np.cumsum(prof, out=offsets[1:])
+
+        items = np.empty(offsets[-1], dtype=np.int32)
+        actual = self.padre[nodos]
+        for s in range(1, int(prof.max(initial=0)) + 1):
+            # Los nodos con profundidad ≥ s todavía tienen un ancestro en la posición prof - s del camino
+            sel = np.flatnonzero(prof >= s)
+            items[offsets[sel] + prof[sel] - s] = self.item[actual[sel]]
+            actual[sel] = self.padre[actual[sel]]
+
+        return offsets, items, self.cuenta[nodos]
+
+
+def construir_arbol(offsets: np.ndarray, items: np.ndarray, pesos, n_items: int) -> ArbolFP:
+    """
+    Construye el FP-tree de transacciones en CSR, con los ítems de cada una ya ordenados por rango.
+    pesos es la cantidad de veces que se repite cada transacción (None = 1).
+    """
+    largos = np.diff(offsets)
+    activos = np.flatnonzero(largos > 0)
+    nodo = np.full(len(largos), -1, dtype=np.int64)
+    bloques = []
+    base, d = 0, 0
+
+    while len(activos):
+        claves = (nodo[activos] + 1) * n_items + items[offsets[activos] + d]
+        unicas, inversa = np.unique(claves, return_inverse=True)
+        cuenta = np.bincount(inversa, weights=None if pesos is None else pesos[activos], minlength=len(unicas))
+        bloques.append((
+            (unicas % n_items).astype(np.int32),
+            (unicas // n_items - 1).astype(np.int32),
+            cuenta.astype(np.int32),
+            np.full(len(unicas), d, dtype=np.int16),
+        ))
+        nodo[activos] = base + inversa
+        base += len(unicas)
+        d += 1
+        activos = activos[largos[activos] > d]
+
+    if not bloques:
+        vacio = np.empty(0, dtype=np.int32)
+        return ArbolFP(vacio, vacio, vacio, vacio.astype(np.int16), n_items)
+    return ArbolFP(*(np.concatenate(partes) for partes in zip(*bloques)), n_items)
+
+
+def arbol_condicional(offsets, items, pesos, min_cuenta: int, n_items: int):
+    """
+    Árbol condicional: filtra de los caminos los ítems infrecuentes dentro de la base condicional.
+    """
+    largos = np.diff(offsets)
+    soporte = np.bincount(items, weights=np.repeat(pesos, largos), minlength=n_items)
+    mantener = (soporte >= min_cuenta)[items]
+    if not mantener.any():
+        return None
+    fila = np.repeat(np.arange(len(largos)), largos)[mantener]
+    nuevos = np.zeros(len(largos) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(fila, minlength=len(largos)), out=nuevos[1:])
+    return construir_arbol(nuevos, items[mantener], pesos, n_items)
+
+
+def minar_arbol(arbol: ArbolFP, sufijo: tuple, min_cuenta: int, max_len, salida: list) -> None:
+    """
+    Agrega a salida los pares (conjunto de rangos, cuenta) de los conjuntos frecuentes del árbol, unidos al sufijo.
+    """
+    for i in np.flatnonzero(arbol.soporte >= min_cuenta):
+        conjunto = sufijo + (int(i),)
+        salida.append((conjunto, int(arbol.soporte[i])))
+        if max_len is not None and len(conjunto) >= max_len:
+            continue
+        condicional = arbol_condicional(*arbol.caminos(i), min_cuenta, arbol.n_items)
+        if condicional is not None:
+            minar_arbol(condicional, conjunto, min_cuenta, max_len, salida)
+
+
+def cuenta_minima(min_support: float, n_transacciones: int) -> int:
+    """
+    Menor cuenta c tal que c / n_transacciones >= min_support (mismo criterio que mlxtend).
+    """
+    c = max(math.ceil(min_support * n_transacciones), 1)
+    while c > 1 and (c - 1) / n_transacciones >= min_support:
+        c -= 1
+    while c / n_transacciones < min_support:
+        c += 1
+    return c
+
+
+def preparar(offsets: np.ndarray, productos: np.ndarray, min_cuenta: int):
+    """
+    Recodifica las cestas a rangos de frecuencia (0 = producto más frecuente), sin productos infrecuentes
+    ni repetidos, ordenadas por rango. Devuelve (offsets, rangos, codigo_de_rango).
+    """
+    n = len(offsets) - 1
+    productos_np = np.asarray(productos)
+    soporte = np.bincount(productos_np)
+    frecuentes = np.flatnonzero(soporte >= min_cuenta)
+    codigo_de_rango = frecuentes[np.argsort(-soporte[frecuentes], kind="stable")]
+    rango = np.full(len(soporte), -1, dtype=np.int32)
+    rango[codigo_de_rango] = np.arange(len(codigo_de_rango), dtype=np.int32)
+
+    # 🧱 Bloques de órdenes completas con ~LINEAS_POR_BLOQUE líneas cada uno
+    cortes = np.unique(np.searchsorted(offsets, np.arange(0, offsets[-1], LINEAS_POR_BLOQUE), side="right") - 1)
+    cortes = np.append(cortes, n)
+    partes, largos = [], np.zeros(n, dtype=np.int64)
+    for a, b in zip(cortes[:-1], cortes[1:]):
+        fila = np.repeat(np.arange(a, b), np.diff(offsets[a:b + 1]))
+        r = rango[productos_np[offsets[a]:offsets[b]]]
+        orden = np.lexsort((r, fila))
+        fila, r = fila[orden], r[orden]
+        # Fuera los infrecuentes y los productos repetidos dentro de una misma cesta
+        mantener = r >= 0
+        mantener[1:] &= (r[1:] != r[:-1]) | (fila[1:] != fila[:-1])
+        partes.append(r[mantener])
+        largos[a:b] = np.bincount(fila[mantener] - a, minlength=b - a)
+
+    nuevos = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(largos, out=nuevos[1:])
+    rangos = np.concatenate(partes) if partes else np.empty(0, dtype=np.int32)
+    return nuevos, rangos, codigo_de_rango
+
+
+def fpgrowth(offsets: np.ndarray, productos: np.ndarray, min_support: float = 0.0005,
+             max_len: int = None, nombres: np.ndarray = None) -> pd.DataFrame:
+    """
+    Conjuntos frecuentes de las cestas (offsets, productos) con el formato de mlxtend: columnas support e itemsets.
+    nombres (arreglo indexado por código de producto) cumple el rol de use_colnames=True.
+    """
+    n = len(offsets) - 1
+    min_cuenta = cuenta_minima(min_support, n)
+
+    offsets_r, rangos, codigo_de_rango = preparar(offsets, productos, min_cuenta)
+    arbol = construir_arbol(offsets_r, rangos, None, len(codigo_de_rango))
+    del offsets_r, rangos
+
+    salida = []
+    minar_arbol(arbol, (), min_cuenta, max_len, salida)
+
+    return formato_mlxtend(salida, codigo_de_rango, n, nombres)
+
+
+def formato_mlxtend(salida: list, codigo_de_rango: np.ndarray, n: int, nombres: np.ndarray = None) -> pd.DataFrame:
+    """
+    DataFrame (support, itemsets) a partir de pares (conjunto de rangos, cuenta), ordenado por tamaño y soporte.
+    """
+    etiquetas = codigo_de_rango if nombres is None else np.asarray(nombres, dtype=object)[codigo_de_rango]
+    frecuentes = pd.DataFrame({
+        "support": np.array([c for _, c in salida], dtype=np.float64) / n,
+        "itemsets": [frozenset(etiquetas[list(conjunto)].tolist()) for conjunto, _ in salida],
+    })
+    largo = frecuentes["itemsets"].map(len)
+    return frecuentes.iloc[np.lexsort((-frecuentes["support"].to_numpy(), largo.to_numpy()))].reset_index(drop=True)
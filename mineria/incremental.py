@@ -0,0 +1,164 @@
+###################################################################################################################
+############################ Mantenimiento incremental de conjuntos frecuentes (FUP) ##############################
+###################################################################################################################
+
+# Cuando llega un lote de órdenes nuevas (delta) no hace falta volver a minar todo desde cero (algoritmo FUP,
+# Cheung et al.). Con los conjuntos frecuentes anteriores y sus cuentas:
+# 1. los conjuntos anteriores se cuentan en el delta: su cuenta nueva es la anterior + la del delta, y se
+#    mantienen o se degradan según el soporte mínimo sobre el total de órdenes
+# 2. un conjunto que no era frecuente solo puede pasar a serlo si su cuenta en el delta compensa lo que le
+#    faltaba, y (Apriori) si todos sus subconjuntos son frecuentes en el total. Los candidatos nuevos se
+#    generan nivel por nivel a partir de los frecuentes ya actualizados (pares: XᵀX del delta), se filtran
+#    por su cuenta en el delta y solo esos se cuentan en los datos anteriores (por particiones, mineria/son.py)
+#
+# El resultado es exactamente el de volver a minar datos anteriores + delta con el mismo min_support y max_len.
+#
+# El estado (conjuntos como códigos de producto + cuentas) se guarda como artefacto "<nombre>.parquet" con
+# un "<nombre>.json" al lado: órdenes contadas, min_support, max_len y lotes ya incorporados.
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from mineria.codificacion import codificar_disperso
+from mineria.fpgrowth import cuenta_minima, formato_mlxtend
+from mineria.son import contar_candidatos
+from utils.artefactos import RUTA_PROCESADOS, guardar_artefacto, leer_artefacto, ruta_artefacto
+
+
+def guardar_estado(frecuentes: pd.DataFrame, nombre: str, n_ordenes: int, min_support: float,
+                   max_len: int = None, lotes: list = None, ruta: str = RUTA_PROCESADOS) -> str:
+    """
+    Guarda los conjuntos frecuentes (itemsets con códigos de producto y support o cuenta) y sus cuentas.
+    """
+    if "cuenta" in frecuentes:
+        cuentas = frecuentes["cuenta"].to_numpy(np.int64)
+    else:
+        cuentas = np.rint(frecuentes["support"].to_numpy() * n_ordenes).astype(np.int64)
+    estado = pd.DataFrame({"itemsets": frecuentes["itemsets"].to_numpy(), "cuenta": cuentas})
+    destino = guardar_artefacto(estado, nombre, ruta)
+    with open(ruta_artefacto(nombre, ruta, "json"), "w", encoding="utf-8") as f:
+        json.dump({"n_ordenes": int(n_ordenes), "min_support": min_support, "max_len": max_len,
+                   "lotes": list(lotes or [])}, f, indent=2)
+    return destino
+
+
+def leer_estado(nombre: str, ruta: str = RUTA_PROCESADOS):
+    """
+    Devuelve (estado, meta): DataFrame (itemsets, cuenta) y el diccionario de guardar_estado.
+    """
+    with open(ruta_artefacto(nombre, ruta, "json"), encoding="utf-8") as f:
+        meta = json.load(f)
+    return leer_artefacto(nombre, ruta=ruta), meta
+
+
+def existe_estado(nombre: str, ruta: str = RUTA_PROCESADOS) -> bool:
+    return os.path.exists(ruta_artefacto(nombre, ruta)) and os.path.exists(ruta_artefacto(nombre, ruta, "json"))
+
+
+def _generar(previos: set, k: int) -> list:
+    """
+    Candidatos de tamaño k (apriori-gen): uniones de dos conjuntos de tamaño k - 1 con el mismo prefijo,
+    cuyos subconjuntos de tamaño k - 1 son todos frecuentes.
+    """
+    por_prefijo = {}
+    for conjunto in sorted(previos):
+        por_prefijo.setdefault(conjunto[:-1], []).append(conjunto[-1])
+    candidatos = []
+    for prefijo, ultimos in por_prefijo.items():
+        for a in range(len(ultimos)):
+            for b in range(a + 1, len(ultimos)):
+                candidato = prefijo + (ultimos[a], ultimos[b])
+                if all(candidato[:q] + candidato[q + 1:] in previos for q in range(k - 2)):
+                    candidatos.append(candidato)
+    return candidatos
+
+
+def _pares_en_delta(offsets: np.ndarray, productos: np.ndarray, items: np.ndarray, n_codigos: int,
+                    min_cuenta: int) -> list:
+    """
+    Pares de items que aparecen juntos en al menos min_cuenta cestas del delta (XᵀX disperso).
+    """
+    x = codificar_disperso(offsets, productos, n_codigos)[:, items].astype(np.int32)
+    conteo = sparse.triu(x.T @ x, k=1).tocoo()
+    mantener = conteo.data >= min_cuenta
+    return [(int(items[a]), int(items[b])) for a, b in zip(conteo.row[mantener], conteo.col[mantener])]
+
+
+def fup(estado: pd.DataFrame, meta: dict, delta_offsets: np.ndarray, delta_productos: np.ndarray,
+        contar_anteriores, n_codigos: int):
+    """
+    Actualiza el estado con las cestas del delta, nivel por nivel (tamaño k = 1, 2, ...).
+    contar_anteriores(candidatos) devuelve las cuentas de los candidatos (tuplas de códigos) en los datos
+    anteriores. Devuelve (estado, n_ordenes, resumen).
+    """
+    min_support, max_len = meta["min_support"], meta["max_len"]
+    n_anterior, n_delta = meta["n_ordenes"], len(delta_offsets) - 1
+    n_total = n_anterior + n_delta
+    min_cuenta = cuenta_minima(min_support, n_total)
+    # Un conjunto que no era frecuente tenía a lo más cuenta_minima(anterior) - 1: para alcanzar min_cuenta
+    # necesita al menos esta cuenta dentro del delta
+    min_cuenta_delta = max(1, min_cuenta - cuenta_minima(min_support, n_anterior) + 1)
+
+    anteriores = {}
+    for s, c in zip(estado["itemsets"], estado["cuenta"]):
+        anteriores[tuple(sorted(s))] = int(c)
+
+    # 1️⃣ Conjuntos anteriores: cuenta en el delta, se mantienen o se degradan
+    lista = list(anteriores)
+    cuentas = np.fromiter(anteriores.values(), dtype=np.int64, count=len(lista))
+    cuentas = cuentas + contar_candidatos(delta_offsets, delta_productos, lista, n_codigos)
+    frecuentes = {c: int(k) for c, k in zip(lista, cuentas) if k >= min_cuenta}
+    resumen = {"ordenes_anteriores": n_anterior, "ordenes_delta": n_delta,
+               "mantenidos": len(frecuentes), "degradados": len(lista) - len(frecuentes),
+               "candidatos_nuevos": 0, "promovidos": 0}
+
+    # 2️⃣ Candidatos nuevos por nivel: sus subconjuntos deben ser frecuentes en el total, y su cuenta en el delta
+    #    debe alcanzar min_cuenta_delta; solo esos se cuentan en los datos anteriores
+    k = 1
+    while max_len is None or k <= max_len:
+        previos = {c for c in frecuentes if len(c) == k - 1}
+        if k == 1:
+            en_delta = np.bincount(np.asarray(delta_productos), minlength=n_codigos)
+            candidatos = [(int(i),) for i in np.flatnonzero(en_delta >= min_cuenta_delta)]
+        elif k == 2:
+            items = np.array(sorted(i for i, in previos), dtype=np.int64)
+            candidatos = _pares_en_delta(delta_offsets, delta_productos, items, n_codigos, min_cuenta_delta)
+        else:
+            candidatos = _generar(previos, k)
+        candidatos = [c for c in candidatos if c not in anteriores]
+        cuentas_delta = contar_candidatos(delta_offsets, delta_productos, candidatos, n_codigos)
+        alcanza = cuentas_delta >= min_cuenta_delta
+        candidatos = [c for c, a in zip(candidatos, alcanza) if a]
+
+        if candidatos:
+            totales = cuentas_delta[alcanza] + contar_anteriores(candidatos)
+            promovidos = {c: int(t) for c, t in zip(candidatos, totales) if t >= min_cuenta}
+            frecuentes.update(promovidos)
+            resumen["candidatos_nuevos"] += len(candidatos)
+            resumen["promovidos"] += len(promovidos)
+
+        # Sin frecuentes de tamaño k no hay candidatos de tamaño k + 1
+        if not any(len(c) == k for c in frecuentes):
+            break
+        k += 1
+
+    actualizado = pd.DataFrame({
+        "itemsets": [frozenset(c) for c in frecuentes],
+        "cuenta": np.fromiter(frecuentes.values(), dtype=np.int64, count=len(frecuentes)),
+    })
+    return actualizado, n_total, resumen
+
+
+def como_frecuentes(estado: pd.DataFrame, n_ordenes: int, nombres: np.ndarray = None) -> pd.DataFrame:
+    """
+    Estado (itemsets, cuenta) → conjuntos frecuentes en el formato de mlxtend (support, itemsets).
+    """
+    salida = [(tuple(sorted(s)), int(c)) for s, c in zip(estado["itemsets"], estado["cuenta"])]
+    n_codigos = max((max(c) for c, _ in salida), default=-1) + 1
+    if nombres is not None:
+        n_codigos = max(n_codigos, len(nombres))
+    return formato_mlxtend(salida, np.arange(n_codigos), n_ordenes, nombres)
@@ -0,0 +1,73 @@
+###################################################################################################################
+############################### Punto de entrada común a los motores de minería ###################################
+###################################################################################################################
+
+# Los scripts llaman a conjuntos_frecuentes() con la matriz one-hot dispersa (mineria/codificacion.py) en lugar
+# de un DataFrame denso de TransactionEncoder. La matriz nunca se densifica:
+# - "fpgrowth": usa directamente indptr/indices de la matriz CSR como cestas codificadas
+# - "declat":   minería vertical con tid-lists en bits / enteros y diffsets (problemas medianos, ej. por clúster)
+# - "mlxtend":  apriori de mlxtend sobre un DataFrame disperso, solo con las columnas presentes
+#
+# Con n_jobs != 1, "fpgrowth" y "declat" reparten la minería entre procesos (mineria/paralelo.py).
+# Con tipo="cerrados" / "maximales" se devuelven solo esos conjuntos (mineria/cerrados.py).
+#
+# El resultado siempre tiene el formato de mlxtend (support, itemsets) para usar association_rules().
+
+import numpy as np
+import pandas as pd
+from mlxtend.frequent_patterns import apriori
+from scipy import sparse
+
+from mineria.cerrados import filtrar_conjuntos
+from mineria.declat import declat
+from mineria.fpgrowth import fpgrowth
+from mineria.paralelo import minar_en_paralelo
+
+MOTORES = ["fpgrowth", "declat", "mlxtend"]
+
+
+def _csr_canonica(matriz) -> sparse.csr_matrix:
+    matriz = sparse.csr_matrix(matriz)
+    if not matriz.has_canonical_format or (matriz.data == 0).any():
+        matriz = matriz.copy()
+        matriz.eliminate_zeros()
+        matriz.sum_duplicates()
+    return matriz
+
+
+def conjuntos_frecuentes(matriz, min_support: float, motor: str = "fpgrowth", columnas=None,
+                         max_len: int = None, n_jobs: int = 1, tipo: str = "todos") -> pd.DataFrame:
+    """
+    Conjuntos frecuentes de una matriz one-hot dispersa (filas = órdenes, columnas = productos).
+    columnas (etiqueta de cada columna) cumple el rol de use_colnames=True; sin ella los itemsets son índices.
+    n_jobs: procesos para fpgrowth / declat (1 = secuencial, -1 = todos los núcleos); mlxtend lo ignora.
+    tipo: "todos", o solo los "cerrados" / "maximales" de ellos.
+    """
+    if motor not in MOTORES:
+        raise ValueError(f"Motor desconocido: {motor} (opciones: {MOTORES})")
+    return filtrar_conjuntos(_minar(matriz, min_support, motor, columnas, max_len, n_jobs), tipo)
+
+
+def _minar(matriz, min_support: float, motor: str, columnas, max_len: int, n_jobs: int) -> pd.DataFrame:
+    matriz = _csr_canonica(matriz)
+    etiquetas = None if columnas is None else np.asarray(columnas, dtype=object)
+
+    if motor in ("fpgrowth", "declat") and n_jobs != 1:
+        return minar_en_paralelo(matriz.indptr, matriz.indices, min_support, n_jobs, motor=motor,
+                                 max_len=max_len, nombres=etiquetas)
+    if motor == "fpgrowth":
+        return fpgrowth(matriz.indptr, matriz.indices, min_support, max_len=max_len, nombres=etiquetas)
+    if motor == "declat":
+        return declat(matriz.indptr, matriz.indices, min_support, max_len=max_len, nombres=etiquetas)
+
+    # mlxtend: DataFrame disperso (columnas 0..k-1) solo con las columnas que aparecen en alguna orden
+    presentes = np.flatnonzero(np.bincount(matriz.indices, minlength=matriz.shape[1]))
+    csc = matriz[:, presentes].tocsc()
+    tipo = pd.SparseDtype(bool, False)
+    df = pd.DataFrame({k: pd.arrays.SparseArray.from_spmatrix(csc[:, [k]]).astype(tipo) for k in range(len(presentes))})
+
+    frecuentes = apriori(df, min_support=min_support, use_colnames=True, max_len=max_len)
+    codigos = presentes if etiquetas is None else etiquetas[presentes]
+    frecuentes["itemsets"] = [frozenset(codigos[list(s)].tolist()) for s in frecuentes["itemsets"]]
+    return frecuentes
+
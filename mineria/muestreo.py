@@ -0,0 +1,125 @@
+###################################################################################################################
+################################ Muestreo progresivo con cota de error en los soportes ############################
+###################################################################################################################
+
+# Reemplaza los cortes fijos de órdenes (las primeras 20.000 por order_id, o N_MUESTRA por clúster) por una
+# muestra aleatoria que crece solo hasta que los soportes quedan acotados:
+# 1. se baraja el orden de las órdenes (semilla fija) y se toman prefijos crecientes: muestras anidadas
+# 2. en cada paso se mina la muestra con el umbral rebajado min_support − epsilon (como Toivonen), para no perder
+#    conjuntos cuyo soporte real alcanza min_support pero que salen algo más bajos en la muestra
+# 3. se calcula la cota epsilon alcanzada para |soporte muestral − soporte real| (unión sobre m conjuntos):
+#    · "hoeffding": cota = sqrt(ln(2m/δ) / 2n), sin supuestos sobre el soporte, con m fijado antes de muestrear
+#      (todos los conjuntos candidatos: combinaciones de hasta max_len productos del catálogo presente, o del largo
+#      de la cesta más larga). Es una garantía real: con probabilidad ≥ confianza vale para todos a la vez, pero
+#      con catálogos grandes suele exigir todas las órdenes
+#    · "bernstein": usa además que la varianza de un soporte p es p(1 − p), mucho menor con soportes chicos
+#      (cotas de Chernoff/Bernstein, como en Toivonen), con m = conjuntos minados en la muestra y el p más alto
+#      minado. m y p salen de la misma muestra, así que es una cota heurística: no garantiza (ε, δ)
+# 4. se detiene cuando la cota es ≤ epsilon y los soportes de los conjuntos comunes con el paso anterior
+#    difieren en ≤ epsilon; si no, la muestra crece por factor (o hasta usar todas las órdenes: cota 0)
+#
+# Ambas desigualdades valen para muestras sin reemplazo (Hoeffding, 1963).
+
+import math
+
+import numpy as np
+import pandas as pd
+
+from mineria.codificacion import codificar_disperso
+from mineria.motores import conjuntos_frecuentes
+
+COTAS = ["hoeffding", "bernstein"]
+
+
+def log_candidatos(n_productos: int, max_len: int) -> float:
+    """
+    ln de la cantidad de conjuntos de 1 a max_len productos que se pueden formar con n_productos.
+    """
+    k = np.arange(1, max(min(max_len, n_productos), 1) + 1, dtype=np.float64)
+    log_comb = np.array([math.lgamma(n_productos + 1) - math.lgamma(j + 1) - math.lgamma(n_productos - j + 1)
+                         for j in k])
+    return float(np.logaddexp.reduce(log_comb))
+
+
+def cota_epsilon(n: int, m: int, delta: float, cota: str = "bernstein", soporte_max: float = 0.5,
+                 log_m: float = None) -> float:
+    """
+    Error máximo de m soportes estimados con n órdenes, con probabilidad ≥ 1 − delta para todos a la vez (si m y
+    soporte_max no dependen de la muestra). log_m reemplaza a m cuando m no cabe en un float.
+    """
+    if cota not in COTAS:
+        raise ValueError(f"Cota desconocida: {cota} (opciones: {COTAS})")
+    log = (math.log(2 * max(m, 1)) if log_m is None else math.log(2) + log_m) - math.log(delta)
+    if cota == "hoeffding":
+        return math.sqrt(log / (2 * n))
+    # Bernstein: n·ε² / (2v + 2ε/3) = log  →  ε = (log/3 + sqrt((log/3)² + 2·n·v·log)) / n
+    varianza = min(soporte_max, 0.5) * (1 - min(soporte_max, 0.5))
+    return (log / 3 + math.sqrt((log / 3) ** 2 + 2 * n * varianza * log)) / n
+
+
+def _diferencia_maxima(actual: pd.DataFrame, anterior: pd.DataFrame) -> float:
+    """
+    Mayor diferencia de soporte entre los conjuntos presentes en ambos pasos.
+    """
+    if anterior is None:
+        return math.inf
+    comunes = actual.merge(anterior, on="itemsets", suffixes=("", "_anterior"))
+    if comunes.empty:
+        return math.inf
+    return float((comunes["support"] - comunes["support_anterior"]).abs().max())
+
+
+def muestreo_progresivo(offsets: np.ndarray, productos: np.ndarray, min_support: float, epsilon: float = 0.001,
+                        confianza: float = 0.95, cota: str = "bernstein", motor: str = "fpgrowth",
+                        n_inicial: int = 10_000, factor: float = 2.0, semilla: int = 42, max_len: int = None,
+                        nombres: np.ndarray = None, n_jobs: int = 1):
+    """
+    Conjuntos frecuentes (support ≥ min_support, formato de mlxtend) de la menor muestra aleatoria de órdenes
+    cuya cota de error en los soportes es ≤ epsilon con la confianza dada. Con cota="hoeffding" es una garantía
+    sobre todos los candidatos; con "bernstein", una cota heurística (m y la varianza salen de la muestra).
+    Devuelve (frecuentes, informe) con el tamaño de muestra usado, la cota alcanzada y si es garantizada.
+    """
+    delta = 1 - confianza
+    n_total = len(offsets) - 1
+    # Candidatos fijados antes de muestrear (Hoeffding): productos presentes y largo máximo de un conjunto
+    n_productos = int(np.count_nonzero(np.bincount(np.asarray(productos))))
+    largo = max_len if max_len is not None else int(np.diff(offsets).max(initial=1))
+    log_m = log_candidatos(n_productos, largo)
+    matriz = codificar_disperso(offsets, productos, None if nombres is None else len(nombres))
+    orden = np.random.default_rng(semilla).permutation(n_total)
+    umbral = max(min_support - epsilon, 1 / n_total)
+
+    # La cota de Bernstein se informa como heurística
+    etiqueta = "" if cota == "hoeffding" else " (heurística)"
+    n, anterior, pasos = min(n_inicial, n_total), None, []
+    while True:
+        muestra = matriz[np.sort(orden[:n])]
+        frecuentes = conjuntos_frecuentes(muestra, umbral, motor=motor, columnas=nombres, max_len=max_len,
+                                          n_jobs=n_jobs)
+        soporte_max = float(frecuentes["support"].max()) if len(frecuentes) else 0.0
+        # Con todas las órdenes los soportes son exactos
+        if n == n_total:
+            alcanzada = 0.0
+        elif cota == "hoeffding":
+            alcanzada = cota_epsilon(n, None, delta, cota, log_m=log_m)
+        else:
+            alcanzada = cota_epsilon(n, len(frecuentes), delta, cota, soporte_max)
+        diferencia = _diferencia_maxima(frecuentes, anterior)
+        pasos.append({"ordenes": n, "conjuntos": len(frecuentes), "cota_epsilon": alcanzada,
+                      "diferencia_con_anterior": diferencia})
+        print(f"   🎲 {n:,} órdenes → {len(frecuentes):,} conjuntos | cota ε{etiqueta} = {alcanzada:.5f} | "
+              f"Δ soporte = {diferencia:.5f}")
+
+        if n == n_total or (alcanzada <= epsilon and diferencia <= epsilon):
+            break
+        anterior = frecuentes
+        n = min(n_total, math.ceil(n * factor))
+
+    frecuentes = frecuentes[frecuentes["support"] >= min_support].reset_index(drop=True)
+    informe = {
+        "ordenes_muestra": n, "ordenes_total": n_total, "fraccion": n / n_total,
+        "cota": cota, "cota_epsilon": alcanzada, "garantizada": cota == "hoeffding" or n == n_total,
+        "epsilon": epsilon, "confianza": confianza,
+        "conjuntos": len(frecuentes), "pasos": len(pasos),
+    }
+    return frecuentes, informe
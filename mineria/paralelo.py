@@ -0,0 +1,196 @@
+###################################################################################################################
+################################ Minería en paralelo sobre cestas en memoria compartida ###########################
+###################################################################################################################
+
+# Reparte la minería de FP-Growth / dEclat entre procesos (ProcessPoolExecutor), sin copiar las cestas:
+# 1. el proceso principal recodifica las cestas a rangos (fpgrowth.preparar) una sola vez
+# 2. los arreglos resultantes se publican en bloques de multiprocessing.shared_memory; cada trabajador los
+#    adjunta al iniciar como vistas numpy (solo viajan por pickle el nombre, la forma y el tipo de cada bloque)
+# 3. el espacio de búsqueda se divide por ítem de primer nivel, que son subproblemas independientes:
+#    · fpgrowth: el ítem i mina el árbol condicional de los prefijos de sus cestas (las que contienen i)
+#    · declat:   el ítem k expande su rama de la clase raíz (cada trabajador arma la clase raíz una vez)
+# 4. los ítems se agrupan por costo estimado (LPT: el más caro al grupo con menos carga) en ~4 grupos por
+#    proceso, y los grupos más caros se envían primero para no dejar procesos ociosos al final
+# 5. los resultados parciales se ordenan por ítem y se unen: la salida es idéntica a la del motor secuencial
+#
+# En Windows los procesos se crean con spawn: los scripts que usan n_jobs deben ir bajo if __name__ == "__main__".
+
+import heapq
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from mineria.declat import clase_raiz, minar_clase, vista_vertical
+from mineria.fpgrowth import arbol_condicional, cuenta_minima, formato_mlxtend, minar_arbol, preparar
+
+# Grupos de ítems por proceso: más grupos equilibran mejor la carga, menos reducen el costo por tarea
+GRUPOS_POR_PROCESO = 4
+
+# Estado de cada trabajador (arreglos compartidos y parámetros), cargado por _iniciar_trabajador
+_estado = {}
+
+
+################################################ Memoria compartida ################################################
+
+
+def _publicar(arreglos: dict):
+    """
+    Copia los arreglos a bloques de memoria compartida. Devuelve (bloques, descriptores picklables).
+    """
+    bloques, descriptores = [], {}
+    for nombre, arreglo in arreglos.items():
+        arreglo = np.ascontiguousarray(arreglo)
+        bloque = shared_memory.SharedMemory(create=True, size=max(arreglo.nbytes, 1))
+        np.ndarray(arreglo.shape, dtype=arreglo.dtype, buffer=bloque.buf)[...] = arreglo
+        bloques.append(bloque)
+        descriptores[nombre] = (bloque.name, arreglo.shape, arreglo.dtype.str)
+    return bloques, descriptores
+
+
+def _adjuntar(descriptores: dict):
+    """
+    Vistas numpy de los bloques publicados. El proceso principal es el único que los libera (unlink).
+    """
+    bloques, arreglos = [], {}
+    for nombre, (bloque_nombre, forma, tipo) in descriptores.items():
+        # Los trabajadores comparten el resource_tracker del proceso principal (fork y spawn): adjuntar
+        # un bloque ya registrado no cambia nada, y el único unlink es el del proceso principal
+        bloque = shared_memory.SharedMemory(name=bloque_nombre)
+        bloques.append(bloque)
+        arreglos[nombre] = np.ndarray(forma, dtype=tipo, buffer=bloque.buf)
+    return bloques, arreglos
+
+
+def _iniciar_trabajador(descriptores: dict, parametros: dict) -> None:
+    bloques, arreglos = _adjuntar(descriptores)
+    _estado.update(arreglos, bloques=bloques, **parametros)
+    if parametros["motor"] == "declat":
+        _estado["raiz"] = clase_raiz(arreglos["tids"], arreglos["inicio"], parametros["palabras"])
+
+
+################################################ Tareas por ítem ################################################
+
+
+def _tarea_fpgrowth(items: list) -> list:
+    """
+    Conjuntos frecuentes cuyo ítem de menor frecuencia (mayor rango) es cada uno de los items.
+    """
+    offsets, rangos, por_item, inicio = _estado["offsets"], _estado["rangos"], _estado["por_item"], _estado["inicio"]
+    min_cuenta, max_len, n_items = _estado["min_cuenta"], _estado["max_len"], _estado["n_items"]
+
+    resultados = []
+    for i in items:
+        # Base condicional de i: el prefijo (ítems más frecuentes) de cada cesta que contiene i
+        posiciones = por_item[inicio[i]:inicio[i + 1]]
+        cestas = np.searchsorted(offsets, posiciones, side="right") - 1
+        largos = posiciones - offsets[cestas]
+        nuevos = np.zeros(len(posiciones) + 1, dtype=np.int64)
+        np.cumsum(largos, out=nuevos[1:])
+        indices = np.repeat(offsets[cestas] - nuevos[:-1], largos) + np.arange(nuevos[-1])
+
+        salida = [((int(i),), len(posiciones))]
+        if max_len is None or max_len > 1:
+            pesos = np.ones(len(posiciones), dtype=np.int64)
+            condicional = arbol_condicional(nuevos, rangos[indices], pesos, min_cuenta, n_items)
+            if condicional is not None:
+                minar_arbol(condicional, (int(i),), min_cuenta, max_len, salida)
+        resultados.append((i, salida))
+    return resultados
+
+
+def _tarea_declat(posiciones: list) -> list:
+    """
+    Conjuntos frecuentes de las ramas de la clase raíz en las posiciones dadas.
+    """
+    resultados = []
+    for k in posiciones:
+        salida = []
+        minar_clase((), _estado["raiz"], False, _estado["min_cuenta"], _estado["max_len"], _estado["palabras"],
+                    salida, posiciones=[k])
+        resultados.append((k, salida))
+    return resultados
+
+
+def _agrupar(costos: np.ndarray, n_grupos: int) -> list:
+    """
+    Reparte los índices en n_grupos con carga similar (LPT). Devuelve los grupos del más caro al más barato.
+    """
+    cargas = [(0.0, g) for g in range(n_grupos)]
+    grupos = [[] for _ in range(n_grupos)]
+    for k in np.argsort(-costos, kind="stable"):
+        carga, g = heapq.heappop(cargas)
+        grupos[g].append(int(k))
+        heapq.heappush(cargas, (carga + float(costos[k]), g))
+    carga_de = {g: carga for carga, g in cargas}
+    return [grupos[g] for g in sorted(range(n_grupos), key=lambda g: -carga_de[g]) if grupos[g]]
+
+
+################################################ Punto de entrada ################################################
+
+
+def procesos(n_jobs: int) -> int:
+    """
+    Cantidad de procesos para n_jobs (-1 = todos los núcleos, -2 = todos menos uno, como en scikit-learn).
+    """
+    if n_jobs == 0:
+        raise ValueError("n_jobs no puede ser 0")
+    return n_jobs if n_jobs > 0 else max(1, (os.cpu_count() or 1) + 1 + n_jobs)
+
+
+def minar_en_paralelo(offsets: np.ndarray, productos: np.ndarray, min_support: float, n_jobs: int = -1,
+                      motor: str = "fpgrowth", max_len: int = None, nombres: np.ndarray = None) -> pd.DataFrame:
+    """
+    Conjuntos frecuentes con el motor dado ("fpgrowth" o "declat") repartidos en n_jobs procesos.
+    Mismo resultado y formato (support, itemsets) que el motor secuencial.
+    """
+    if motor not in ("fpgrowth", "declat"):
+        raise ValueError(f"Motor sin versión paralela: {motor}")
+
+    n = len(offsets) - 1
+    min_cuenta = cuenta_minima(min_support, n)
+    offsets_r, rangos, codigo_de_rango = preparar(offsets, productos, min_cuenta)
+    n_items = len(codigo_de_rango)
+    if n_items == 0:
+        return formato_mlxtend([], codigo_de_rango, n, nombres)
+
+    parametros = {"motor": motor, "min_cuenta": min_cuenta, "max_len": max_len, "n_items": n_items}
+    if motor == "fpgrowth":
+        # Posiciones de cada ítem en las cestas, agrupadas por ítem: las de i son por_item[inicio[i]:inicio[i + 1]]
+        por_item = np.argsort(rangos, kind="stable")
+        inicio = np.zeros(n_items + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rangos, minlength=n_items), out=inicio[1:])
+        arreglos = {"offsets": offsets_r, "rangos": rangos, "por_item": por_item, "inicio": inicio}
+        # Costo de i ≈ largo total de sus caminos prefijo (posición de i dentro de cada cesta)
+        posicion = np.arange(len(rangos)) - np.repeat(offsets_r[:-1], np.diff(offsets_r))
+        costos = np.bincount(rangos, weights=posicion + 1, minlength=n_items)
+        tarea = _tarea_fpgrowth
+    else:
+        tids, inicio = vista_vertical(offsets_r, rangos, n_items)
+        arreglos = {"tids": tids, "inicio": inicio}
+        parametros["palabras"] = max(1, -(-n // 64))
+        # La rama k de la clase raíz (soporte creciente) cruza su tid-list con los n_items - k - 1 siguientes
+        soportes = np.diff(inicio)[::-1]
+        costos = soportes * (n_items - np.arange(n_items)).astype(np.float64)
+        tarea = _tarea_declat
+    del offsets_r, rangos
+
+    n_procesos = min(procesos(n_jobs), n_items)
+    grupos = _agrupar(costos, min(n_items, n_procesos * GRUPOS_POR_PROCESO))
+
+    bloques, descriptores = _publicar(arreglos)
+    del arreglos
+    try:
+        with ProcessPoolExecutor(max_workers=n_procesos, initializer=_iniciar_trabajador,
+                                 initargs=(descriptores, parametros)) as ejecutor:
+            partes = [r for futuro in [ejecutor.submit(tarea, g) for g in grupos] for r in futuro.result()]
+    finally:
+        for bloque in bloques:
+            bloque.close()
+            bloque.unlink()
+
+    # Mismo orden que la recursión secuencial (por ítem de primer nivel)
+    salida = [par for _, parcial in sorted(partes, key=lambda p: p[0]) for par in parcial]
+    return formato_mlxtend(salida, codigo_de_rango, n, nombres)
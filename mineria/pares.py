@@ -0,0 +1,119 @@
+###################################################################################################################
+################################ Co-ocurrencia exacta de pares de productos (Xᵀ X) ################################
+###################################################################################################################
+
+# Casi todas las reglas que se muestran son pares 1 → 1, y los mapas de calor pivoteaban una tabla de reglas ya
+# filtrada. Las métricas de todos los pares salen de una sola multiplicación dispersa sobre la matriz one-hot
+# órdenes × productos X (mineria/codificacion.py):
+# - C = Xᵀ X: C[a, b] = órdenes con a y b, y la diagonal C[a, a] = órdenes con a
+# - soporte, confianza (en los dos sentidos), elevación y apalancamiento de cada par se calculan de una vez con
+#   arreglos sobre las entradas no nulas de C
+#
+# Para no tener nunca Xᵀ X completa en memoria se multiplica por bloques de columnas y de cada bloque solo se
+# guarda el triángulo superior (a < b) con cuenta ≥ min_cuenta. El resultado es una tabla dispersa en formato
+# coordenado (un par por fila) que se guarda como artefacto Parquet; matriz_pares() la vuelve a armar como matriz
+# dispersa para búsquedas y submatriz() arma la tabla densa de un grupo de productos: los mapas de calor (04.5 y la
+# página Apriori del dashboard, también por clúster) la leen en lugar de pivotear reglas filtradas.
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from mineria.codificacion import codificar_disperso
+
+COLUMNAS_PARES = ["producto_a", "producto_b", "cuenta", "soporte", "confianza_ab", "confianza_ba", "elevacion",
+                  "apalancamiento"]
+
+
+def contar_pares(offsets: np.ndarray, productos: np.ndarray, n_codigos: int, min_cuenta: int = 1,
+                 bloque: int = 2048) -> pd.DataFrame:
+    """
+    Pares de productos (a < b) que aparecen juntos en al menos min_cuenta órdenes, con sus métricas.
+    bloque: columnas de Xᵀ X que se calculan a la vez (acota la memoria).
+    """
+    n_ordenes = len(offsets) - 1
+    x = codificar_disperso(offsets, productos, n_codigos).astype(np.int32)
+    xt = x.T.tocsr()
+    x = x.tocsc()
+    cuentas = np.bincount(np.asarray(productos), minlength=n_codigos).astype(np.int64)
+
+    # Solo columnas de productos que aparecen (el resto no forma pares)
+    presentes = np.flatnonzero(cuentas)
+    partes_a, partes_b, partes_c = [], [], []
+    for inicio in range(0, len(presentes), bloque):
+        columnas = presentes[inicio:inicio + bloque]
+        # Filas a < b: basta con los productos hasta la última columna del bloque. El prefijo de Xᵀ se arma como
+        # vista de sus arreglos CSR (indptr / indices / data), sin recortar ni copiar la matriz en cada bloque
+        k = int(columnas[-1])
+        fin = xt.indptr[k]
+        prefijo = sparse.csr_matrix((xt.data[:fin], xt.indices[:fin], xt.indptr[:k + 1]), shape=(k, xt.shape[1]),
+                                    copy=False)
+        bloque_c = (prefijo @ x[:, columnas]).tocoo()
+        b = columnas[bloque_c.col]
+        mantener = (bloque_c.row < b) & (bloque_c.data >= min_cuenta)
+        partes_a.append(bloque_c.row[mantener].astype(np.int32))
+        partes_b.append(b[mantener].astype(np.int32))
+        partes_c.append(bloque_c.data[mantener].astype(np.int32))
+
+    a = np.concatenate(partes_a) if partes_a else np.empty(0, dtype=np.int32)
+    b = np.concatenate(partes_b) if partes_b else np.empty(0, dtype=np.int32)
+    cab = np.concatenate(partes_c) if partes_c else np.empty(0, dtype=np.int32)
+    return metricas_pares(a, b, cab, cuentas, n_ordenes)
+
+
+def metricas_pares(a: np.ndarray, b: np.ndarray, cab: np.ndarray, cuentas: np.ndarray, n_ordenes: int) -> pd.DataFrame:
+    """
+    Soporte, confianzas, elevación y apalancamiento de los pares (a, b) con cuenta conjunta cab.
+    Las métricas se guardan en float32: alcanzan para filtrar y graficar y la tabla pesa la mitad.
+    """
+    ca, cb, c = cuentas[a].astype(np.float64), cuentas[b].astype(np.float64), cab.astype(np.float64)
+    n = float(max(n_ordenes, 1))
+    return pd.DataFrame({
+        "producto_a": a,
+        "producto_b": b,
+        "cuenta": cab,
+        "soporte": (c / n).astype(np.float32),
+        "confianza_ab": (c / ca).astype(np.float32),
+        "confianza_ba": (c / cb).astype(np.float32),
+        "elevacion": (c * n / (ca * cb)).astype(np.float32),
+        "apalancamiento": (c / n - ca * cb / (n * n)).astype(np.float32),
+    }, columns=COLUMNAS_PARES)
+
+
+def matriz_pares(pares: pd.DataFrame, metrica: str = "elevacion", n_codigos: int = None) -> sparse.csr_matrix:
+    """
+    Matriz dispersa productos × productos con la métrica de cada par (fila = antecedente, columna = consecuente).
+    "confianza" usa confianza_ab de a → b y confianza_ba de b → a; las demás métricas son simétricas.
+    """
+    a = pares["producto_a"].to_numpy()
+    b = pares["producto_b"].to_numpy()
+    if metrica == "confianza":
+        ida, vuelta = pares["confianza_ab"].to_numpy(), pares["confianza_ba"].to_numpy()
+    else:
+        ida = vuelta = pares[metrica].to_numpy()
+    if n_codigos is None:
+        n_codigos = int(max(a.max(initial=-1), b.max(initial=-1))) + 1
+    return sparse.csr_matrix((np.concatenate([ida, vuelta]), (np.concatenate([a, b]), np.concatenate([b, a]))),
+                             shape=(n_codigos, n_codigos))
+
+
+def submatriz(pares: pd.DataFrame, codigos, metrica: str = "elevacion", nombres: np.ndarray = None,
+              columnas=None) -> pd.DataFrame:
+    """
+    Tabla densa de la métrica entre los productos indicados (0 si nunca aparecen juntos), para mapas de calor.
+    Filas = codigos (antecedentes); columnas = los mismos códigos o, si se indican, columnas (consecuentes).
+    """
+    filas = np.asarray(codigos, dtype=np.int64)
+    columnas = filas if columnas is None else np.asarray(columnas, dtype=np.int64)
+    a, b = pares["producto_a"].to_numpy(), pares["producto_b"].to_numpy()
+    n_codigos = int(max(filas.max(initial=-1), columnas.max(initial=-1), a.max(initial=-1), b.max(initial=-1))) + 1
+
+    # Antes de armar la matriz, solo los pares entre productos pedidos (una máscara por código, sin ordenar)
+    pedidos = np.zeros(n_codigos, dtype=bool)
+    pedidos[filas] = True
+    pedidos[columnas] = True
+    densa = matriz_pares(pares[pedidos[a] & pedidos[b]], metrica, n_codigos)[filas][:, columnas].toarray()
+    if nombres is None:
+        return pd.DataFrame(densa, index=filas, columns=columnas)
+    nombres = np.asarray(nombres, dtype=object)
+    return pd.DataFrame(densa, index=nombres[filas], columns=nombres[columnas])
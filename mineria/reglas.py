@@ -0,0 +1,124 @@
+###################################################################################################################
+######################################## Top-k reglas por elevación o confianza ###################################
+###################################################################################################################
+
+# association_rules() genera todas las reglas de los conjuntos frecuentes y después los scripts descartan casi
+# todas con umbrales fijos (lift > 1.5 / 3.2 / 2.0, confianza > 0.2 ...) para quedarse con un top 10 o top 5.
+# reglas_top_k() devuelve directamente las k mejores reglas por "lift" o "confidence":
+# 1. para cada conjunto Z (≥ 2 ítems) se calcula una cota de la mejor regla que puede dar. Todo antecedente o
+#    consecuente X ⊂ Z está contenido en algún Z − {i}, así que soporte(X) ≥ m = min_i soporte(Z − {i}):
+#    · confianza(X → Y) = s(Z) / s(X) ≤ s(Z) / m
+#    · elevación(X → Y) = s(Z) / (s(X)·s(Y)) ≤ s(Z) / m²
+# 2. los conjuntos se recorren de mayor a menor cota; las k mejores reglas se guardan en un heap y el umbral
+#    interno (la k-ésima mejor) sube a medida que aparecen reglas mejores. Cuando la cota del siguiente conjunto
+#    no supera el umbral, ningún conjunto restante puede aportar y la búsqueda termina
+# 3. dentro de un conjunto, los consecuentes crecen de a un ítem (como ap-genrules): pasar ítems del antecedente
+#    al consecuente nunca sube la confianza, y la elevación queda acotada por confianza / s(Z), así que una rama
+#    bajo el umbral no se sigue extendiendo
+#
+# La salida tiene las mismas columnas que association_rules() para que los scripts posteriores no cambien.
+
+import heapq
+import itertools
+import math
+
+import numpy as np
+import pandas as pd
+
+METRICAS_TOP_K = ["lift", "confidence"]
+
+
+def _cotas(soportes: dict, metrica: str) -> list:
+    """
+    (cota, conjunto) de cada conjunto frecuente con al menos 2 ítems, de mayor a menor cota.
+    """
+    cotas = []
+    for conjunto, soporte in soportes.items():
+        if len(conjunto) < 2:
+            continue
+        m = min(soportes[conjunto - {i}] for i in conjunto)
+        cotas.append((soporte / m if metrica == "confidence" else soporte / (m * m), conjunto))
+    cotas.sort(key=lambda c: c[0], reverse=True)
+    return cotas
+
+
+def _siguientes(consecuentes: list) -> list:
+    """
+    Consecuentes de un ítem más, cuyos subconjuntos de un ítem menos siguieron todos en la búsqueda.
+    """
+    vigentes = set(consecuentes)
+    nuevos = set()
+    for a, b in itertools.combinations(consecuentes, 2):
+        union = a | b
+        if len(union) == len(a) + 1 and all(union - {i} in vigentes for i in union):
+            nuevos.add(union)
+    return list(nuevos)
+
+
+def completar_metricas(reglas: pd.DataFrame) -> pd.DataFrame:
+    """
+    Completa las columnas de association_rules() a partir de los soportes de antecedente, consecuente y regla.
+    """
+    s, sa, sc = reglas["support"], reglas["antecedent support"], reglas["consequent support"]
+    conf = reglas["confidence"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        reglas["representativity"] = 1.0
+        reglas["leverage"] = s - sa * sc
+        reglas["conviction"] = np.where(conf < 1, (1 - sc) / (1 - conf), np.inf)
+        reglas["zhangs_metric"] = reglas["leverage"] / np.maximum(s * (1 - sa), sa * (sc - s))
+        reglas["jaccard"] = s / (sa + sc - s)
+        reglas["certainty"] = np.where(sc < 1, (conf - sc) / (1 - sc), 0.0)
+        reglas["kulczynski"] = (s / sa + s / sc) / 2
+    return reglas
+
+
+def reglas_top_k(frecuentes: pd.DataFrame, k: int, metrica: str = "lift", min_confianza: float = 0.0) -> pd.DataFrame:
+    """
+    Las k reglas con mayor metrica ("lift" o "confidence") de los conjuntos frecuentes (formato de mlxtend),
+    entre las que tienen confianza ≥ min_confianza. Mismas columnas que association_rules().
+    """
+    if metrica not in METRICAS_TOP_K:
+        raise ValueError(f"Métrica desconocida: {metrica} (opciones: {METRICAS_TOP_K})")
+
+    soportes = dict(zip(map(frozenset, frecuentes["itemsets"]), frecuentes["support"].astype(float)))
+    mejores, orden = [], itertools.count()
+
+    def umbral() -> float:
+        return mejores[0][0] if len(mejores) == k else -math.inf
+
+    for cota, conjunto in _cotas(soportes, metrica):
+        if cota <= umbral():
+            break
+        soporte = soportes[conjunto]
+        consecuentes = [frozenset([i]) for i in conjunto]
+        while consecuentes:
+            siguen = []
+            for consecuente in consecuentes:
+                antecedente = conjunto - consecuente
+                confianza = soporte / soportes[antecedente]
+                if confianza < min_confianza:
+                    continue
+                valor = confianza if metrica == "confidence" else confianza / soportes[consecuente]
+                if valor > umbral():
+                    entrada = (valor, -next(orden), antecedente, consecuente)
+                    if len(mejores) < k:
+                        heapq.heappush(mejores, entrada)
+                    else:
+                        heapq.heapreplace(mejores, entrada)
+                # Consecuentes más grandes: confianza ≤ la actual, elevación ≤ confianza / s(Z)
+                alcanzable = confianza if metrica == "confidence" else confianza / soporte
+                if alcanzable > umbral():
+                    siguen.append(consecuente)
+            consecuentes = [c for c in _siguientes(siguen) if len(c) < len(conjunto)]
+
+    mejores.sort(reverse=True)
+    reglas = pd.DataFrame({
+        "antecedents": [a for _, _, a, _ in mejores],
+        "consequents": [c for _, _, _, c in mejores],
+        "antecedent support": [soportes[a] for _, _, a, _ in mejores],
+        "consequent support": [soportes[c] for _, _, _, c in mejores],
+        "support": [soportes[a | c] for _, _, a, c in mejores],
+    })
+    reglas["confidence"] = reglas["support"] / reglas["antecedent support"]
+    reglas["lift"] = reglas["confidence"] / reglas["consequent support"]
+    return completar_metricas(reglas)
@@ -0,0 +1,108 @@
+###################################################################################################################
+############################ Retículo de conjuntos frecuentes: reglas para cualquier umbral #######################
+###################################################################################################################
+
+# Probar otro min_support obligaba a correr de nuevo 02. analisis_apriori.py completo. Los conjuntos frecuentes
+# minados una vez a un soporte piso, con sus cuentas absolutas (el estado "03a." / "07a." de mineria/incremental.py),
+# ya contienen los de cualquier soporte mayor, y con ellos todas las reglas:
+# 1. al construir el Reticulo se enumeran una sola vez todas las reglas X → Z − X de cada conjunto Z como tres
+#    arreglos de índices (conjunto, antecedente, consecuente) sobre la tabla de conjuntos, y se calculan soporte,
+#    confianza y elevación de todas a la vez
+# 2. reglas_en(min_support, min_confianza, min_lift) solo aplica las tres máscaras y arma la tabla de las que
+#    pasan: milisegundos, sin minar ni recorrer conjuntos en Python
+#
+# Los subconjuntos de un conjunto frecuente también lo son, así que antecedente y consecuente siempre están en la
+# tabla. Las reglas coinciden con association_rules() sobre los frecuentes de ese soporte.
+
+import numpy as np
+import pandas as pd
+
+from mineria.incremental import leer_estado
+from mineria.reglas import completar_metricas
+
+
+class Reticulo:
+    """
+    Conjuntos frecuentes (minados a soporte ≥ piso) con sus cuentas y todas sus reglas precalculadas.
+    """
+
+    def __init__(self, itemsets, cuentas, n_ordenes: int, piso: float, nombres: np.ndarray = None):
+        self.n_ordenes = int(n_ordenes)
+        self.piso = piso
+        self.cuentas = np.asarray(cuentas, dtype=np.int64)
+        self.conjuntos = [tuple(sorted(s)) for s in itemsets]
+        etiquetas = None if nombres is None else np.asarray(nombres, dtype=object)
+        self.itemsets = np.empty(len(self.conjuntos), dtype=object)
+        self.itemsets[:] = [frozenset(c if etiquetas is None else etiquetas[list(c)].tolist())
+                            for c in self.conjuntos]
+
+        # 1️⃣ Todas las reglas: cada subconjunto propio no vacío de cada conjunto como antecedente
+        posicion = {c: i for i, c in enumerate(self.conjuntos)}
+        conjunto, antecedente, consecuente = [], [], []
+        for z, items in enumerate(self.conjuntos):
+            largo = len(items)
+            for mascara in range(1, (1 << largo) - 1):
+                conjunto.append(z)
+                antecedente.append(posicion[tuple(x for b, x in enumerate(items) if mascara >> b & 1)])
+                consecuente.append(posicion[tuple(x for b, x in enumerate(items) if not mascara >> b & 1)])
+        self.conjunto = np.array(conjunto, dtype=np.int32)
+        self.antecedente = np.array(antecedente, dtype=np.int32)
+        self.consecuente = np.array(consecuente, dtype=np.int32)
+
+        soporte = self.cuentas / self.n_ordenes
+        self.soporte = soporte[self.conjunto]
+        self.confianza = self.soporte / soporte[self.antecedente]
+        self.lift = self.confianza / soporte[self.consecuente]
+
+    @classmethod
+    def desde_frecuentes(cls, frecuentes: pd.DataFrame, n_ordenes: int, piso: float, nombres: np.ndarray = None):
+        """
+        Retículo a partir de conjuntos frecuentes en formato de mlxtend (support, itemsets).
+        """
+        cuentas = np.rint(frecuentes["support"].to_numpy() * n_ordenes).astype(np.int64)
+        return cls(frecuentes["itemsets"], cuentas, n_ordenes, piso, nombres)
+
+    @classmethod
+    def leer(cls, nombre: str, nombres: np.ndarray = None, **kwargs):
+        """
+        Retículo a partir de un estado guardado con mineria/incremental.guardar_estado (ej. "03a. itemsets_apriori").
+        """
+        estado, meta = leer_estado(nombre, **kwargs)
+        return cls(estado["itemsets"], estado["cuenta"], meta["n_ordenes"], meta["min_support"], nombres)
+
+    @property
+    def n_reglas(self) -> int:
+        return len(self.conjunto)
+
+    def frecuentes(self) -> pd.DataFrame:
+        """
+        Los conjuntos del retículo en formato de mlxtend (support, itemsets).
+        """
+        return pd.DataFrame({"support": self.cuentas / self.n_ordenes, "itemsets": self.itemsets})
+
+    def mascara(self, min_support: float = None, min_confianza: float = 0.0, min_lift: float = 0.0) -> np.ndarray:
+        """
+        Reglas (posiciones en los arreglos del retículo) que cumplen los tres umbrales.
+        """
+        min_support = self.piso if min_support is None else min_support
+        if min_support < self.piso:
+            raise ValueError(f"min_support={min_support} está bajo el piso del retículo ({self.piso}): hay que minar de nuevo")
+        return (self.soporte >= min_support) & (self.confianza >= min_confianza) & (self.lift >= min_lift)
+
+    def reglas_en(self, min_support: float = None, min_confianza: float = 0.0, min_lift: float = 0.0) -> pd.DataFrame:
+        """
+        Reglas con soporte, confianza y elevación sobre los umbrales, con las columnas de association_rules().
+        """
+        sel = np.flatnonzero(self.mascara(min_support, min_confianza, min_lift))
+        soporte = self.cuentas / self.n_ordenes
+        a, c = self.antecedente[sel], self.consecuente[sel]
+        reglas = pd.DataFrame({
+            "antecedents": self.itemsets[a],
+            "consequents": self.itemsets[c],
+            "antecedent support": soporte[a],
+            "consequent support": soporte[c],
+            "support": self.soporte[sel],
+            "confidence": self.confianza[sel],
+            "lift": self.lift[sel],
+        })
+        return completar_metricas(reglas)
@@ -0,0 +1,136 @@
+###################################################################################################################
+############################## Significancia estadística de las reglas (Fisher / χ² + BH) #########################
+###################################################################################################################
+
+# Todas las reglas con lift ≥ 1 se guardaban, aunque salieran de un puñado de órdenes. Cada regla X → Y define una
+# tabla de contingencia 2×2 con las cuentas que ya tiene la tabla de reglas (soportes × n órdenes):
+#
+#                 Y            no Y
+#     X          n_xy          n_x − n_xy
+#     no X       n_y − n_xy    n − n_x − n_y + n_xy
+#
+# - "fisher": prueba exacta de Fisher unilateral (asociación positiva): P(N_xy ≥ n_xy) con N_xy hipergeométrica
+# - "chi2":   χ² de Pearson con 1 grado de libertad, también unilateral: la mitad de la cola cuando n_xy supera lo
+#             esperado (n_xy · n > n_x · n_y) y 1 − esa mitad si no, así las dos pruebas responden la misma pregunta
+# Ambas se calculan para todas las reglas a la vez, sin recorrer filas. stats.hypergeom.sf evalúa cada regla por
+# separado (cientos de µs con cuentas grandes), así que la cola de Fisher se suma vectorizada: el primer término
+# sale de logaritmos de combinatorios y los siguientes de la razón entre términos consecutivos, con todas las reglas
+# que todavía no convergieron avanzando a la vez. Como se prueban miles de reglas, q_value aplica la corrección de
+# Benjamini–Hochberg (tasa de falsos descubrimientos) sobre las reglas de la tabla.
+
+import numpy as np
+import pandas as pd
+from scipy import special, stats
+
+PRUEBAS = ["fisher", "chi2"]
+
+
+def _cuentas(reglas: pd.DataFrame, n_ordenes: int):
+    n_x = np.rint(reglas["antecedent support"].to_numpy(dtype=np.float64) * n_ordenes)
+    n_y = np.rint(reglas["consequent support"].to_numpy(dtype=np.float64) * n_ordenes)
+    n_xy = np.rint(reglas["support"].to_numpy(dtype=np.float64) * n_ordenes)
+    return n_x, n_y, n_xy
+
+
+def _log_comb(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return -np.log1p(a) - special.betaln(a - b + 1, b + 1)
+
+
+def _sumar_terminos(termino: np.ndarray, j: np.ndarray, n: float, n_x: np.ndarray, n_y: np.ndarray,
+                    hacia_arriba: bool) -> np.ndarray:
+    """
+    Suma de términos hipergeométricos desde j (con probabilidad termino) hacia arriba o hacia abajo, hasta que el
+    término siguiente ya no cambia la suma. Cada iteración avanza todas las reglas pendientes a la vez.
+    """
+    total = termino.copy()
+    limite = np.minimum(n_x, n_y) if hacia_arriba else np.maximum(0.0, n_x + n_y - n)
+    activos = np.flatnonzero((j != limite) & (termino > 0))
+    j, t = j[activos], termino[activos]
+    while len(activos):
+        x, y = n_x[activos], n_y[activos]
+        if hacia_arriba:
+            t = t * (x - j) * (y - j) / ((j + 1) * (n - x - y + j + 1))
+            j = j + 1
+        else:
+            t = t * j * (n - x - y + j) / ((x - j + 1) * (y - j + 1))
+            j = j - 1
+        total[activos] += t
+        # Desde el punto de partida los términos solo bajan (se parte del lado de la cola respecto de la moda)
+        seguir = (j != limite[activos]) & (t > total[activos] * 1e-17)
+        activos, j, t = activos[seguir], j[seguir], t[seguir]
+    return total
+
+
+def cola_fisher(n_xy: np.ndarray, n: float, n_x: np.ndarray, n_y: np.ndarray) -> np.ndarray:
+    """
+    P(N_xy ≥ n_xy) de la hipergeométrica (n órdenes, n_x con X, n_y con Y), igual a stats.hypergeom.sf(n_xy − 1, ...).
+    """
+    n_xy, n_x, n_y = (np.asarray(v, dtype=np.float64) for v in (n_xy, n_x, n_y))
+    moda = np.floor((n_x + 1) * (n_y + 1) / (n + 2))
+    p = np.empty(len(n_xy), dtype=np.float64)
+
+    # Sobre la moda: se suma la cola superior desde n_xy
+    arriba = n_xy > moda
+    k = n_xy[arriba]
+    x, y = n_x[arriba], n_y[arriba]
+    termino = np.exp(_log_comb(x, k) + _log_comb(n - x, y - k) - _log_comb(n, y))
+    p[arriba] = _sumar_terminos(termino, k, n, x, y, hacia_arriba=True)
+
+    # Hasta la moda: 1 − cola inferior desde n_xy − 1 (términos que bajan hacia 0)
+    k = n_xy[~arriba] - 1
+    x, y = n_x[~arriba], n_y[~arriba]
+    with np.errstate(invalid="ignore"):
+        termino = np.where(k >= np.maximum(0.0, x + y - n),
+                           np.exp(_log_comb(x, k) + _log_comb(n - x, y - k) - _log_comb(n, y)), 0.0)
+    termino = np.nan_to_num(termino)
+    p[~arriba] = 1.0 - _sumar_terminos(termino, k, n, x, y, hacia_arriba=False)
+    return np.clip(p, 0.0, 1.0)
+
+
+def valores_p(reglas: pd.DataFrame, n_ordenes: int, prueba: str = "fisher") -> np.ndarray:
+    """
+    Valor p de cada regla (columnas de association_rules()) según su tabla 2×2 sobre n_ordenes órdenes.
+    """
+    if prueba not in PRUEBAS:
+        raise ValueError(f"Prueba desconocida: {prueba} (opciones: {PRUEBAS})")
+    n_x, n_y, n_xy = _cuentas(reglas, n_ordenes)
+    if prueba == "fisher":
+        return cola_fisher(n_xy, n_ordenes, n_x, n_y)
+
+    n = float(n_ordenes)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        chi2 = n * (n_xy * n - n_x * n_y) ** 2 / (n_x * n_y * (n - n_x) * (n - n_y))
+    # Unilateral (asociación positiva), como Fisher: la cola χ² cuenta los dos sentidos del desvío
+    mitad = stats.chi2.sf(chi2, 1) / 2
+    p = np.where(n_xy * n - n_x * n_y > 0, mitad, 1.0 - mitad)
+    # Antecedente o consecuente en todas las órdenes: la tabla no tiene información
+    return np.where(np.isfinite(chi2), p, 1.0)
+
+
+def benjamini_hochberg(valores: np.ndarray) -> np.ndarray:
+    """
+    Valores q de Benjamini–Hochberg: p · m / rango, con el mínimo acumulado desde el final y tope 1.
+    """
+    valores = np.asarray(valores, dtype=np.float64)
+    m = len(valores)
+    if m == 0:
+        return valores.copy()
+    orden = np.argsort(valores, kind="stable")
+    ajustados = valores[orden] * m / np.arange(1, m + 1)
+    ajustados = np.minimum.accumulate(ajustados[::-1])[::-1]
+    q = np.empty(m, dtype=np.float64)
+    q[orden] = np.minimum(ajustados, 1.0)
+    return q
+
+
+def agregar_significancia(reglas: pd.DataFrame, n_ordenes: int, prueba: str = "fisher",
+                          alfa: float = None) -> pd.DataFrame:
+    """
+    Agrega p_value y q_value a las reglas. Con alfa, deja solo las reglas con q_value ≤ alfa.
+    """
+    reglas = reglas.copy()
+    reglas["p_value"] = valores_p(reglas, n_ordenes, prueba)
+    reglas["q_value"] = benjamini_hochberg(reglas["p_value"].to_numpy())
+    if alfa is not None:
+        reglas = reglas[reglas["q_value"] <= alfa].reset_index(drop=True)
+    return reglas
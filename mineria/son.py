@@ -0,0 +1,132 @@
+###################################################################################################################
+############################# Minería particionada en dos pasadas (SON) fuera de memoria ##########################
+###################################################################################################################
+
+# Para cuando ni siquiera las cestas recodificadas del catálogo completo caben cómodas en RAM. Algoritmo SON
+# (Savasere, Omiecinski y Navathe) sobre el almacén en memoria mapeada, que se lee por particiones de órdenes
+# completas (~LINEAS_POR_PARTICION líneas):
+# 1. primera pasada: en cada partición se minan los conjuntos localmente frecuentes (mismo min_support sobre
+#    las órdenes de la partición). Un conjunto globalmente frecuente lo es al menos en una partición, así que
+#    la unión de los locales contiene a todos los globales (no hay falsos negativos)
+# 2. segunda pasada: se cuenta el soporte exacto de cada candidato de la unión recorriendo otra vez las
+#    particiones por bloques de órdenes, y se descartan los que no alcanzan el soporte global
+#
+# El resultado coincide exactamente con la minería en memoria y tiene el formato de mlxtend (support, itemsets).
+# En memoria solo quedan una partición, los candidatos y sus cuentas.
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from mineria.codificacion import codificar_disperso
+from mineria.declat import declat
+from mineria.fpgrowth import cuenta_minima, formato_mlxtend, fpgrowth
+
+# Líneas orden-producto por partición (primera pasada)
+LINEAS_POR_PARTICION = 4_000_000
+
+# Órdenes por bloque al contar los candidatos (segunda pasada): acota la matriz órdenes × candidatos
+ORDENES_POR_BLOQUE = 20_000
+
+MOTORES_LOCALES = {"fpgrowth": fpgrowth, "declat": declat}
+
+
+def particiones(offsets: np.ndarray, lineas: int) -> np.ndarray:
+    """
+    Cortes (índices de orden) que dividen las cestas en particiones de órdenes completas de igual tamaño y
+    a lo más ~lineas líneas. Sin una última partición chica: su umbral local sería muy bajo y llenaría de candidatos.
+    """
+    n = len(offsets) - 1
+    n_particiones = max(1, -(-int(offsets[-1]) // lineas))
+    objetivos = np.arange(n_particiones) * (int(offsets[-1]) / n_particiones)
+    cortes = np.searchsorted(offsets, objetivos, side="right") - 1
+    return np.unique(np.append(cortes, [0, n]))
+
+
+def _cestas(offsets: np.ndarray, productos: np.ndarray, a: int, b: int):
+    """
+    Copia en memoria de las cestas a..b-1 del almacén (offsets relativos a la primera).
+    """
+    inicio, fin = int(offsets[a]), int(offsets[b])
+    return np.asarray(offsets[a:b + 1]) - inicio, np.asarray(productos[inicio:fin])
+
+
+def _incidencia(candidatos: list, n_codigos: int) -> sparse.csr_matrix:
+    """
+    Matriz (códigos de producto × candidatos) con un 1 por cada ítem de cada candidato.
+    """
+    tamanos = np.array([len(c) for c in candidatos], dtype=np.int64)
+    indptr = np.zeros(len(candidatos) + 1, dtype=np.int64)
+    np.cumsum(tamanos, out=indptr[1:])
+    datos = np.ones(indptr[-1], dtype=np.int32)
+    return sparse.csr_matrix((datos, np.concatenate(candidatos), indptr), shape=(len(candidatos), n_codigos)).T.tocsr()
+
+
+def _contar(offsets: np.ndarray, productos: np.ndarray, incidencia: sparse.csr_matrix,
+            tamanos: np.ndarray) -> np.ndarray:
+    """
+    Cantidad de cestas que contienen a cada candidato (columnas de incidencia, con tamanos ítems cada uno).
+    """
+    cuentas = np.zeros(len(tamanos), dtype=np.int64)
+    for a in range(0, len(offsets) - 1, ORDENES_POR_BLOQUE):
+        b = min(a + ORDENES_POR_BLOQUE, len(offsets) - 1)
+        matriz = codificar_disperso(*_cestas(offsets, productos, a, b), incidencia.shape[0]).astype(np.int32)
+        # (órdenes × candidatos): cuántos ítems de cada candidato tiene cada orden → la contiene si tiene todos
+        presentes = (matriz @ incidencia).tocoo()
+        completos = presentes.data == tamanos[presentes.col]
+        cuentas += np.bincount(presentes.col[completos], minlength=len(tamanos))
+    return cuentas
+
+
+def contar_candidatos(offsets: np.ndarray, productos: np.ndarray, candidatos: list, n_codigos: int,
+                      lineas_por_particion: int = LINEAS_POR_PARTICION) -> np.ndarray:
+    """
+    Cantidad exacta de cestas que contienen a cada candidato (tupla de códigos de producto), leyendo las cestas
+    por particiones (pueden ser memmaps del almacén).
+    """
+    if not len(candidatos):
+        return np.zeros(0, dtype=np.int64)
+    incidencia = _incidencia(candidatos, n_codigos)
+    tamanos = np.array([len(c) for c in candidatos], dtype=np.int64)
+    cortes = particiones(offsets, lineas_por_particion)
+    cuentas = np.zeros(len(candidatos), dtype=np.int64)
+    for a, b in zip(cortes[:-1], cortes[1:]):
+        cuentas += _contar(*_cestas(offsets, productos, a, b), incidencia, tamanos)
+    return cuentas
+
+
+def son(offsets: np.ndarray, productos: np.ndarray, min_support: float, max_len: int = None,
+        nombres: np.ndarray = None, motor: str = "fpgrowth", lineas_por_particion: int = LINEAS_POR_PARTICION,
+        n_codigos: int = None) -> pd.DataFrame:
+    """
+    Conjuntos frecuentes de las cestas (offsets, productos) en dos pasadas por particiones (SON).
+    offsets y productos pueden ser memmaps del almacén: solo se copia a memoria una partición a la vez.
+    motor es el minero local de la primera pasada ("fpgrowth" o "declat").
+    """
+    if motor not in MOTORES_LOCALES:
+        raise ValueError(f"Motor local desconocido: {motor} (opciones: {list(MOTORES_LOCALES)})")
+    minar = MOTORES_LOCALES[motor]
+
+    n = len(offsets) - 1
+    if n_codigos is None:
+        n_codigos = int(np.max(productos, initial=-1)) + 1
+    cortes = particiones(offsets, lineas_por_particion)
+
+    # 1️⃣ Candidatos: unión de los conjuntos localmente frecuentes de cada partición
+    candidatos = set()
+    for p, (a, b) in enumerate(zip(cortes[:-1], cortes[1:]), start=1):
+        locales = minar(*_cestas(offsets, productos, a, b), min_support, max_len=max_len)
+        candidatos.update(tuple(sorted(s)) for s in locales["itemsets"])
+        print(f"   🧩 Partición {p}/{len(cortes) - 1}: {b - a:,} órdenes → {len(locales):,} locales "
+              f"({len(candidatos):,} candidatos)")
+
+    if not candidatos:
+        return formato_mlxtend([], np.arange(n_codigos), n, nombres)
+
+    # 2️⃣ Soporte exacto de los candidatos sobre todas las órdenes
+    candidatos = sorted(candidatos, key=lambda c: (len(c), c))
+    cuentas = contar_candidatos(offsets, productos, candidatos, n_codigos, lineas_por_particion)
+
+    min_cuenta = cuenta_minima(min_support, n)
+    salida = [(c, int(k)) for c, k in zip(candidatos, cuentas) if k >= min_cuenta]
+    return formato_mlxtend(salida, np.arange(n_codigos), n, nombres)
@@ -1,12 +1,20 @@
 # pages/apriori.py
+import glob
 import os
+
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-import networkx as nx
 import dash
 from dash import html, dcc, Input, Output, callback
 
+from mineria.pares import submatriz
+from utils.artefactos import existe_artefacto, leer_artefacto
+from utils.disposicion import disposicion
+from utils.red_reglas import red_reglas
+from utils.reglas_codificadas import COLUMNAS_ITEMS, leer_reglas, leer_reglas_traducidas, nombres_diccionario
+
 dash.register_page(
     __name__,
     path="/apriori",
@@ -15,7 +23,28 @@ dash.register_page(
 )
 
 RUTA = "./data/procesados/"
-df_rules = pd.read_csv(os.path.join(RUTA, "03T. reglas_apriori_traducido.csv"))
+# Productos como códigos + diccionario traducido (o el CSV traducido antiguo si todavía no existen)
+df_rules = leer_reglas_traducidas("03. reglas_apriori", "03T. diccionario_productos_apriori", ruta=RUTA,
+                                  respaldo="03T. reglas_apriori_traducido")
+
+# Códigos de producto de cada regla (mismas filas) y nombres por código: la matriz de calor se lee de la tabla de
+# pares en lugar de pivotear las reglas filtradas (no disponible con el CSV traducido antiguo)
+nombres_productos = None
+if existe_artefacto("03. reglas_apriori", RUTA) and existe_artefacto("03T. diccionario_productos_apriori", RUTA):
+    codigos_reglas = leer_reglas("03. reglas_apriori", columnas=COLUMNAS_ITEMS, ruta=RUTA)
+    df_rules["codigos_antecedentes"] = codigos_reglas["antecedentes"]
+    df_rules["codigos_consecuentes"] = codigos_reglas["consecuentes"]
+    nombres_productos = nombres_diccionario("03T. diccionario_productos_apriori", ruta=RUTA)
+
+# Tablas de pares (← 02.4 coocurrencia_productos.py): todas las órdenes y cada clúster que tenga la suya
+FUENTES_PARES = {"todas": "03d. pares_productos"}
+clusters_pares = sorted(int(archivo[:-len(".parquet")].rsplit("_", 1)[1])
+                        for archivo in glob.glob(os.path.join(RUTA, "07d. pares_productos_cluster_*.parquet")))
+for c in clusters_pares:
+    FUENTES_PARES[str(c)] = f"07d. pares_productos_cluster_{c}"
+
+# Se leen la primera vez que se eligen en la matriz de calor
+_tablas_pares = {}
 
 # Limpieza básica
 for col in ["soporte", "confianza", "elevacion"]:
@@ -196,6 +225,21 @@ layout = html.Div(
                                 ),
                             ],
                         ),
+                        html.Div(
+                            className="filter-field",
+                            children=[
+                                html.Div("Órdenes", className="filter-label"),
+                                dcc.Dropdown(
+                                    id="apr-pares-fuente",
+                                    options=[
+                                        {"label": "Todas las órdenes" if f == "todas" else f"Clúster {f}", "value": f}
+                                        for f in FUENTES_PARES
+                                    ],
+                                    value="todas",
+                                    clearable=False,
+                                ),
+                            ],
+                        ),
                         dcc.Graph(id="apr-fig-heatmap", className="graph-full"),
                     ],
                 ),
@@ -276,37 +320,47 @@ def actualizar_barras(min_lift, min_conf, producto, top_n):
     return style_fig(fig)
 
 
+def tabla_pares(fuente):
+    if fuente not in _tablas_pares:
+        _tablas_pares[fuente] = leer_artefacto(FUENTES_PARES[fuente], ruta=RUTA)
+    return _tablas_pares[fuente]
+
+
+def productos_frecuentes(itemsets, max_prod):
+    # Productos que aparecen en más reglas (empates en orden de código)
+    codigos, veces = np.unique(np.concatenate([np.empty(0, dtype=np.int32), *itemsets]), return_counts=True)
+    return codigos[np.argsort(-veces, kind="stable")[:int(max_prod)]]
+
+
 @callback(
     Output("apr-fig-heatmap", "figure"),
     Input("apr-min-lift", "value"),
     Input("apr-min-conf", "value"),
     Input("apr-producto", "value"),
     Input("apr-max-prod", "value"),
+    Input("apr-pares-fuente", "value"),
 )
-def actualizar_heatmap(min_lift, min_conf, producto, max_prod):
+def actualizar_heatmap(min_lift, min_conf, producto, max_prod, fuente):
+    fuente = fuente or "todas"
+    if nombres_productos is None or not existe_artefacto(FUENTES_PARES[fuente], RUTA):
+        fig = go.Figure()
+        fig.update_layout(title="Falta la tabla de pares (01. A priori/02.4 coocurrencia_productos.py).")
+        return style_fig(fig)
+
     df = filtrar_reglas(min_lift, min_conf, producto)
-    # Tomamos los productos más frecuentes
-    top_ants = (
-        df["antecedentes"].value_counts().head(int(max_prod)).index.tolist()
-    )
-    top_cons = (
-        df["consecuentes"].value_counts().head(int(max_prod)).index.tolist()
-    )
-    df_f = df[df["antecedentes"].isin(top_ants) & df["consecuentes"].isin(top_cons)]
-    if df_f.empty:
+    if df.empty:
         fig = go.Figure()
         fig.update_layout(title="No hay reglas con los filtros seleccionados.")
         return style_fig(fig)
 
-    tabla = (
-        df_f.pivot_table(
-            index="antecedentes",
-            columns="consecuentes",
-            values="elevacion",
-            aggfunc="max",
-        )
-        .reindex(index=top_ants, columns=top_cons)
-        .fillna(0)
+    # Tomamos los productos más frecuentes de cada lado; la elevación de cada par sale de la tabla de pares de
+    # las órdenes elegidas (todas o las de un clúster), 0 si el par no llega a la cuenta mínima
+    tabla = submatriz(
+        tabla_pares(fuente),
+        productos_frecuentes(df["codigos_antecedentes"], max_prod),
+        metrica="elevacion",
+        nombres=nombres_productos,
+        columnas=productos_frecuentes(df["codigos_consecuentes"], max_prod),
     )
 
     fig = go.Figure(
@@ -318,8 +372,9 @@ def actualizar_heatmap(min_lift, min_conf, producto, max_prod):
             colorbar_title="Lift",
         )
     )
+    origen = "todas las órdenes" if fuente == "todas" else f"clúster {fuente}"
     fig.update_layout(
-        title="Matriz de calor de elevación (antecedente vs consecuente)",
+        title=f"Matriz de calor de elevación (antecedente vs consecuente) – {origen}",
         xaxis_title="Producto consecuente",
         yaxis_title="Producto antecedente",
     )
@@ -327,32 +382,22 @@ def actualizar_heatmap(min_lift, min_conf, producto, max_prod):
 
 
 def construir_red(df, max_nodos=None):
-    G = nx.DiGraph()
-    for _, row in df.iterrows():
-        a = row["antecedentes"]
-        c = row["consecuentes"]
-        lift = row["elevacion"]
-        G.add_node(a)
-        G.add_node(c)
-        G.add_edge(a, c, weight=lift)
-
-    if max_nodos and len(G.nodes) > max_nodos:
+    # Aristas y nodos como arreglos (utils/red_reglas.py), sin recorrer filas
+    red = red_reglas(df)
+
+    if max_nodos:
         # seleccionamos nodos por degree
-        grados = sorted(G.degree, key=lambda x: x[1], reverse=True)[:max_nodos]
-        nodos_kept = set(n for n, _ in grados)
-        G = G.subgraph(nodos_kept).copy()
+        red = red.subred(max_nodos)
 
-    if not G.nodes:
+    if not len(red):
         return go.Figure()
 
-    pos = nx.spring_layout(G, seed=42, k=0.6)
+    G = red.grafo()
 
-    edge_x, edge_y = [], []
-    for u, v in G.edges():
-        x0, y0 = pos[u]
-        x1, y1 = pos[v]
-        edge_x += [x0, x1, None]
-        edge_y += [y0, y1, None]
+    # Posiciones en caché: mover un slider reutiliza o ajusta la disposición anterior
+    pos = disposicion(G, "spring", seed=42, k=0.6)
+
+    edge_x, edge_y, node_x, node_y = red.coordenadas(pos)
 
     edge_trace = go.Scatter(
         x=edge_x,
@@ -362,18 +407,11 @@ def construir_red(df, max_nodos=None):
         hoverinfo="none",
     )
 
-    node_x, node_y, text = [], [], []
-    for node in G.nodes():
-        x, y = pos[node]
-        node_x.append(x)
-        node_y.append(y)
-        text.append(node)
-
     node_trace = go.Scatter(
         x=node_x,
         y=node_y,
         mode="markers+text",
-        text=text,
+        text=red.nodos,
         textposition="top center",
         marker=dict(
             size=12,
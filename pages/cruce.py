@@ -1,13 +1,15 @@
 # pages/cruce.py
-import os
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-import networkx as nx
 
 import dash
 from dash import html, dcc, Input, Output, callback
 
+from utils.disposicion import disposicion
+from utils.red_reglas import red_reglas
+from utils.reglas_codificadas import leer_reglas_traducidas
+
 dash.register_page(
     __name__,
     path="/cruce",
@@ -16,7 +18,9 @@ dash.register_page(
 )
 
 RUTA = "./data/procesados/"
-df_cruce = pd.read_csv(os.path.join(RUTA, "08T. resumen_reglas_apriori_clusters_traducido.csv"))
+# Productos como códigos + diccionario traducido (o el CSV traducido antiguo si todavía no existen)
+df_cruce = leer_reglas_traducidas("08. resumen_reglas_apriori_clusters", "08T. diccionario_productos_clusters",
+                                  ruta=RUTA, respaldo="08T. resumen_reglas_apriori_clusters_traducido")
 
 # Aseguramos nombres / tipos
 cluster_col = "cluster" if "cluster" in df_cruce.columns else "Cluster"
@@ -195,34 +199,22 @@ def fig_top(cluster_sel, min_lift, min_conf, top_n):
 
 
 def construir_red_cluster(df_cluster):
-    G = nx.DiGraph()
-    for _, row in df_cluster.iterrows():
-        a = row["antecedentes"]
-        c = row["consecuentes"]
-        lift = row["elevacion"]
-        G.add_node(a)
-        G.add_node(c)
-        G.add_edge(a, c, weight=lift)
-
-    if not G.nodes:
+    # Aristas y nodos como arreglos (utils/red_reglas.py), sin recorrer filas
+    red = red_reglas(df_cluster)
+
+    if not len(red):
         fig = go.Figure()
         fig.update_layout(title="Sin nodos para mostrar.")
         return style_fig(fig)
 
     # limitamos nodos para que no explote
-    if len(G.nodes) > 40:
-        grados = sorted(G.degree, key=lambda x: x[1], reverse=True)[:40]
-        nodos_kept = set(n for n, _ in grados)
-        G = G.subgraph(nodos_kept).copy()
+    red = red.subred(40)
+    G = red.grafo()
 
-    pos = nx.spring_layout(G, seed=42, k=0.6)
+    # Posiciones en caché: mover un slider reutiliza o ajusta la disposición anterior
+    pos = disposicion(G, "spring", seed=42, k=0.6)
 
-    edge_x, edge_y = [], []
-    for u, v in G.edges():
-        x0, y0 = pos[u]
-        x1, y1 = pos[v]
-        edge_x += [x0, x1, None]
-        edge_y += [y0, y1, None]
+    edge_x, edge_y, node_x, node_y = red.coordenadas(pos)
 
     edge_trace = go.Scatter(
         x=edge_x,
@@ -232,18 +224,11 @@ def construir_red_cluster(df_cluster):
         hoverinfo="none",
     )
 
-    node_x, node_y, text = [], [], []
-    for node in G.nodes():
-        x, y = pos[node]
-        node_x.append(x)
-        node_y.append(y)
-        text.append(node)
-
     node_trace = go.Scatter(
         x=node_x,
         y=node_y,
         mode="markers+text",
-        text=text,
+        text=red.nodos,
         textposition="top center",
         marker=dict(
             size=12,
@@ -1,18 +1,22 @@
 # pages/home.py
-import os
 import pandas as pd
 import plotly.express as px
 from dash import html, dcc
 import dash
 
+from utils.artefactos import leer_artefacto
+from utils.reglas_codificadas import leer_reglas_traducidas
+
 dash.register_page(__name__, path="/", name="Inicio")
 
 RUTA = "./data/procesados/"
 
 # Figuras pequeñas de preview
-df_apriori = pd.read_csv(os.path.join(RUTA, "03T. reglas_apriori_traducido.csv"))
-df_clusters = pd.read_csv(os.path.join(RUTA, "04. clientes_clusterizados.csv"))
-df_cruce = pd.read_csv(os.path.join(RUTA, "08T. resumen_reglas_apriori_clusters_traducido.csv"))
+df_apriori = leer_reglas_traducidas("03. reglas_apriori", "03T. diccionario_productos_apriori", ruta=RUTA,
+                                    respaldo="03T. reglas_apriori_traducido")
+df_clusters = leer_artefacto("04. clientes_clusterizados", ruta=RUTA)
+df_cruce = leer_reglas_traducidas("08. resumen_reglas_apriori_clusters", "08T. diccionario_productos_clusters",
+                                  ruta=RUTA, respaldo="08T. resumen_reglas_apriori_clusters_traducido")
 
 for col in ["soporte", "confianza", "elevacion"]:
     if col in df_apriori.columns:
@@ -1,6 +1,4 @@
 # pages/kmeans_page.py
-import os
-import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
@@ -9,6 +7,9 @@ from sklearn.decomposition import PCA
 import dash
 from dash import html, dcc, Input, Output, callback
 
+from utils.artefactos import leer_artefacto
+from utils.caracteristicas import RUTA_CARACTERISTICAS, CaracteristicasClientes, existe_caracteristicas
+
 dash.register_page(
     __name__,
     path="/kmeans",
@@ -17,7 +18,7 @@ dash.register_page(
 )
 
 RUTA = "./data/procesados/"
-df = pd.read_csv(os.path.join(RUTA, "04. clientes_clusterizados.csv"))
+df = leer_artefacto("04. clientes_clusterizados", ruta=RUTA)
 
 # Aseguramos tipo entero de cluster
 df["cluster"] = df["cluster"].astype(int)
@@ -36,10 +37,12 @@ cols_base = [
 # Columnas de departamentos (las que no son base)
 dept_cols = [c for c in df.columns if c not in cols_base]
 
-# PCA 2D sobre departamentos
-X = df[dept_cols].values
-pca = PCA(n_components=2, random_state=42)
-X_pca = pca.fit_transform(X)
+# PCA 2D: proyección ya calculada en las características por cliente (00. caracteristicas_clientes.py);
+# si todavía no existen, se ajusta aquí sobre los departamentos
+if existe_caracteristicas(RUTA_CARACTERISTICAS):
+    X_pca = CaracteristicasClientes(RUTA_CARACTERISTICAS).componentes(df["user_id"])
+else:
+    X_pca = PCA(n_components=2, random_state=42).fit_transform(df[dept_cols].values)
 df["pca1"] = X_pca[:, 0]
 df["pca2"] = X_pca[:, 1]
 
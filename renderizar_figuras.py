@@ -0,0 +1,43 @@
+###################################################################################################################
+############################################ Render por lotes de las figuras ######################################
+###################################################################################################################
+
+# Vuelve a generar todas las figuras estáticas de output/ (las etapas de ejecutar_pipeline.py cuyas salidas son
+# solo figuras) en un pool de procesos con el backend Agg, sin abrir ventanas (utils/figuras.py). Cada proceso lee
+# una sola vez las entradas que comparten los scripts. A diferencia de ejecutar_pipeline.py no revisa si las
+# entradas cambiaron: vuelve a dibujar todo lo pedido.
+#
+# Uso (desde la raíz del repositorio):
+#   python renderizar_figuras.py                       → todas las figuras
+#   python renderizar_figuras.py "01. A priori/04*"    → solo esos scripts
+#   python renderizar_figuras.py --listar              → muestra los scripts de figuras
+
+import argparse
+import fnmatch
+import sys
+
+from ejecutar_pipeline import ETAPAS
+from utils.figuras import renderizar
+
+# Etapas cuyas salidas están todas en output/ (gráficos; las demás también escriben datos), salvo las marcadas
+# redibujable=False (ej. 01. validación.py, que recorre k con KMeans)
+SCRIPTS_FIGURAS = [e.script for e in ETAPAS
+                   if e.redibujable and all(s.startswith("output/") for s in e.salidas)]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Genera las figuras estáticas en paralelo, sin ventanas.")
+    parser.add_argument("scripts", nargs="*", help='scripts (patrones), por ejemplo "02. K-means/0[4-8]*"')
+    parser.add_argument("--trabajadores", type=int, default=None, help="procesos en paralelo")
+    parser.add_argument("--listar", action="store_true", help="mostrar los scripts de figuras")
+    args = parser.parse_args()
+
+    seleccion = [s for s in SCRIPTS_FIGURAS
+                 if not args.scripts or any(fnmatch.fnmatch(s.replace("scripts/", "", 1), p) for p in args.scripts)]
+    if args.listar:
+        print("\n".join(seleccion))
+        sys.exit(0)
+    if not seleccion:
+        sys.exit(f"Ningún script de figuras coincide con {args.scripts}")
+
+    sys.exit(0 if renderizar(seleccion, args.trabajadores) else 1)
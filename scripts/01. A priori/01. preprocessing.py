@@ -19,13 +19,40 @@
 ################################# 1. Importar librerías y definir ruta #################################
 
 
+import os
+import sys
 import pandas as pd
 
+# Raíz del repositorio en el path para importar los módulos compartidos (utils/)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from utils.ingesta import leer_tabla
+from utils.artefactos import guardar_artefacto
+from utils.transacciones import construir_almacen
+from utils.streaming import preprocesar_en_streaming
+
 # Rutas a los archivos
 # path = camino o ruta
 
 path = "././data/datos/"
 
+# Presupuesto de memoria (MB) por bloque de lectura: los CSV grandes se leen por partes
+# con tipos explícitos (int32 para ids, int8 para día/hora, float32, categorías).
+PRESUPUESTO_MB = 256
+
+# Los datasets intermedios se guardan en Parquet; el CSV queda como salida opcional
+EXPORTAR_CSV = False
+
+# 🌊 Modo streaming: order_products__prior se procesa por bloques, uniendo cada bloque con arreglos de
+# búsqueda por product_id / order_id, y las salidas se escriben de forma incremental. La tabla ancha
+# full_data (15 columnas, ~2.9 GB) nunca se construye, por lo que corre en un equipo de 8 GB.
+# Con False se ejecuta el flujo completo de abajo (exploración, nulos y duplicados sobre full_data).
+MODO_STREAMING = True
+
+if MODO_STREAMING:
+    preprocesar_en_streaming(path, "././data/procesados/", PRESUPUESTO_MB, EXPORTAR_CSV)
+    sys.exit(0)
+
 
 ################################# # 2. Cargar archivos y mostrar información #################################
 
@@ -37,12 +64,14 @@ path = "././data/datos/"
 # products.csv: --> Catálogo completo de productos (product_id, product_name, etc.)
 
 
-orders = pd.read_csv(path + "orders.csv")
-order_products_prior = pd.read_csv(path + "order_products__prior.csv")
-order_products_train = pd.read_csv(path + "order_products__train.csv")
-products = pd.read_csv(path + "products.csv")
-departments = pd.read_csv(path + "departments.csv")
-aisles = pd.read_csv(path + "aisles.csv")
+# 📏 Cada lectura imprime la memoria estimada con tipos por defecto vs. la memoria con el esquema tipado
+
+orders = leer_tabla("orders", path, PRESUPUESTO_MB)
+order_products_prior = leer_tabla("order_products__prior", path, PRESUPUESTO_MB)
+order_products_train = leer_tabla("order_products__train", path, PRESUPUESTO_MB)
+products = leer_tabla("products", path, PRESUPUESTO_MB)
+departments = leer_tabla("departments", path, PRESUPUESTO_MB)
+aisles = leer_tabla("aisles", path, PRESUPUESTO_MB)
 
 # Mostrar primeras filas
 print("📦 Orders:")
@@ -138,7 +167,6 @@ print("\n🧹 Dimensión final tras limpieza:", full_data.shape)
 output_path = "././data/procesados/"
 
 # Crear carpeta si no existe
-import os
 os.makedirs(output_path, exist_ok=True)
 
 
@@ -150,8 +178,8 @@ os.makedirs(output_path, exist_ok=True)
 # Columnas clave: order_id, product_name
 
 apriori_df = full_data[["order_id", "product_name"]]
-apriori_df.to_csv(output_path + "01. transacciones_apriori.csv", index=False)
-print("\n📤 Exportado: 01. transacciones_apriori.csv")
+guardar_artefacto(apriori_df, "01. transacciones_apriori", output_path, exportar_csv=EXPORTAR_CSV)
+print("\n📤 Exportado: 01. transacciones_apriori.parquet")
 
 ###################################################################################################################
 
@@ -168,8 +196,24 @@ clustering_df = full_data[[
 
 ######### Groupby por usuario #########
 
-clustering_df.to_csv(output_path + "02. clientes_clustering.csv", index=False)
-print("📤 Exportado: 02. clientes_clustering.csv")
+guardar_artefacto(clustering_df, "02. clientes_clustering", output_path, exportar_csv=EXPORTAR_CSV)
+print("📤 Exportado: 02. clientes_clustering.parquet")
+
+###################################################################################################################
+
+######### 3️⃣ Almacén binario de transacciones (CSR en memoria mapeada) #########
+
+# offsets por orden + códigos de producto int32, con user_id, cluster, día y hora como arreglos laterales.
+# Apriori, las reglas por clúster y el cruce leen las cestas desde aquí sin reagrupar filas.
+
+almacen = construir_almacen(
+    full_data["order_id"].to_numpy(),
+    full_data["product_id"].to_numpy(),
+    orders,
+    products,
+    output_path + "01b. almacen_transacciones/",
+)
+print(f"📤 Exportado: 01b. almacen_transacciones/ ({almacen.n_ordenes:,} órdenes, {almacen.meta['n_lineas']:,} líneas)")
 
 
 ###################################################################################################################
@@ -0,0 +1,99 @@
+###################################################################################################################
+###################################################################################################################
+################################ 01.1 TRADUCCIÓN DEL CATÁLOGO DE PRODUCTOS 🌐 ######################################
+###################################################################################################################
+###################################################################################################################
+
+
+# Traduce una sola vez todo el catálogo (productos, pasillos y departamentos) en lugar de traducir los productos de
+# cada archivo de reglas después de minar. Los traductores de reglas (03. traductor_reglas_apriori.py y
+# 04. traducir_resumen_reglas_clusters.py) pasan a ser una búsqueda por código de producto en esta tabla.
+#
+# Reanudable: cada lote traducido queda en la caché de utils/traduccion.py. Si la corrida se corta, o si se limita
+# con PRODUCTOS_POR_CORRIDA, la siguiente sigue con los que faltan. Los productos se traducen de más a menos
+# vendidos, así que un catálogo parcial ya cubre los que aparecen en las reglas.
+#
+# 📥 data/datos/products.csv, aisles.csv, departments.csv
+#    data/procesados/01b. almacen_transacciones/ (frecuencia de cada producto)
+# 📤 data/procesados/01c. catalogo_traducido.parquet
+#    (product_id, product_name, product_name_es, aisle_id, aisle, aisle_es, department_id, department, department_es;
+#     *_es vacío donde todavía no hay traducción)
+
+
+################################# 1. Importar librerías #################################
+
+
+import os
+import sys
+
+import numpy as np
+
+# Raíz del repositorio en el path para importar los módulos compartidos (utils/)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from utils.artefactos import guardar_artefacto
+from utils.ingesta import leer_tabla
+from utils.traduccion import CATALOGO_TRADUCIDO, Traductor
+from utils.transacciones import AlmacenTransacciones
+
+# 🔁 Productos a enviar al servicio en esta corrida (None = todos los que falten)
+PRODUCTOS_POR_CORRIDA = None
+
+# Productos por tanda: al terminar cada una se informa el avance (la caché ya la guardó)
+TANDA = 1000
+
+EXPORTAR_CSV = False
+
+
+################################# 2. Cargar catálogo #################################
+
+
+products = leer_tabla("products", reporte=False)
+aisles = leer_tabla("aisles", reporte=False)
+departments = leer_tabla("departments", reporte=False)
+
+catalogo = (products.merge(aisles, on="aisle_id", how="left")
+            .merge(departments, on="department_id", how="left"))
+for col in ["product_name", "aisle", "department"]:
+    catalogo[col] = catalogo[col].astype(str)
+
+# 📊 De más a menos vendidos
+almacen = AlmacenTransacciones()
+ventas = np.bincount(almacen.productos, minlength=almacen.n_codigos)
+catalogo["ventas"] = ventas[catalogo["product_id"].to_numpy()]
+catalogo = catalogo.sort_values("ventas", ascending=False, kind="stable").reset_index(drop=True)
+
+
+################################# 3. Traducir lo que falta #################################
+
+
+traductor = Traductor()
+
+# Pasillos y departamentos: pocos textos, siempre completos
+catalogo["aisle_es"] = traductor.traducir(catalogo["aisle"])
+catalogo["department_es"] = traductor.traducir(catalogo["department"])
+
+ya_traducidos = traductor.buscar(catalogo["product_name"])
+pendientes = catalogo["product_name"][[t is None for t in ya_traducidos]].tolist()
+if PRODUCTOS_POR_CORRIDA is not None:
+    pendientes = pendientes[:PRODUCTOS_POR_CORRIDA]
+print(f"🌐 {len(catalogo) - sum(t is None for t in ya_traducidos):,} de {len(catalogo):,} productos ya traducidos; "
+      f"{len(pendientes):,} pendientes en esta corrida")
+
+for inicio in range(0, len(pendientes), TANDA):
+    traductor.traducir(pendientes[inicio:inicio + TANDA])
+    print(f"   ↳ {min(inicio + TANDA, len(pendientes)):,} / {len(pendientes):,}")
+
+
+################################# 4. Exportar catálogo traducido #################################
+
+
+# Solo lo que está en la caché: los productos sin traducción quedan vacíos (los lectores usan el nombre original)
+catalogo["product_name_es"] = traductor.buscar(catalogo["product_name"])
+catalogo = catalogo.sort_values("product_id").reset_index(drop=True)
+columnas = ["product_id", "product_name", "product_name_es", "aisle_id", "aisle", "aisle_es",
+            "department_id", "department", "department_es"]
+
+destino = guardar_artefacto(catalogo[columnas], CATALOGO_TRADUCIDO, exportar_csv=EXPORTAR_CSV)
+print(f"✅ Catálogo traducido ({catalogo['product_name_es'].notna().sum():,} de {len(catalogo):,} productos) → "
+      f"{destino}")
@@ -7,18 +7,19 @@
 ###################################################################################################################
 
 
-# Se trabaja con el dataset procesado "01. transacciones_apriori.csv" que se creó en el script de preprocesamiento.py
-# El resultado será un archivo "03. reglas_apriori.csv" con las reglas generadas. En data/procesados/03. reglas_apriori.csv
+# Se trabaja con el almacén binario "01b. almacen_transacciones/" que se creó en el script de preprocesamiento.py
+# El resultado será el artefacto "03. reglas_apriori.parquet" con las reglas generadas (productos como códigos,
+# ver utils/reglas_codificadas.py). En data/procesados/03. reglas_apriori.parquet
 
 
 
 # 1. Importar librerías y definir ruta
 # 2. Cargar dataset procesado
-# 3. Filtrar productos más frecuentes (top 100)
-# 4. Limitar número de órdenes (20.000)
-# 5. Agrupar productos por orden
-# 6. Codificar transacciones
-# 7. Generar conjuntos frecuentes con Apriori
+# 3. Filtrar productos más frecuentes (top 100)         ┐ solo con MOTOR = "mlxtend" (con "fpgrowth" se minan
+# 4. Limitar número de órdenes (20.000)                 ┘ todas las órdenes y todo el catálogo)
+# 5. Agrupar productos por orden (cestas del almacén)
+# 6. Codificar transacciones (one-hot disperso)
+# 7. Generar conjuntos frecuentes (FP-Growth o Apriori)
 # 8. Generar reglas de asociación
 # 9. Mostrar reglas principales
 # 10. Guardar resultados
@@ -41,6 +42,7 @@
 # 2. Limitar el análisis a 20.000 órdenes de compra
 
 # Esto permite que el algoritmo apriori funcione correctamente en equipos con recursos limitados.
+# (Actualización: con MOTOR = "fpgrowth" ya no es necesario; ver mineria/fpgrowth.py y la sección 1.)
 # Aunque se pierde algo de información, se capturan las asociaciones más relevantes y frecuentes.
 # Esta es una práctica común en análisis de reglas de asociación cuando se trabaja con grandes volúmenes de datos.
 # Además, las reglas generadas siguen siendo útiles para entender patrones de compra.
@@ -53,84 +55,179 @@
 ################################# 1. Importar librerías y definir ruta #################################
 
 
-import pandas as pd
-from mlxtend.frequent_patterns import apriori, association_rules
-from mlxtend.preprocessing import TransactionEncoder
+from mlxtend.frequent_patterns import association_rules
 import os
+import sys
 
-################################# 2. Cargar dataset procesado #################################
+# Raíz del repositorio en el path para importar los módulos compartidos (utils/, mineria/)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
 
+from utils.reglas_codificadas import guardar_reglas, leer_reglas
+from utils.transacciones import AlmacenTransacciones
+from mineria.codificacion import codificar_disperso
+from mineria.cerrados import filtrar_conjuntos, reglas_no_redundantes
+from mineria.incremental import guardar_estado
+from mineria.motores import conjuntos_frecuentes
+from mineria.muestreo import muestreo_progresivo
+from mineria.reglas import reglas_top_k
+from mineria.significancia import agregar_significancia
+from mineria.son import son
 
-df_apriori = pd.read_csv("././data/procesados/01. transacciones_apriori.csv")
+# ⚙️ Motor de minería
+# - "fpgrowth": FP-Growth nativo sobre las cestas codificadas del almacén → todas las órdenes y todo el catálogo
+# - "declat":   dEclat vertical (bitsets + diffsets) sobre las mismas cestas; conviene en problemas medianos
+# - "mlxtend":  flujo original (top 100 productos, 20.000 órdenes, apriori de mlxtend)
+MOTOR = "fpgrowth"
 
+# Soporte mínimo de cada motor (sobre todo el catálogo los pares frecuentes están cerca del 0.05%)
+MIN_SUPPORT = {"fpgrowth": 0.0005, "declat": 0.0005, "mlxtend": 0.005}
 
-################################# 3. Filtrar productos más frecuentes (top 100) #################################
+# 🧩 Minería particionada en dos pasadas (SON, mineria/son.py) con "fpgrowth" / "declat": lee el almacén mapeado
+# por particiones de órdenes y solo tiene una en memoria a la vez. Mismo resultado que la minería en memoria;
+# pensado para equipos donde todas las cestas no caben cómodas en RAM.
+PARTICIONADO = False
 
+# 🎲 Muestreo progresivo (mineria/muestreo.py): en lugar de minar todas las órdenes (o las primeras 20.000 con
+# "mlxtend"), toma una muestra aleatoria que crece hasta que el error de los soportes es ≤ EPSILON con CONFIANZA.
+# EPSILON se elige por debajo del soporte mínimo de cada motor.
+MUESTREO_PROGRESIVO = False
+EPSILON = {"fpgrowth": 0.0002, "declat": 0.0002, "mlxtend": 0.002}
+CONFIANZA = 0.95
 
-productos_frecuentes = df_apriori["product_name"].value_counts().head(100).index.tolist()
-df_filtrado = df_apriori[df_apriori["product_name"].isin(productos_frecuentes)]
+# 🏆 Top-k (mineria/reglas.py): en lugar de todas las reglas con lift ≥ 1, solo las TOP_K mejores por METRICA_TOP_K
+# ("lift" o "confidence"), sin generar la tabla completa. None = todas las reglas (las usa el dashboard).
+TOP_K = None
+METRICA_TOP_K = "lift"
 
+# ✂️ Reglas no redundantes (mineria/cerrados.py): en lugar de todas las reglas con lift ≥ 1, solo la base min-max
+# (antecedente mínimo → consecuente máximo, desde los conjuntos cerrados). Cualquier otra regla se deduce de ellas.
+REGLAS_NO_REDUNDANTES = False
 
-################################# 4. Limitar número de órdenes (20.000) #################################
+# 📐 Significancia (mineria/significancia.py): cada regla lleva p_value (prueba exacta de Fisher o χ²) y q_value
+# (Benjamini–Hochberg). Con ALFA_SIGNIFICANCIA se descartan las reglas con q_value > alfa; None = se guardan todas.
+PRUEBA_SIGNIFICANCIA = "fisher"
+ALFA_SIGNIFICANCIA = None
 
+# 🧵 Procesos para minar con "fpgrowth" / "declat" (1 = secuencial, -1 = todos los núcleos; ver mineria/paralelo.py)
+N_JOBS = -1
 
-ordenes_muestras = df_filtrado["order_id"].unique()[:20000]
-df_filtrado = df_filtrado[df_filtrado["order_id"].isin(ordenes_muestras)]
 
+# Los procesos de minería se crean con spawn en Windows y reimportan este script: todo lo que sigue va bajo el
+# guard para que solo lo ejecute el proceso principal
 
-################################# 5. agrupar productos por orden #################################
+if __name__ == "__main__":
 
+    ################################# 2. Cargar dataset procesado #################################
 
-transacciones = df_filtrado.groupby("order_id")["product_name"].apply(list).tolist()
 
+    # Almacén CSR en memoria mapeada: las cestas ya están agrupadas por orden (códigos de producto int32)
+    almacen = AlmacenTransacciones()
+    nombres = almacen.nombres_productos()
 
-################################# 6. Codificar transacciones #################################
 
+    ################################# 3-5. Órdenes y productos a minar #################################
 
-te = TransactionEncoder()
-te_ary = te.fit(transacciones).transform(transacciones)
-df_encoded = pd.DataFrame(te_ary, columns=te.columns_)
 
+    if MOTOR == "mlxtend" and MUESTREO_PROGRESIVO:
+        # Top 100 productos en todas las órdenes: la muestra aleatoria reemplaza al corte de 20.000 órdenes
+        offsets, productos = almacen.muestra_top(n_productos=100, n_ordenes=None)
+    elif MOTOR == "mlxtend":
+        # Primeras 20.000 órdenes (por order_id) que contienen al menos un producto del top 100,
+        # conservando solo los productos del top 100
+        offsets, productos = almacen.muestra_top(n_productos=100, n_ordenes=20000)
+    else:
+        # Sin top 100 ni límite de órdenes: todas las cestas del almacén
+        offsets, productos = almacen.offsets, almacen.productos
 
-################################# 7. Generar conjuntos frecuentes con Apriori #################################
 
+    ################################# 6. Codificar transacciones #################################
 
-# Se probó inicialmente con min_support=0.02, pero resultó ser muy alto.
-# Se redujo a min_support=0.005 para captar combinaciones que aparecen al menos en el 0.5% de las órdenes.
 
+    # One-hot disperso (CSR): las cestas del almacén ya son indptr/indices, no se arma la matriz densa
+    # (el muestreo progresivo y el modo PARTICIONADO codifican sus propias muestras / particiones)
+    particionado = PARTICIONADO and MOTOR != "mlxtend"
+    if not MUESTREO_PROGRESIVO and not particionado:
+        matriz = codificar_disperso(offsets, productos, almacen.n_codigos)
 
-frecuentes = apriori(df_encoded, min_support=0.005, use_colnames=True)
 
+    ################################# 7. Generar conjuntos frecuentes #################################
 
-################################# 8. Generar reglas de asociación #################################
 
+    # Con mlxtend se probó inicialmente con min_support=0.02, pero resultó ser muy alto.
+    # Se redujo a min_support=0.005 para captar combinaciones que aparecen al menos en el 0.5% de las órdenes.
 
-# Las reglas generadas deben tener un lift ≥ 1.0, es decir, que aporten valor real a la asociación.
 
+    if MUESTREO_PROGRESIVO:
+        frecuentes, informe = muestreo_progresivo(offsets, productos, MIN_SUPPORT[MOTOR], EPSILON[MOTOR], CONFIANZA,
+                                                  motor=MOTOR, n_jobs=N_JOBS)
+        print(f"🎯 Muestra de {informe['ordenes_muestra']:,} de {informe['ordenes_total']:,} órdenes "
+              f"({informe['fraccion']:.1%}): |error de soporte| ≤ {informe['cota_epsilon']:.5f} "
+              f"con confianza {CONFIANZA:.0%} (cota de {informe['cota']}, "
+              f"{'garantizada' if informe['garantizada'] else 'heurística: m y varianza estimados en la muestra'})")
+    elif particionado:
+        # Dos pasadas sobre el almacén mapeado, sin la matriz de todas las cestas en memoria
+        frecuentes = son(offsets, productos, MIN_SUPPORT[MOTOR], motor=MOTOR, n_codigos=almacen.n_codigos)
+    else:
+        frecuentes = conjuntos_frecuentes(matriz, MIN_SUPPORT[MOTOR], motor=MOTOR, n_jobs=N_JOBS)
+    print(f"🌳 {MOTOR}: {len(offsets) - 1:,} órdenes → {len(frecuentes):,} conjuntos frecuentes")
 
-reglas = association_rules(frecuentes, metric="lift", min_threshold=1.0)
+    # 💾 Conjuntos con códigos de producto y sus cuentas, para la actualización incremental
+    # (02.2 actualizacion_incremental.py). Solo si se minaron todas las órdenes y todo el catálogo.
+    if MOTOR != "mlxtend" and not MUESTREO_PROGRESIVO:
+        guardar_estado(frecuentes, "03a. itemsets_apriori", len(offsets) - 1, MIN_SUPPORT[MOTOR])
 
 
-################################# 9. Mostrar reglas principales #################################
+    ################################# 8. Generar reglas de asociación #################################
 
 
-print("\n📋 Reglas generadas:")
-print(reglas[["antecedents", "consequents", "support", "confidence", "lift"]].head())
+    # Las reglas generadas deben tener un lift ≥ 1.0, es decir, que aporten valor real a la asociación.
+    # Con TOP_K el umbral lo fija la búsqueda: sube hasta la k-ésima mejor regla encontrada.
+    # Con REGLAS_NO_REDUNDANTES se aplica el mismo umbral de lift a la base min-max.
 
 
-################################# 10. Guardar resultados #################################
+    if TOP_K:
+        reglas = reglas_top_k(frecuentes, TOP_K, METRICA_TOP_K)
+        print(f"🏆 Top {TOP_K} reglas por {METRICA_TOP_K}")
+    elif REGLAS_NO_REDUNDANTES:
+        cerrados = filtrar_conjuntos(frecuentes, "cerrados")
+        reglas = reglas_no_redundantes(cerrados, min_lift=1.0)
+        print(f"✂️ {len(cerrados):,} conjuntos cerrados ({len(filtrar_conjuntos(frecuentes, 'maximales')):,} "
+              f"maximales) → {len(reglas):,} reglas no redundantes")
+    else:
+        reglas = association_rules(frecuentes, metric="lift", min_threshold=1.0)
 
+    # Órdenes sobre las que se calcularon los soportes (la muestra, con muestreo progresivo)
+    n_minadas = informe["ordenes_muestra"] if MUESTREO_PROGRESIVO else len(offsets) - 1
+    reglas = agregar_significancia(reglas, n_minadas, PRUEBA_SIGNIFICANCIA, ALFA_SIGNIFICANCIA)
+    if ALFA_SIGNIFICANCIA is not None:
+        print(f"📐 {len(reglas):,} reglas con q_value ≤ {ALFA_SIGNIFICANCIA}")
 
-os.makedirs("./output", exist_ok=True)
-reglas.to_csv("././data/procesados/03. reglas_apriori.csv", index=False)
-print("\n✅ Reglas de asociación exportadas a: output/03. reglas_apriori.csv")
+
+    ################################# 9. Mostrar reglas principales #################################
+
+
+    # Las reglas se guardan con códigos de producto; los nombres se ponen al leerlas
+    destino = guardar_reglas(reglas, "03. reglas_apriori")
+
+    print("\n📋 Reglas generadas:")
+    print(leer_reglas("03. reglas_apriori", nombres)[["antecedentes", "consecuentes", "soporte", "confianza",
+                                                      "elevacion"]].head())
+
+
+    ################################# 10. Guardar resultados #################################
+
+
+    print(f"\n✅ Reglas de asociación exportadas a: {destino}")
 
 
 
 ################################# 11. Resultados #################################
 
-# Se han generado reglas de asociación basadas en los 100 productos más frecuentes y 20.000 órdenes, 
-# lo que permite identificar patrones de compra relevantes con un uso eficiente de memoria.
+# Con el motor por defecto ("fpgrowth") las reglas de asociación salen de todas las órdenes y todo el catálogo,
+# minados sobre el almacén de cestas codificadas en memoria mapeada (soporte mínimo MIN_SUPPORT["fpgrowth"]).
+# Con MOTOR = "mlxtend" se vuelve al flujo original: los 100 productos más frecuentes y las primeras 20.000 órdenes.
+# MUESTREO_PROGRESIVO, PARTICIONADO, TOP_K y REGLAS_NO_REDUNDANTES cambian qué órdenes se minan o qué reglas
+# se guardan.
 
 # Cada regla muestra una relación del tipo: "Si se compra A, entonces también se tiende a comprar B"
 
@@ -144,7 +241,7 @@ print("\n✅ Reglas de asociación exportadas a: output/03. reglas_apriori.csv")
 # 2- Optimización de layout en tiendas online
 # 3- Estrategias de bundles o promociones
 
-# El archivo `reglas_apriori.csv` contiene todas las reglas generadas para un análisis más detallado.
+# El archivo `03. reglas_apriori.parquet` contiene todas las reglas generadas para un análisis más detallado.
 
 
 ################### 12. Resultado al correr ###################
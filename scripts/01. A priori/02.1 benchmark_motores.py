@@ -0,0 +1,184 @@
+###################################################################################################################
+###################################################################################################################
+############################### 02.1 BENCHMARK DE MOTORES DE CONJUNTOS FRECUENTES ⏱️ ##############################
+###################################################################################################################
+###################################################################################################################
+
+
+# Compara el flujo original (TransactionEncoder + DataFrame denso + mlxtend.apriori) con los motores de mineria/
+# sobre la misma muestra de 02. analisis_apriori.py (top 100 productos, 20.000 órdenes, min_support=0.005),
+# luego sobre todas las órdenes del clúster más grande (min_support=0.005, como en las reglas por clúster)
+# luego sobre todas las órdenes y todo el catálogo, y por último escalando n_jobs (mineria/paralelo.py) en ese
+# mismo escenario.
+#
+# Para cada corrida se reporta:
+# - tiempo de pared (time.perf_counter, corrida sin instrumentar)
+# - memoria pico (tracemalloc, en una segunda corrida; numpy y pandas reportan sus asignaciones a tracemalloc)
+#   → con n_jobs > 1 solo cuenta el proceso principal, no la memoria de los trabajadores
+# - cantidad de conjuntos frecuentes y si coinciden con los de la referencia mlxtend
+#
+# 📤 output/05. Benchmarks/01. motores_apriori.csv
+
+
+################################# 1. Importar librerías #################################
+
+
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+from mlxtend.frequent_patterns import apriori
+from mlxtend.preprocessing import TransactionEncoder
+
+# Raíz del repositorio en el path para importar los módulos compartidos (utils/, mineria/)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from utils.transacciones import AlmacenTransacciones
+from mineria.codificacion import codificar_disperso
+from mineria.declat import declat
+from mineria.fpgrowth import fpgrowth
+from mineria.motores import conjuntos_frecuentes
+from mineria.paralelo import minar_en_paralelo, procesos
+
+os.makedirs("./output/05. Benchmarks", exist_ok=True)
+
+
+################################# 2. Motores a comparar #################################
+
+
+def motor_mlxtend(offsets, productos, min_support):
+    # Flujo original completo: listas por orden → one-hot denso → apriori
+    transacciones = [productos[offsets[i]:offsets[i + 1]].tolist() for i in range(len(offsets) - 1)]
+    te = TransactionEncoder()
+    df_encoded = pd.DataFrame(te.fit(transacciones).transform(transacciones), columns=te.columns_)
+    return apriori(df_encoded, min_support=min_support, use_colnames=True)
+
+
+def motor_mlxtend_disperso(offsets, productos, min_support):
+    # Mismo apriori de mlxtend, pero sobre la codificación one-hot dispersa (sin TransactionEncoder)
+    return conjuntos_frecuentes(codificar_disperso(offsets, productos), min_support, motor="mlxtend")
+
+
+MOTORES = {
+    "mlxtend_apriori": motor_mlxtend,
+    "mlxtend_disperso": motor_mlxtend_disperso,
+    "fpgrowth": fpgrowth,
+    "declat": declat,
+}
+
+# Motores que pueden correr sobre clústeres y catálogo completos (mlxtend necesitaría una matriz órdenes × productos)
+MOTORES_COMPLETOS = ["fpgrowth", "declat"]
+
+# Procesos a probar en el escalamiento del catálogo completo (-1 = todos los núcleos)
+N_JOBS = [2, 4, -1]
+
+
+def medir(funcion, *args):
+    """
+    Corre la función dos veces: una para el tiempo de pared y otra, instrumentada, para la memoria pico.
+    """
+    inicio = time.perf_counter()
+    resultado = funcion(*args)
+    segundos = time.perf_counter() - inicio
+
+    tracemalloc.start()
+    funcion(*args)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return resultado, segundos, pico / 2**20
+
+
+def como_diccionario(frecuentes):
+    return {frozenset(map(int, s)): round(float(v), 12) for s, v in zip(frecuentes["itemsets"], frecuentes["support"])}
+
+
+def medir_completos(filas, escenario, offsets, productos, min_support, n_jobs=1, referencia=None):
+    """
+    Mide los motores completos y compara cada resultado con la referencia (por defecto, el primer motor).
+    Devuelve la referencia usada.
+    """
+    for nombre in MOTORES_COMPLETOS:
+        if n_jobs == 1:
+            frecuentes, segundos, pico_mb = medir(MOTORES[nombre], offsets, productos, min_support)
+        else:
+            frecuentes, segundos, pico_mb = medir(minar_en_paralelo, offsets, productos, min_support, n_jobs, nombre)
+        conjuntos = como_diccionario(frecuentes)
+        referencia = conjuntos if referencia is None else referencia
+        filas.append({
+            "escenario": escenario, "motor": nombre, "n_jobs": procesos(n_jobs), "min_support": min_support,
+            "ordenes": len(offsets) - 1, "conjuntos": len(conjuntos),
+            "segundos": round(segundos, 3), "memoria_pico_mb": round(pico_mb, 1),
+            "coincide_con_mlxtend": None, "coincide_con_fpgrowth": conjuntos == referencia,
+        })
+        print(f"⏱️ {escenario} | {nombre:<16} n_jobs={procesos(n_jobs):<3} {segundos:8.2f} s {pico_mb:9.1f} MB  "
+              f"{len(conjuntos):,} conjuntos")
+    return referencia
+
+
+# Los trabajadores de n_jobs reimportan este script con spawn (Windows): solo el proceso principal mide
+if __name__ == "__main__":
+
+    ################################# 3. Muestra del flujo original #################################
+
+
+    almacen = AlmacenTransacciones()
+    offsets, productos = almacen.muestra_top(n_productos=100, n_ordenes=20000)
+
+    filas = []
+    referencia = None
+    for nombre, motor in MOTORES.items():
+        frecuentes, segundos, pico_mb = medir(motor, offsets, productos, 0.005)
+        conjuntos = como_diccionario(frecuentes)
+        referencia = conjuntos if referencia is None else referencia
+        filas.append({
+            "escenario": "muestra top 100 × 20.000 órdenes", "motor": nombre, "n_jobs": 1, "min_support": 0.005,
+            "ordenes": len(offsets) - 1, "conjuntos": len(conjuntos),
+            "segundos": round(segundos, 3), "memoria_pico_mb": round(pico_mb, 1),
+            "coincide_con_mlxtend": conjuntos == referencia,
+        })
+        print(f"⏱️ muestra | {nombre:<16} {segundos:8.2f} s {pico_mb:9.1f} MB  {len(conjuntos):,} conjuntos")
+
+
+    ################################# 4. Clúster completo (el más grande) #################################
+
+
+    # Requiere que el cruce (03. Cruce.../01. cruce_apriori_kmeans.py) haya asignado los clústeres
+    clusters, tamanos = np.unique(almacen.cluster[almacen.cluster >= 0], return_counts=True)
+    if len(clusters):
+        mayor = clusters[np.argmax(tamanos)]
+        medir_completos(filas, f"clúster {mayor} completo", *almacen.subconjunto(almacen.ordenes_de_cluster(mayor)), 0.005)
+    else:
+        print("\n⚠️ Sin clústeres asignados en el almacén: se omite el escenario por clúster.")
+
+
+    ################################# 5. Catálogo completo #################################
+
+
+    # Matriz one-hot que necesitaría mlxtend (1 byte por celda booleana)
+    denso_gb = almacen.n_ordenes * almacen.n_codigos / 2**30
+    print(f"\nℹ️ One-hot denso del catálogo completo: {almacen.n_ordenes:,} × {almacen.n_codigos:,} ≈ {denso_gb:,.1f} GB")
+
+    secuencial = medir_completos(filas, "catálogo completo", almacen.offsets, almacen.productos, 0.0005)
+
+
+    ################################# 6. Escalamiento con n_jobs #################################
+
+
+    # Mismo escenario repartido en procesos; el resultado debe coincidir con el de fpgrowth secuencial
+    for n_jobs in N_JOBS:
+        medir_completos(filas, "catálogo completo", almacen.offsets, almacen.productos, 0.0005, n_jobs=n_jobs,
+                        referencia=secuencial)
+
+
+    ################################# 7. Guardar resultados #################################
+
+
+    resultados = pd.DataFrame(filas)
+    print("\n📊 Resumen:")
+    print(resultados.to_string(index=False))
+
+    resultados.to_csv("./output/05. Benchmarks/01. motores_apriori.csv", index=False)
+    print("\n✅ Benchmark exportado a: output/05. Benchmarks/01. motores_apriori.csv")
@@ -0,0 +1,190 @@
+###################################################################################################################
+###################################################################################################################
+########################### 02.2 ACTUALIZACIÓN INCREMENTAL DE REGLAS (FUP) CON ÓRDENES NUEVAS 🔄 ####################
+###################################################################################################################
+###################################################################################################################
+
+
+# Incorpora un lote de órdenes nuevas a las reglas ya generadas, sin volver a minar todo (ver mineria/incremental.py):
+# - los conjuntos frecuentes anteriores se cuentan en el lote y se mantienen o se degradan
+# - los frecuentes del lote que no estaban se cuentan en los datos anteriores (almacén + lotes ya incorporados)
+#   y se promueven si alcanzan el soporte mínimo sobre el total
+#
+# El lote por defecto es order_products__train.csv, que el preprocesamiento carga pero no usa.
+#
+# 📥 data/procesados/03a. itemsets_apriori.parquet (+ .json)              ← 02. analisis_apriori.py
+#    data/procesados/07a. itemsets_apriori_cluster_*.parquet (+ .json)    ← 03. Cruce.../02. reglas_apriori_por_cluster.py
+# 📤 data/procesados/03. reglas_apriori.parquet y 07. reglas_apriori_cluster_*.parquet actualizados
+#    data/procesados/03b. lotes_incrementales/<lote>.npz (cestas del lote, para contarlas en actualizaciones futuras)
+#
+# Un lote ya incorporado no se vuelve a aplicar. Volver a correr 02. analisis_apriori.py / las reglas por clúster
+# reinicia el estado desde el almacén (sin lotes).
+
+
+################################# 1. Importar librerías #################################
+
+
+import numpy as np
+import os
+import pandas as pd
+import sys
+
+# Raíz del repositorio en el path para importar los módulos compartidos (utils/, mineria/)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from utils.artefactos import leer_artefacto
+from utils.ingesta import PATH_DATOS, leer_tabla
+from utils.reglas_codificadas import guardar_reglas
+from utils.transacciones import AlmacenTransacciones, agrupar_cestas
+from mineria.cerrados import reglas_no_redundantes
+from mineria.incremental import existe_estado, fup, guardar_estado, leer_estado
+from mineria.reticulo import Reticulo
+from mineria.significancia import agregar_significancia
+from mineria.son import contar_candidatos
+
+# 📦 Lote de órdenes nuevas: data/datos/<LOTE>.csv con el formato de order_products__*.csv (order_id, product_id, ...)
+LOTE = "order_products__train"
+
+RUTA_LOTES = "./data/procesados/03b. lotes_incrementales/"
+
+ESTADO_GLOBAL = "03a. itemsets_apriori"
+ESTADO_CLUSTER = "07a. itemsets_apriori_cluster_{}"
+
+# Mismos umbrales de reglas que 02. analisis_apriori.py y 02. reglas_apriori_por_cluster.py
+LIFT_MINIMO = 1.0
+CONFIANZA_MINIMA_CLUSTER = 0.15
+
+# ✂️ Igual que en la minería: solo la base min-max de reglas no redundantes (mineria/cerrados.py)
+REGLAS_NO_REDUNDANTES = False
+
+# 📐 Igual que en la minería: p_value / q_value de cada regla y, con alfa, solo las significativas
+PRUEBA_SIGNIFICANCIA = "fisher"
+ALFA_SIGNIFICANCIA = None
+
+EXPORTAR_CSV = False
+
+
+################################# 2. Cargar lote y datos anteriores #################################
+
+
+almacen = AlmacenTransacciones()
+
+lineas = pd.read_csv(f"{PATH_DATOS}{LOTE}.csv", usecols=["order_id", "product_id"], dtype=np.int32)
+ids_lote, offsets_lote, productos_lote = agrupar_cestas(lineas["order_id"].to_numpy(), lineas["product_id"].to_numpy())
+del lineas
+print(f"📦 Lote {LOTE}: {len(ids_lote):,} órdenes, {len(productos_lote):,} líneas")
+
+# 🧬 Clúster de cada orden del lote (usuario de la orden → clúster del usuario)
+orders = leer_tabla("orders", reporte=False)[["order_id", "user_id"]]
+usuario = orders.set_index("order_id")["user_id"].reindex(ids_lote).fillna(-1).to_numpy(np.int64)
+clientes = leer_artefacto("04. clientes_clusterizados", columnas=["user_id", "cluster"])
+busqueda = np.full(int(max(usuario.max(), clientes["user_id"].max())) + 1, -1, dtype=np.int8)
+busqueda[clientes["user_id"].to_numpy()] = clientes["cluster"].to_numpy()
+cluster_lote = np.where(usuario >= 0, busqueda[np.maximum(usuario, 0)], -1)
+del orders, clientes
+
+
+def cargar_lote(nombre: str):
+    datos = np.load(os.path.join(RUTA_LOTES, f"{nombre}.npz"))
+    return datos["offsets"], datos["productos"], datos["user_id"]
+
+
+def filtrar(offsets, productos, mascara):
+    """
+    Cestas (offsets, productos) de las órdenes marcadas en mascara.
+    """
+    largos = np.diff(offsets)
+    nuevos = np.zeros(int(mascara.sum()) + 1, dtype=np.int64)
+    np.cumsum(largos[mascara], out=nuevos[1:])
+    return nuevos, productos[np.repeat(mascara, largos)]
+
+
+def contador(cestas_anteriores: list):
+    """
+    Función que cuenta candidatos en todas las cestas anteriores (almacén y lotes ya incorporados).
+    """
+    def contar(candidatos):
+        return sum(contar_candidatos(o, p, candidatos, almacen.n_codigos) for o, p in cestas_anteriores)
+    return contar
+
+
+def actualizar(nombre_estado: str, offsets, productos, cestas_anteriores: list):
+    """
+    Aplica FUP al estado con el lote. Devuelve el retículo actualizado, o None si no corresponde.
+    """
+    if not existe_estado(nombre_estado):
+        print(f"⚠️ Sin estado {nombre_estado}: primero hay que minar todas las órdenes (se omite).")
+        return None
+    estado, meta = leer_estado(nombre_estado)
+    if LOTE in meta["lotes"]:
+        print(f"ℹ️ {nombre_estado} ya incorpora el lote {LOTE} (se omite).")
+        return None
+
+    estado, n_ordenes, resumen = fup(estado, meta, offsets, productos, contador(cestas_anteriores), almacen.n_codigos)
+    guardar_estado(estado, nombre_estado, n_ordenes, meta["min_support"], meta["max_len"], meta["lotes"] + [LOTE])
+    print(f"🔄 {nombre_estado}: {resumen['ordenes_anteriores']:,} + {resumen['ordenes_delta']:,} órdenes | "
+          f"{resumen['mantenidos']:,} mantenidos, {resumen['degradados']:,} degradados, "
+          f"{resumen['promovidos']:,} de {resumen['candidatos_nuevos']:,} candidatos nuevos promovidos")
+    return Reticulo(estado["itemsets"], estado["cuenta"], n_ordenes, meta["min_support"])
+
+
+def lotes_anteriores(nombre_estado: str) -> list:
+    if not existe_estado(nombre_estado):
+        return []
+    return [cargar_lote(nombre) for nombre in leer_estado(nombre_estado)[1]["lotes"]]
+
+
+################################# 3. Guardar el lote #################################
+
+
+# Las próximas actualizaciones cuentan los candidatos nuevos también en este lote. Se escribe antes que cualquier
+# estado (temporal + os.replace): un estado que lista el lote nunca queda sin su archivo aunque la corrida se corte
+os.makedirs(RUTA_LOTES, exist_ok=True)
+destino_lote = os.path.join(RUTA_LOTES, f"{LOTE}.npz")
+with open(destino_lote + ".tmp", "wb") as f:
+    np.savez(f, order_id=ids_lote, offsets=offsets_lote, productos=productos_lote, user_id=usuario)
+os.replace(destino_lote + ".tmp", destino_lote)
+print(f"💾 Lote guardado en {destino_lote}")
+
+
+################################# 4. Reglas globales #################################
+
+
+anteriores = [(almacen.offsets, almacen.productos)] + [(o, p) for o, p, _ in lotes_anteriores(ESTADO_GLOBAL)]
+reticulo = actualizar(ESTADO_GLOBAL, offsets_lote, productos_lote, anteriores)
+
+if reticulo is not None:
+    if REGLAS_NO_REDUNDANTES:
+        reglas = reglas_no_redundantes(reticulo.frecuentes(), min_lift=LIFT_MINIMO)
+    else:
+        reglas = reticulo.reglas_en(min_lift=LIFT_MINIMO)
+    reglas = agregar_significancia(reglas, reticulo.n_ordenes, PRUEBA_SIGNIFICANCIA, ALFA_SIGNIFICANCIA)
+    destino = guardar_reglas(reglas, "03. reglas_apriori", exportar_csv=EXPORTAR_CSV)
+    print(f"✅ {len(reglas):,} reglas globales exportadas a: {destino}")
+
+
+################################# 5. Reglas por clúster #################################
+
+
+for cluster_id in np.unique(almacen.cluster[almacen.cluster >= 0]):
+    nombre_estado = ESTADO_CLUSTER.format(cluster_id)
+    print(f"\n🔍 Clúster {cluster_id}...")
+
+    # Datos anteriores del clúster: sus órdenes del almacén y de los lotes ya incorporados
+    anteriores = [almacen.subconjunto(almacen.ordenes_de_cluster(cluster_id))]
+    for o, p, u in lotes_anteriores(nombre_estado):
+        anteriores.append(filtrar(o, p, np.where(u >= 0, busqueda[np.maximum(u, 0)], -1) == cluster_id))
+
+    reticulo = actualizar(nombre_estado, *filtrar(offsets_lote, productos_lote, cluster_lote == cluster_id),
+                          anteriores)
+    if reticulo is None:
+        continue
+
+    if REGLAS_NO_REDUNDANTES:
+        reglas = reglas_no_redundantes(reticulo.frecuentes(), min_confianza=CONFIANZA_MINIMA_CLUSTER)
+    else:
+        reglas = reticulo.reglas_en(min_confianza=CONFIANZA_MINIMA_CLUSTER)
+    reglas = agregar_significancia(reglas, reticulo.n_ordenes, PRUEBA_SIGNIFICANCIA, ALFA_SIGNIFICANCIA)
+    reglas["cluster"] = cluster_id
+    destino = guardar_reglas(reglas, f"07. reglas_apriori_cluster_{cluster_id}", exportar_csv=EXPORTAR_CSV)
+    print(f"✅ {len(reglas):,} reglas guardadas en {destino}")
@@ -0,0 +1,92 @@
+###################################################################################################################
+###################################################################################################################
+################################# 02.3 BARRIDO DE UMBRALES SIN VOLVER A MINAR 🎚️ #################################
+###################################################################################################################
+###################################################################################################################
+
+
+# Cuántas reglas (y de qué calidad) deja cada combinación de soporte, confianza y elevación, usando el retículo
+# de conjuntos frecuentes que 02. analisis_apriori.py ya minó a su soporte piso (mineria/reticulo.py).
+# Cada combinación se resuelve con máscaras sobre las reglas precalculadas: no se vuelve a minar.
+#
+# 📥 data/procesados/03a. itemsets_apriori.parquet (+ .json)
+# 📤 data/procesados/03c. barrido_umbrales_reglas.parquet
+#    data/procesados/03. reglas_apriori.parquet (solo con EXPORTAR_REGLAS, con los umbrales de REGLAS_ELEGIDAS)
+
+
+################################# 1. Importar librerías #################################
+
+
+import itertools
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# Raíz del repositorio en el path para importar los módulos compartidos (utils/, mineria/)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from utils.artefactos import guardar_artefacto
+from utils.reglas_codificadas import guardar_reglas
+from mineria.reticulo import Reticulo
+from mineria.significancia import agregar_significancia
+
+# 🎚️ Umbrales a combinar (los soportes bajo el piso del retículo se omiten)
+SOPORTES = [0.0005, 0.001, 0.002, 0.005, 0.01]
+CONFIANZAS = [0.0, 0.1, 0.2, 0.3, 0.5]
+ELEVACIONES = [1.0, 1.5, 2.0, 3.0]
+
+# 💾 Reescribir 03. reglas_apriori.parquet con otra combinación (sin correr 02. analisis_apriori.py)
+EXPORTAR_REGLAS = False
+REGLAS_ELEGIDAS = {"min_support": 0.001, "min_confianza": 0.0, "min_lift": 1.0}
+PRUEBA_SIGNIFICANCIA = "fisher"
+ALFA_SIGNIFICANCIA = None
+
+EXPORTAR_CSV = False
+
+
+################################# 2. Cargar el retículo #################################
+
+
+inicio = time.perf_counter()
+reticulo = Reticulo.leer("03a. itemsets_apriori")
+print(f"🧱 Retículo: {len(reticulo.conjuntos):,} conjuntos, {reticulo.n_reglas:,} reglas posibles "
+      f"(piso {reticulo.piso}) en {time.perf_counter() - inicio:.2f} s")
+
+
+################################# 3. Barrido #################################
+
+
+filas = []
+inicio = time.perf_counter()
+for soporte, confianza, elevacion in itertools.product(SOPORTES, CONFIANZAS, ELEVACIONES):
+    if soporte < reticulo.piso:
+        continue
+    sel = reticulo.mascara(soporte, confianza, elevacion)
+    # Productos distintos que aparecen en alguna regla (unión de los conjuntos que generan las reglas)
+    conjuntos = np.unique(reticulo.conjunto[sel])
+    filas.append({
+        "min_support": soporte, "min_confianza": confianza, "min_lift": elevacion,
+        "reglas": int(sel.sum()),
+        "productos": len(set().union(*reticulo.itemsets[conjuntos])),
+        "lift_mediano": float(np.median(reticulo.lift[sel])) if sel.any() else np.nan,
+        "confianza_mediana": float(np.median(reticulo.confianza[sel])) if sel.any() else np.nan,
+    })
+barrido = pd.DataFrame(filas)
+print(f"🎚️ {len(barrido)} combinaciones en {time.perf_counter() - inicio:.3f} s\n")
+print(barrido.to_string(index=False))
+
+destino = guardar_artefacto(barrido, "03c. barrido_umbrales_reglas", exportar_csv=EXPORTAR_CSV)
+print(f"\n✅ Barrido guardado en {destino}")
+
+
+################################# 4. Reglas con los umbrales elegidos #################################
+
+
+if EXPORTAR_REGLAS:
+    reglas = reticulo.reglas_en(**REGLAS_ELEGIDAS)
+    reglas = agregar_significancia(reglas, reticulo.n_ordenes, PRUEBA_SIGNIFICANCIA, ALFA_SIGNIFICANCIA)
+    destino = guardar_reglas(reglas, "03. reglas_apriori")
+    print(f"✅ {len(reglas):,} reglas ({REGLAS_ELEGIDAS}) exportadas a: {destino}")
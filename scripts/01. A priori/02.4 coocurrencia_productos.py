@@ -0,0 +1,71 @@
+###################################################################################################################
+###################################################################################################################
+######################### 02.4 CO-OCURRENCIA Y ELEVACIÓN DE TODOS LOS PARES DE PRODUCTOS 🔢 #########################
+###################################################################################################################
+###################################################################################################################
+
+
+# Cuenta cuántas órdenes tienen cada par de productos con Xᵀ X sobre la matriz one-hot dispersa de todas las
+# órdenes del almacén (mineria/pares.py), y calcula soporte, confianza, elevación y apalancamiento de todos los
+# pares de una vez. Con POR_CLUSTER hace lo mismo con las órdenes de cada clúster.
+# Los mapas de calor (04.5 y la página Apriori del dashboard, que también elige un clúster) leen esta tabla con
+# submatriz() en lugar de pivotear reglas filtradas.
+#
+# 📥 data/procesados/01b. almacen_transacciones/ (+ cluster.npy, ← 03. Cruce.../01. cruce_apriori_kmeans.py)
+# 📤 data/procesados/03d. pares_productos.parquet
+#    data/procesados/07d. pares_productos_cluster_*.parquet (solo con POR_CLUSTER)
+
+
+################################# 1. Importar librerías #################################
+
+
+import os
+import sys
+import time
+
+import numpy as np
+
+# Raíz del repositorio en el path para importar los módulos compartidos (utils/, mineria/)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from utils.artefactos import guardar_artefacto
+from utils.transacciones import AlmacenTransacciones
+from mineria.pares import contar_pares
+
+# 🔢 Cuenta conjunta mínima de un par. Con todas las órdenes y todo el catálogo hay decenas de millones de pares
+# que aparecen juntos una o dos veces; 1 = todos los pares
+MIN_CUENTA = 5
+MIN_CUENTA_CLUSTER = 5
+
+# Co-ocurrencia también dentro de cada clúster (requiere el cruce con K-Means)
+POR_CLUSTER = True
+
+# Columnas de Xᵀ X por multiplicación (acota la memoria)
+BLOQUE = 2048
+
+EXPORTAR_CSV = False
+
+
+################################# 2. Pares de todas las órdenes #################################
+
+
+almacen = AlmacenTransacciones()
+
+inicio = time.perf_counter()
+pares = contar_pares(almacen.offsets, almacen.productos, almacen.n_codigos, MIN_CUENTA, BLOQUE)
+print(f"🔢 {almacen.n_ordenes:,} órdenes → {len(pares):,} pares con cuenta ≥ {MIN_CUENTA} "
+      f"en {time.perf_counter() - inicio:.1f} s")
+
+destino = guardar_artefacto(pares, "03d. pares_productos", exportar_csv=EXPORTAR_CSV)
+print(f"✅ Pares guardados en {destino}")
+
+
+################################# 3. Pares por clúster #################################
+
+
+if POR_CLUSTER:
+    for cluster_id in np.unique(almacen.cluster[almacen.cluster >= 0]):
+        offsets, productos = almacen.subconjunto(almacen.ordenes_de_cluster(cluster_id))
+        pares = contar_pares(offsets, productos, almacen.n_codigos, MIN_CUENTA_CLUSTER, BLOQUE)
+        destino = guardar_artefacto(pares, f"07d. pares_productos_cluster_{cluster_id}", exportar_csv=EXPORTAR_CSV)
+        print(f"✅ Clúster {cluster_id}: {len(offsets) - 1:,} órdenes → {len(pares):,} pares en {destino}")
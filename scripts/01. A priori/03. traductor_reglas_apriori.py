@@ -8,133 +8,50 @@
 
 ###################################################################################################################
 
-# Este script traduce el archivo generado por Apriori al español, incluyendo:
-# - Nombres de columnas como 'support', 'confidence', 'lift', etc.
-# - Los contenidos dentro de los frozensets, es decir, los nombres de productos.
-# Esto permite que los gráficos y análisis posteriores sean completamente legibles y presentables.
+# Este script traduce al español los productos de las reglas generadas por Apriori.
+# Las reglas guardan los productos como códigos (utils/reglas_codificadas.py), así que no hace falta reescribirlas:
+# basta un diccionario de productos (product_id, product_name, product_name_es) con los productos que aparecen
+# en ellas. Los gráficos y el dashboard leen las reglas con leer_reglas_traducidas() y ese diccionario, y ya
+# reciben las columnas y los nombres de productos en español.
+#
+# Los nombres en español se buscan por código en el catálogo traducido (01.1 traduccion_catalogo.py); solo los
+# productos que todavía no estén traducidos ahí pasan por el traductor (con caché, utils/traduccion.py).
 
 ###################################################################################################################
 
-# 1. Configuración del traductor
-# 2. Cargar archivo original
-# 3. Traducir nombres de columnas
-# 4. Extraer todos los ítems únicos desde los frozensets
-# 5. Crear diccionario de traducciones
-# 6. Función para traducir frozensets
-# 7. Aplicar traducción
-# 8. Exportar archivo traducido
+# 1. Importar librerías
+# 2. Cargar códigos de producto de las reglas
+# 3. Buscar sus nombres en el catálogo traducido
+# 4. Exportar diccionario de productos
 
 
-################################# 1. Configuración del traductor #################################
+################################# 1. Importar librerías #################################
 
-import pandas as pd
-import re
-from deep_translator import GoogleTranslator
+import os
+import sys
 
-translator = GoogleTranslator(source="en", target="es")
+# Raíz del repositorio en el path para importar los módulos compartidos (utils/)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
 
-def traducir_texto(texto: str) -> str:
-    """
-    Traduce una cadena del inglés al español.
-    Si falla, devuelve el texto original.
-    """
-    try:
-        return translator.translate(texto)
-    except Exception:
-        return texto  # fallback en caso de error de la API
+from utils.artefactos import guardar_artefacto
+from utils.reglas_codificadas import codigos_en_reglas
+from utils.traduccion import diccionario_productos
 
 
-################################# 2. Cargar el archivo original #################################
+################################# 2. Cargar códigos de producto de las reglas #################################
 
-input_file = "././data/procesados/03. reglas_apriori.csv"             # nombre del archivo original
-output_file = "././data/procesados/03T. reglas_apriori_traducido.csv" # nombre del archivo traducido
+input_file = "03. reglas_apriori"                     # artefacto de reglas (productos como códigos)
+output_file = "03T. diccionario_productos_apriori"    # diccionario de productos traducido
 
-df = pd.read_csv(input_file)
+codigos = codigos_en_reglas(input_file)
 
 
-################################# 3. Traducir nombres de columnas #################################
+################################# 3. Buscar sus nombres en el catálogo traducido #################################
 
-map_columnas = {
-    "antecedents": "antecedentes",
-    "consequents": "consecuentes",
-    "antecedent support": "soporte antecedente",
-    "consequent support": "soporte consecuente",
-    "support": "soporte",
-    "confidence": "confianza",
-    "lift": "elevacion",
-    "representativity": "representatividad",
-    "leverage": "apalancamiento",
-    "conviction": "conviccion",
-    "zhangs_metric": "metrica_zhang",
-    "jaccard": "jaccard",
-    "certainty": "certeza",
-    "kulczynski": "kulczynski",
-}
+diccionario = diccionario_productos(codigos)
 
-df.rename(columns=map_columnas, inplace=True)
 
+################################# 4. Exportar diccionario de productos #################################
 
-################################# 4. Extraer todos los textos de los frozenset #################################
-
-columnas_sets = ["antecedentes", "consecuentes"]
-
-todos_los_items = set()
-
-patron = re.compile(r"'(.*?)'")  # captura lo que está entre comillas simples
-
-for col in columnas_sets:
-    if col in df.columns:
-        for valor in df[col].dropna():
-            valor_str = str(valor)
-            items = patron.findall(valor_str)
-            for it in items:
-                todos_los_items.add(it)
-
-
-################################# 5. Crear un diccionario de traducciones automáticas #################################
-
-map_traducciones = {}
-
-for item in todos_los_items:
-    traduccion = traducir_texto(item)
-    map_traducciones[item] = traduccion
-
-
-################################# 6. Función para traducir el contenido de un frozenset #################################
-
-def traducir_frozenset(celda):
-    """
-    Recibe algo como "frozenset({'Banana', 'Apple'})"
-    y devuelve "frozenset({'Banana', 'Manzana'})", etc.,
-    usando map_traducciones para cada elemento interno.
-    """
-    if not isinstance(celda, str):
-        celda = str(celda)
-
-    if "frozenset" not in celda:
-        return celda
-
-    items = patron.findall(celda)
-    if not items:
-        return celda
-
-    items_traducidos = [
-        map_traducciones.get(it, it) for it in items
-    ]
-
-    # reconstruir el string con el mismo formato
-    interior = ", ".join(f"'{it}'" for it in items_traducidos)
-    return f"frozenset({{{interior}}})"
-
-
-################################# 7. Aplicar traducción a las columnas de sets #################################
-
-for col in columnas_sets:
-    if col in df.columns:
-        df[col] = df[col].apply(traducir_frozenset)
-
-
-################################# 8. Guardar el archivo traducido #################################
-
-df.to_csv(output_file, index=False, encoding="utf-8-sig")
-print(f"✅ Archivo traducido correctamente → {output_file}")
+destino = guardar_artefacto(diccionario, output_file)
+print(f"✅ {len(diccionario):,} productos traducidos correctamente → {destino}")
@@ -33,13 +33,20 @@
 
 ################################# 1. Importar librerías #################################
 
-import pandas as pd
 import matplotlib.pyplot as plt
+import os
+import sys
+
+# Raíz del repositorio en el path para importar los módulos compartidos (utils/)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from utils.reglas_codificadas import leer_reglas
+from utils.figuras import guardar_figura
 
 
 ################################# 2. Cargar reglas generadas #################################
 
-reglas = pd.read_csv("././data/procesados/03T. reglas_apriori_traducido.csv")
+reglas = leer_reglas("03. reglas_apriori", columnas=["soporte", "confianza", "elevacion"])
 
 
 ################################# 3. Filtrar reglas relevantes #################################
@@ -71,6 +78,5 @@ cbar.set_label("Elevación (lift)", rotation=270, labelpad=15)
 # Guardar gráfico
 
 plt.tight_layout()
-plt.savefig("././output/01. A priori/01. apriori_reglas_de_asociacion.png")
-plt.show()
+guardar_figura("././output/01. A priori/01. apriori_reglas_de_asociacion.png")
 print("✅ Gráfico de dispersión exportado a: output/01. apriori_reglas_de_asociacion.png")
\ No newline at end of file
@@ -22,8 +22,7 @@
 # 1. Importar librerías
 # 2. Cargar reglas de asociación traducidas
 # 3. Filtrar reglas con mayor elevación
-# 4. Convertir conjuntos a strings para visualización
-# 5. Crear el grafo y exportar
+# 4. Crear el grafo y exportar
 
 ###################################################################################################################
 
@@ -31,15 +30,25 @@
 ################################# 1. Importar librerías #################################
 
 
-import pandas as pd
 import networkx as nx
 import matplotlib.pyplot as plt
+import os
+import sys
+
+# Raíz del repositorio en el path para importar los módulos compartidos (utils/)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from utils.reglas_codificadas import leer_reglas_traducidas
+from utils.figuras import guardar_figura
+from utils.disposicion import disposicion
+from utils.red_reglas import red_reglas
 
 
 ################################# 2. Cargar reglas de asociación traducidas #################################
 
 
-reglas = pd.read_csv("././data/procesados/03T. reglas_apriori_traducido.csv")
+# Productos como códigos + diccionario traducido: antecedentes / consecuentes llegan como texto "A, B"
+reglas = leer_reglas_traducidas("03. reglas_apriori", "03T. diccionario_productos_apriori")
 
 
 ################################# 3. Filtrar reglas con mayor elevación #################################
@@ -51,25 +60,15 @@ reglas_red = reglas[
 
 
 
-################################# 4. Convertir conjuntos a strings para visualización #################################
-
-
-reglas_red["antecedentes"] = reglas_red["antecedentes"].str.strip("frozenset({})").str.replace("'", "")
-reglas_red["consecuentes"] = reglas_red["consecuentes"].str.strip("frozenset({})").str.replace("'", "")
-
-
-################################# 5. Crear el grafo y exportar #################################
-
+################################# 4. Crear el grafo y exportar #################################
 
-G = nx.DiGraph()
 
-# Añadir nodos y aristas con peso según elevación
-for _, fila in reglas_red.iterrows():
-    G.add_edge(fila["antecedentes"], fila["consecuentes"], weight=fila["elevacion"])
+# Nodos y aristas con peso según elevación (utils/red_reglas.py)
+G = red_reglas(reglas_red).grafo()
 
-# Visualización
+# Visualización (posiciones desde la caché de disposiciones si esta red ya se dibujó)
 plt.figure(figsize=(12, 8))
-pos = nx.spring_layout(G, k=0.95, iterations=20)
+pos = disposicion(G, "spring", k=0.95, iterations=20, seed=42)
 
 # Dibujar nodos y etiquetas
 nx.draw_networkx_nodes(G, pos, node_size=500, node_color="lightblue", linewidths=0.5)
@@ -82,7 +81,6 @@ plt.axis("off")
 
 # Guardar gráfico
 plt.tight_layout()
-plt.savefig("././output/01. A priori/02. gráfico_de_reglas_red_amplio.png")
-plt.show()
+guardar_figura("././output/01. A priori/02. gráfico_de_reglas_red_amplio.png")
 
 print("✅ Red de productos exportada a: output/02. gráfico_de_reglas_red_amplio.png")
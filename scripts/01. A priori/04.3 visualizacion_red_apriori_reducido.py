@@ -21,21 +21,31 @@
 # 1. Importar librerías
 # 2. Cargar reglas de asociación traducidas
 # 3. Filtrar reglas con elevación > 3.2 y confianza > 0.2
-# 4. Convertir conjuntos a strings para visualización
-# 5. Crear el grafo y exportar
+# 4. Crear el grafo y exportar
 
 ###################################################################################################################
 
 
 ################################# 1. Importar librerías #################################
 
-import pandas as pd
+import numpy as np
 import networkx as nx
 import matplotlib.pyplot as plt
+import os
+import sys
+
+# Raíz del repositorio en el path para importar los módulos compartidos (utils/)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from utils.reglas_codificadas import leer_reglas_traducidas
+from utils.figuras import guardar_figura
+from utils.disposicion import disposicion
+from utils.red_reglas import red_reglas
 
 ################################# 2. Cargar reglas de asociación traducidas #################################
 
-reglas = pd.read_csv("././data/procesados/03T. reglas_apriori_traducido.csv")
+# Productos como códigos + diccionario traducido: antecedentes / consecuentes llegan como texto "A, B"
+reglas = leer_reglas_traducidas("03. reglas_apriori", "03T. diccionario_productos_apriori")
 
 ################################# 3. Filtrar reglas con elevación > 3.2 y confianza > 0.2 #################################
 
@@ -44,47 +54,25 @@ reglas_red = reglas[
     (reglas["confianza"] > 0.2)
 ].copy()
 
-################################# 4. Convertir conjuntos a strings para visualización #################################
-
-reglas_red["antecedentes"] = reglas_red["antecedentes"].str.strip("frozenset({})").str.replace("'", "")
-reglas_red["consecuentes"] = reglas_red["consecuentes"].str.strip("frozenset({})").str.replace("'", "")
+################################# 4. Crear el grafo y exportar #################################
 
-################################# 5. Crear el grafo y exportar #################################
-
-G = nx.DiGraph()
-
-# Añadir nodos y aristas
-for _, fila in reglas_red.iterrows():
-    G.add_edge(fila["antecedentes"], fila["consecuentes"], weight=fila["elevacion"])
+# Aristas, rol y elevación máxima de cada nodo en una pasada (utils/red_reglas.py)
+red = red_reglas(reglas_red)
+G = red.grafo()
 
 # ================================
 # NUEVO: Color distinto según rol
 # ================================
 
-antecedentes_set = set(reglas_red["antecedentes"])
-consecuentes_set = set(reglas_red["consecuentes"])
-
-node_colors = []
-for nodo in G.nodes():
-    if nodo in antecedentes_set and nodo in consecuentes_set:
-        node_colors.append("#82E0AA")   # verde → ambos roles
-    elif nodo in antecedentes_set:
-        node_colors.append("#85C1E9")   # azul → antecedente
-    else:
-        node_colors.append("#F5B041")   # naranja → consecuente
+# azul → antecedente, naranja → consecuente, verde → ambos roles (orden de ROLES)
+node_colors = np.array(["#85C1E9", "#F5B041", "#82E0AA"])[red.rol].tolist()
 
 # Tamaño de nodos según lift asociado
-node_sizes = []
-for nodo in G.nodes():
-    lifts_ante = reglas_red[reglas_red["antecedentes"] == nodo]["elevacion"].tolist()
-    lifts_cons = reglas_red[reglas_red["consecuentes"] == nodo]["elevacion"].tolist()
-    lifts_total = lifts_ante + lifts_cons
-    max_lift = max(lifts_total) if lifts_total else 1
-    node_sizes.append(max_lift * 1000)
+node_sizes = (red.max_lift * 1000).tolist()
 
 # Visualización
 plt.figure(figsize=(12, 8))
-pos = nx.kamada_kawai_layout(G)
+pos = disposicion(G, "kamada_kawai")
 
 nx.draw(
     G,
@@ -109,6 +97,5 @@ plt.title("Red Reducida de Reglas de Asociación (elevación (lift) > 3.2, confi
 plt.axis("off")
 
 plt.tight_layout()
-plt.savefig("././output/01. A priori/03. gráfico_de_reglas_red_reducido.png")
-plt.show()
+guardar_figura("././output/01. A priori/03. gráfico_de_reglas_red_reducido.png")
 print("✅ Red reducida de productos exportada a: output/03. gráfico_de_reglas_red_reducido.png")
@@ -26,14 +26,22 @@
 
 ################################# 1. Importar librerías #################################
 
-import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.ticker as mticker
+import os
+import sys
+
+# Raíz del repositorio en el path para importar los módulos compartidos (utils/)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from utils.reglas_codificadas import leer_reglas_traducidas
+from utils.figuras import guardar_figura
 
 
 ################################# 2. Cargar reglas traducidas #################################
 
-reglas = pd.read_csv("././data/procesados/03T. reglas_apriori_traducido.csv")
+# Productos como códigos + diccionario traducido: antecedentes / consecuentes llegan como texto "A, B"
+reglas = leer_reglas_traducidas("03. reglas_apriori", "03T. diccionario_productos_apriori")
 
 
 ################################# 3. Filtrar por elevación > 3.2 y confianza > 0.2 #################################
@@ -50,9 +58,7 @@ reglas_top10 = reglas_filtradas.sort_values("elevacion", ascending=False).head(1
 
 # Crear una columna de texto amigable para el gráfico
 reglas_top10["regla"] = (
-    reglas_top10["antecedentes"].str.strip("frozenset({})").str.replace("'", "") +
-    " → " +
-    reglas_top10["consecuentes"].str.strip("frozenset({})").str.replace("'", "")
+    reglas_top10["antecedentes"] + " → " + reglas_top10["consecuentes"]
 )
 
 
@@ -88,7 +94,6 @@ plt.gca().invert_yaxis()
 plt.tight_layout()
 
 # Exportar gráfico
-plt.savefig("././output/01. A priori/04. apriori_grafico_de_barras.png", dpi=300)
-plt.show()
+guardar_figura("././output/01. A priori/04. apriori_grafico_de_barras.png", dpi=300)
 
 print("✅ Gráfico de barras estilizado exportado a: output/04. apriori_grafico_de_barras.png")
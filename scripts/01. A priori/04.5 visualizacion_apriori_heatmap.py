@@ -8,16 +8,19 @@
 ###################################################################################################################
 # Este gráfico de matriz de calor muestra las asociaciones más fuertes entre productos (reglas Apriori),
 # representadas como una tabla donde el eje X son los productos antecedente, y el eje Y los productos consecuente.
-# El valor en cada celda representa el "lift" (elevación) de la regla.
+# El valor en cada celda representa el "lift" (elevación) del par de productos.
 #
-# Se incluyen solo reglas con elevación > 3.2 y confianza > 0.2, para centrarse en asociaciones fuertes.
+# Los productos salen de las reglas con elevación > 3.2 y confianza > 0.2, para centrarse en asociaciones fuertes
+# (como mucho MAX_PRODUCTOS por eje, los que aparecen en más reglas). Las celdas se leen de la tabla de pares
+# (03d. pares_productos, ← 02.4 coocurrencia_productos.py) en lugar de pivotear las reglas filtradas: cada par
+# tiene su elevación exacta aunque la regla no haya pasado el soporte mínimo.
 # Este tipo de visualización es útil para comparar rápidamente patrones entre múltiples combinaciones.
 ###################################################################################################################
 
 # 1. Importar librerías
-# 2. Cargar reglas traducidas
+# 2. Cargar reglas (códigos de producto), pares y nombres traducidos
 # 3. Filtrar por elevación > 3.2 y confianza > 0.2
-# 4. Preparar DataFrame de matriz (antecedente vs. consecuente)
+# 4. Preparar DataFrame de matriz (antecedente vs. consecuente) desde la tabla de pares
 # 5. Visualizar como heatmap y exportar
 
 ###################################################################################################################
@@ -25,14 +28,30 @@
 
 ################################# 1. Importar librerías #################################
 
-import pandas as pd
+import numpy as np
 import seaborn as sns
 import matplotlib.pyplot as plt
+import os
+import sys
 
+# Raíz del repositorio en el path para importar los módulos compartidos (utils/)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
 
-################################# 2. Cargar reglas traducidas #################################
+from utils.artefactos import leer_artefacto
+from utils.reglas_codificadas import leer_reglas, nombres_diccionario
+from utils.figuras import guardar_figura
+from mineria.pares import submatriz
 
-reglas = pd.read_csv("././data/procesados/03T. reglas_apriori_traducido.csv")
+# Productos por eje (los que aparecen en más reglas filtradas)
+MAX_PRODUCTOS = 20
+
+
+################################# 2. Cargar reglas (códigos de producto), pares y nombres traducidos #################################
+
+# Sin nombres: antecedentes / consecuentes llegan como arreglos de códigos de producto
+reglas = leer_reglas("03. reglas_apriori", columnas=["antecedentes", "consecuentes", "elevacion", "confianza"])
+pares = leer_artefacto("03d. pares_productos")
+nombres = nombres_diccionario("03T. diccionario_productos_apriori")
 
 
 ################################# 3. Filtrar por elevación > 3.2 y confianza > 0.2 #################################
@@ -45,17 +64,19 @@ reglas_filtradas = reglas[
 
 ################################# 4. Preparar DataFrame de matriz (antecedente vs. consecuente) #################################
 
-# Limpiar etiquetas
-reglas_filtradas["antecedentes"] = reglas_filtradas["antecedentes"].str.strip("frozenset({})").str.replace("'", "")
-reglas_filtradas["consecuentes"] = reglas_filtradas["consecuentes"].str.strip("frozenset({})").str.replace("'", "")
+def productos_mas_frecuentes(itemsets):
+    codigos, veces = np.unique(np.concatenate([np.empty(0, dtype=np.int32), *itemsets]), return_counts=True)
+    return codigos[np.argsort(-veces, kind="stable")[:MAX_PRODUCTOS]]
 
-# Crear tabla pivote: filas = antecedente, columnas = consecuente, valores = elevación
-matriz = reglas_filtradas.pivot_table(
-    index="antecedentes", 
-    columns="consecuentes", 
-    values="elevacion", 
-    aggfunc="max"
-).fillna(0)
+
+# Filas = productos antecedentes, columnas = productos consecuentes, valores = elevación del par
+matriz = submatriz(
+    pares,
+    productos_mas_frecuentes(reglas_filtradas["antecedentes"]),
+    metrica="elevacion",
+    nombres=nombres,
+    columnas=productos_mas_frecuentes(reglas_filtradas["consecuentes"]),
+)
 
 
 ################################# 5. Visualizar como heatmap y exportar #################################
@@ -81,7 +102,6 @@ plt.yticks(rotation=0)
 plt.tight_layout()
 
 # Guardar imagen
-plt.savefig("././output/01. A priori/05. apriori_matriz_de_calor.png", dpi=300)
-plt.show()
+guardar_figura("././output/01. A priori/05. apriori_matriz_de_calor.png", dpi=300)
 
 print("✅ Matriz de calor exportada a: output/05. apriori_matriz_de_calor.png")
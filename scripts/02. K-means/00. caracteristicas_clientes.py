@@ -0,0 +1,65 @@
+###################################################################################################################
+###################################################################################################################
+################################ 0- Características por cliente para clustering ###################################
+###################################################################################################################
+###################################################################################################################
+
+###################################################################################################################
+# OBJETIVO GENERAL DEL SCRIPT
+# -------------------------------------------------------------------------------------------------
+# Agrega una sola vez los datos de compra a una fila por cliente:
+# - Variables de comportamiento (n_pedidos, orden_max, día y hora promedio, días entre pedidos).
+# - Frecuencia de compra por departamento.
+#
+# La matriz queda en float32 y en memoria mapeada (utils/caracteristicas.py), junto con la media y desviación
+# del escalado y la proyección PCA. La validación (01), el clustering (02), los gráficos PCA (03, Prueba PCA 3d)
+# y el dashboard la leen de ahí sin volver a agregar las ~32M líneas.
+#
+# MODO elige cómo se construye (utils/caracteristicas.py); la validación y el clustering usan el que quede guardado:
+# - "lineas":  desde las ~32M líneas de "02. clientes_clustering" (promedios ponderados por tamaño de cesta)
+# - "ordenes": promedios temporales desde orders.csv (una fila por orden: promedios por orden) y compras por
+#              departamento contadas sobre el almacén de transacciones, ~10× menos datos que agregar
+#
+# SALIDA DEL SCRIPT:
+# -------------------------------------------------------------------------------------------------
+# ./data/procesados/02b. caracteristicas_clientes/ (user_id.npy, caracteristicas.npy, pca.npy, meta.json)
+###################################################################################################################
+
+
+#################################### 📦 1- Librerías ####################################
+
+import os
+import sys
+
+# Raíz del repositorio en el path para importar los módulos compartidos (utils/)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from utils.artefactos import leer_artefacto
+from utils.caracteristicas import (COLUMNAS_LINEAS, MODOS, agregar_por_cliente, agregar_por_ordenes,
+                                   construir_caracteristicas)
+
+# 🔁 "lineas" (promedios por línea, como el análisis original) u "ordenes" (promedios por orden)
+MODO = "lineas"
+
+
+#################################### 🔄 2- Agregar por cliente ####################################
+
+if MODO not in MODOS:
+    raise ValueError(f"Modo desconocido: {MODO} (opciones: {MODOS})")
+
+if MODO == "lineas":
+    # Parquet con proyección de columnas: solo se decodifican las columnas usadas en la agregación
+    df = leer_artefacto("02. clientes_clustering", columnas=COLUMNAS_LINEAS)
+    df_final = agregar_por_cliente(df)
+    del df
+else:
+    df_final = agregar_por_ordenes()
+
+
+#################################### 💾 3- Guardar características ####################################
+
+caracteristicas = construir_caracteristicas(df_final, modo=MODO)
+
+print(f"✅ Características ({MODO}) de {len(caracteristicas):,} clientes "
+      f"({len(caracteristicas.columnas)} columnas) → {caracteristicas.ruta}")
+print(f"   PCA: varianza explicada {[round(v, 3) for v in caracteristicas.meta['varianza_explicada']]}")
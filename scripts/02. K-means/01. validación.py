@@ -44,13 +44,12 @@
 # ÍNDICE DEL SCRIPT
 # -------------------------------------------------------------------------------------------------
 #  1. 📦 Librerías y configuración general
-#  2. 📥 Carga del dataset procesado de clientes
-#  3. 🔄 Construcción del dataset agregado por cliente (pivot + agrupación)
-#  4. 🔁 Análisis de multicolinealidad (matriz de correlación + heatmap)
-#  5. ⚖️ Escalado de variables para clustering
-#  6. ⚡ Cálculo optimizado del Método del Codo + Silueta
-#  7. 📊 Exportación del resumen técnico
-#  8. 🧾 Comentario técnico interpretativo final
+#  2. 📥 Carga de las características por cliente (00. caracteristicas_clientes.py)
+#  3. 🔁 Análisis de multicolinealidad (matriz de correlación + heatmap)
+#  4. ⚖️ Escalado de variables para clustering
+#  5. ⚡ Cálculo optimizado del Método del Codo + Silueta
+#  6. 📊 Exportación del resumen técnico
+#  7. 🧾 Comentario técnico interpretativo final
 ###################################################################################################################
 
 #################################### 📦 1- Librerías y configuración ####################################
@@ -60,9 +59,15 @@ import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 import os
+import sys
 
-# 🔧 Preprocesamiento y clustering
-from sklearn.preprocessing import StandardScaler
+# Raíz del repositorio en el path para importar los módulos compartidos (utils/)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from utils.caracteristicas import CaracteristicasClientes
+from utils.figuras import guardar_figura
+
+# 🔧 Clustering
 from sklearn.cluster import KMeans
 
 # 🧠 Evaluación de calidad de clustering
@@ -76,34 +81,15 @@ warnings.filterwarnings("ignore")
 os.makedirs("./output/02. K-means validacion", exist_ok=True)
 
 
-#################################### 📥 2- Cargar dataset ####################################
-
-df = pd.read_csv("./data/procesados/02. clientes_clustering.csv")
-
-
-#################################### 🔄 3- Transformación: Pivot + Agrupación ####################################
-
-df_agrupado = df.groupby("user_id").agg({
-    "order_id": "nunique",
-    "order_number": "max",
-    "order_dow": "mean",
-    "order_hour_of_day": "mean",
-    "days_since_prior_order": "mean"
-}).rename(columns={
-    "order_id": "n_pedidos",
-    "order_number": "orden_max",
-    "order_dow": "dia_promedio",
-    "order_hour_of_day": "hora_promedio",
-    "days_since_prior_order": "dias_entre_pedidos"
-}).reset_index()
-
-pivot_dept = pd.crosstab(df["user_id"], df["department"]).reset_index()
+#################################### 📥 2- Cargar características por cliente ####################################
 
-df_final = df_agrupado.merge(pivot_dept, on="user_id")
-X = df_final.drop("user_id", axis=1)
+# Matriz ya agregada por cliente (float32, memoria mapeada): métricas de comportamiento + compras por departamento
+caracteristicas = CaracteristicasClientes()
+X = caracteristicas.dataframe(user_id=False)
+print(f"📥 Características de {len(caracteristicas):,} clientes (modo {caracteristicas.meta.get('modo', 'lineas')})")
 
 
-#################################### 🔁 4- Multicolinealidad ####################################
+#################################### 🔁 3- Multicolinealidad ####################################
 
 correlation_matrix = X.corr()
 
@@ -111,19 +97,18 @@ plt.figure(figsize=(16, 12))
 sns.heatmap(correlation_matrix, cmap="coolwarm", annot=False, fmt=".2f", center=0)
 plt.title("🔁 Mapa de calor de correlación entre variables (Multicolinealidad)", fontsize=15)
 plt.tight_layout()
-plt.savefig("./output/02. K-means validacion/01.1 heatmap_correlacion_variables.png", dpi=300)
-plt.close()
+guardar_figura("./output/02. K-means validacion/01.1 heatmap_correlacion_variables.png", dpi=300)
 
 correlation_matrix.to_csv("./output/02. K-means validacion/01.2 correlaciones_variables.csv")
 
 
-#################################### ⚖️ 5- Escalado ####################################
+#################################### ⚖️ 4- Escalado ####################################
 
-scaler = StandardScaler()
-X_scaled = scaler.fit_transform(X)
+# Media y desviación guardadas con las características (mismo resultado que StandardScaler)
+X_scaled = caracteristicas.escaladas()
 
 
-#################################### ⚡ 6-7 Método del codo + Silueta (Optimizado) ####################################
+#################################### ⚡ 5 Método del codo + Silueta (Optimizado) ####################################
 
 # OBJETIVO:
 # - Optimizar tiempos evitando cálculos innecesarios.
@@ -155,8 +140,7 @@ plt.xlabel("Número de clusters (k)")
 plt.ylabel("Inercia (Suma de distancias al centroide)")
 plt.grid(True)
 plt.tight_layout()
-plt.savefig("./output/02. K-means validacion/01.3 metodo_del_codo.png", dpi=300)
-plt.close()
+guardar_figura("./output/02. K-means validacion/01.3 metodo_del_codo.png", dpi=300)
 
 # 📐 Silueta optimizada
 plt.figure(figsize=(10, 6))
@@ -166,11 +150,10 @@ plt.xlabel("Número de clusters (k)")
 plt.ylabel("Silueta promedio")
 plt.grid(True)
 plt.tight_layout()
-plt.savefig("./output/02. K-means validacion/01.4 silueta_por_k.png", dpi=300)
-plt.close()
+guardar_figura("./output/02. K-means validacion/01.4 silueta_por_k.png", dpi=300)
 
 
-#################################### 📊 7- Exportar resumen ####################################
+#################################### 📊 6- Exportar resumen ####################################
 
 df_resultados = pd.DataFrame({
     "k": Ks,
@@ -181,7 +164,7 @@ df_resultados = pd.DataFrame({
 df_resultados.to_csv("./output/02. K-means validacion/01.5 resumen_k_silueta_inercia.csv", index=False)
 
 
-#################################### 🧾 8- Comentario técnico interpretativo ####################################
+#################################### 🧾 7- Comentario técnico interpretativo ####################################
 
 '''
 📌 Análisis de validación para clustering:
@@ -10,7 +10,7 @@
 # Este script aplica el algoritmo K-Means con k = 5 (validado previamente) para segmentar clientes 
 # de un supermercado online en grupos de comportamiento homogéneo. 
 #
-# El análisis se basa en un dataset procesado a nivel de cliente, que incluye:
+# El análisis se basa en las características por cliente de 00. caracteristicas_clientes.py, que incluyen:
 # - Variables de comportamiento temporal (frecuencia, recencia, horarios).
 # - Frecuencia de compra por departamento (bakery, beverages, dairy, etc.).
 #
@@ -21,7 +21,7 @@
 #
 # SALIDAS DEL SCRIPT:
 # -------------------------------------------------------------------------------------------------
-# 1) ./data/procesados/04. clientes_clusterizados.csv
+# 1) ./data/procesados/04. clientes_clusterizados.parquet
 # 2) ./data/procesados/04T. clientes_clusterizados_reducido.csv
 # 3) ./output/03. K-means/02.1 distribucion_clusters.png
 ###################################################################################################################
@@ -34,8 +34,15 @@ import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 import os
+import sys
+
+# Raíz del repositorio en el path para importar los módulos compartidos (utils/)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from utils.artefactos import guardar_artefacto
+from utils.caracteristicas import COLUMNAS_PROMEDIO, CaracteristicasClientes
+from utils.figuras import guardar_figura
 
-from sklearn.preprocessing import StandardScaler
 from sklearn.cluster import KMeans
 import warnings
 warnings.filterwarnings("ignore")
@@ -46,52 +53,32 @@ warnings.filterwarnings("ignore")
 os.makedirs("./data/procesados", exist_ok=True)
 os.makedirs("./output/03. K-means", exist_ok=True)
 
+# El dataset clusterizado se guarda en Parquet; el CSV queda como salida opcional
+EXPORTAR_CSV = False
 
-#################################### 📥 3- Cargar dataset de clientes ####################################
-
-df = pd.read_csv("./data/procesados/02. clientes_clustering.csv")
-
-
-#################################### 🔄 4- Construcción del dataset a nivel de cliente ####################################
-
-# 4.1 Métricas agregadas por cliente
-df_agrupado = df.groupby("user_id").agg({
-    "order_id": "nunique",
-    "order_number": "max",
-    "order_dow": "mean",
-    "order_hour_of_day": "mean",
-    "days_since_prior_order": "mean"
-}).rename(columns={
-    "order_id": "n_pedidos",
-    "order_number": "orden_max",
-    "order_dow": "dia_promedio",
-    "order_hour_of_day": "hora_promedio",
-    "days_since_prior_order": "dias_entre_pedidos"
-}).reset_index()
-
-# 4.2 Pivot de frecuencia de compra por departamento
-pivot_dept = pd.crosstab(df["user_id"], df["department"]).reset_index()
 
-# 4.3 Unión de ambos datasets
-df_final = df_agrupado.merge(pivot_dept, on="user_id")
+#################################### 📥 3- Cargar características por cliente ####################################
 
+# Métricas de comportamiento + frecuencia de compra por departamento, ya agregadas (float32, memoria mapeada)
+caracteristicas = CaracteristicasClientes()
+df_final = caracteristicas.dataframe()
+print(f"📥 Características de {len(caracteristicas):,} clientes (modo {caracteristicas.meta.get('modo', 'lineas')})")
 
-#################################### ⚖️ 5- Escalado de variables ####################################
 
-X = df_final.drop("user_id", axis=1)
+#################################### ⚖️ 4- Escalado de variables ####################################
 
-scaler = StandardScaler()
-X_scaled = scaler.fit_transform(X)
+# Media y desviación guardadas con las características (mismo resultado que StandardScaler)
+X_scaled = caracteristicas.escaladas()
 
 
-#################################### 📌 6- Aplicar K-Means definitivo ####################################
+#################################### 📌 5- Aplicar K-Means definitivo ####################################
 
 # k validado = 5
 kmeans = KMeans(n_clusters=5, random_state=42)
 df_final["cluster"] = kmeans.fit_predict(X_scaled)
 
 
-#################################### 📊 7- Visualización de distribución de clusters ####################################
+#################################### 📊 6- Visualización de distribución de clusters ####################################
 
 # Conteo por cluster
 counts = df_final["cluster"].value_counts().sort_index()
@@ -137,16 +124,19 @@ plt.yticks(fontsize=12)
 sns.despine()
 
 plt.tight_layout()
-plt.savefig("./output/03. K-means/01. distribucion_clusters.png", dpi=300)
-plt.close()
+guardar_figura("./output/03. K-means/01. distribucion_clusters.png", dpi=300)
 
 
-#################################### 💾 8- Exportar resultados ####################################
+#################################### 💾 7- Exportar resultados ####################################
 
-# 8.1 Dataset completo (con variables y cluster asignado)
-df_final.to_csv("./data/procesados/04. clientes_clusterizados.csv", index=False)
+# 7.1 Dataset completo (con variables y cluster asignado). El float32 es solo para la matriz de entrada del
+# clustering: los conteos vuelven a ser enteros y los promedios float64, como antes del almacén de características
+conteos = [c for c in caracteristicas.columnas if c not in COLUMNAS_PROMEDIO]
+df_final[conteos] = df_final[conteos].round().astype(np.int64)
+df_final[COLUMNAS_PROMEDIO] = df_final[COLUMNAS_PROMEDIO].astype(np.float64)
+guardar_artefacto(df_final, "04. clientes_clusterizados", exportar_csv=EXPORTAR_CSV)
 
-# 8.2 Dataset reducido (solo user_id y cluster)
+# 7.2 Dataset reducido (solo user_id y cluster)
 df_final[["user_id", "cluster"]].to_csv("./data/procesados/05. clientes_clusterizados_reducido.csv", index=False)
 
 print("✅ Script ejecutado con éxito. Clusters generados y archivos exportados.")
\ No newline at end of file
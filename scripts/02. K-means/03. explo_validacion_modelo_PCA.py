@@ -32,10 +32,14 @@ import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 import os
+import sys
 
-# 📉 PCA
-from sklearn.decomposition import PCA
-from sklearn.preprocessing import StandardScaler
+# Raíz del repositorio en el path para importar los módulos compartidos (utils/)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from utils.artefactos import leer_artefacto
+from utils.caracteristicas import CaracteristicasClientes
+from utils.figuras import guardar_figura
 
 # 🎨 Estilo visual moderno
 import matplotlib.ticker as mticker
@@ -46,20 +50,13 @@ os.makedirs("./output/03. K-means", exist_ok=True)
 
 #################################### 📥 2. Cargar dataset clusterizado ####################################
 
-# Dataset completo con todas las variables originales y el clúster asignado
-df = pd.read_csv("./data/procesados/04. clientes_clusterizados.csv")
-
-# Separar variables numéricas
-X = df.drop(["user_id", "cluster"], axis=1)
-
-# Escalar las variables para PCA
-scaler = StandardScaler()
-X_scaled = scaler.fit_transform(X)
+# Solo el clúster asignado: las variables ya están escaladas y proyectadas en las características por cliente
+df = leer_artefacto("04. clientes_clusterizados", columnas=["user_id", "cluster"])
 
-#################################### 📉 3. Aplicar PCA para reducción a 2 componentes ####################################
+#################################### 📉 3. PCA (2 componentes) de las características escaladas ####################################
 
-pca = PCA(n_components=2, random_state=42)
-X_pca = pca.fit_transform(X_scaled)
+# Proyección calculada una vez en 00. caracteristicas_clientes.py, en el orden de los clientes de df
+X_pca = CaracteristicasClientes().componentes(df["user_id"])[:, :2]
 
 # Combinar con los clústeres para graficar
 df_pca = pd.DataFrame(X_pca, columns=["PCA1", "PCA2"])
@@ -83,5 +80,4 @@ plt.grid(True, linestyle="--", linewidth=0.5)
 plt.tight_layout()
 
 # 📸 Guardar gráfico
-plt.savefig("./output/03. K-means/01. Exporación del modelo . Distribución de clientes por clúster.png", dpi=300)
-plt.close()
+guardar_figura("./output/03. K-means/01. Exporación del modelo . Distribución de clientes por clúster.png", dpi=300)
@@ -27,10 +27,16 @@
 
 ########################################### 📦 1. Librerías y estilo ###############################################
 
-import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import os
+import sys
+
+# Raíz del repositorio en el path para importar los módulos compartidos (utils/)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from utils.artefactos import leer_artefacto
+from utils.figuras import guardar_figura
 
 # 🎨 Estilo visual moderno y profesional
 sns.set(style="whitegrid", font_scale=1.1)
@@ -42,7 +48,7 @@ os.makedirs("./output/03. K-means", exist_ok=True)
 
 ########################################### 📥 2. Cargar dataset clusterizado ######################################
 
-df = pd.read_csv("./data/procesados/04. clientes_clusterizados.csv")
+df = leer_artefacto("04. clientes_clusterizados")
 
 ##################################### 📊 3. Visualización: Boxplot por clúster #####################################
 
@@ -77,5 +83,4 @@ plt.yticks(fontsize=10)
 plt.tight_layout()
 
 # 💾 Guardar gráfico
-plt.savefig("./output/03. K-means/04. Comportamiento de compra. Número de pedidos por clúster.png", dpi=300)
-plt.show()
+guardar_figura("./output/03. K-means/04. Comportamiento de compra. Número de pedidos por clúster.png", dpi=300)
@@ -9,17 +9,23 @@
 ######################################################################################################
 
 # 1. 📦 Importación de librerías
-import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import os
+import sys
+
+# Raíz del repositorio en el path para importar los módulos compartidos (utils/)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from utils.artefactos import leer_artefacto
+from utils.figuras import guardar_figura
 
 # 2. 🛠️ Configuración general
 sns.set(style="whitegrid", font_scale=1.1)
 os.makedirs("./output/03. K-means", exist_ok=True)
 
 # 3. 📥 Carga del dataset
-df = pd.read_csv("./data/procesados/04. clientes_clusterizados.csv")
+df = leer_artefacto("04. clientes_clusterizados")
 
 # 4. 🔍 Detectar columnas de departamentos
 departamentos = df.columns[6:-1]  # Excluye columnas generales y 'cluster'
@@ -62,5 +68,4 @@ plt.grid(axis="y", linestyle="--", linewidth=0.5)
 plt.tight_layout()
 
 # 10. 💾 Guardar gráfico
-plt.savefig("./output/03. K-means/05.b Preferencias de compra. Departamento más comprado por clúster.png", dpi=300)
-plt.close()
+guardar_figura("./output/03. K-means/05.b Preferencias de compra. Departamento más comprado por clúster.png", dpi=300)
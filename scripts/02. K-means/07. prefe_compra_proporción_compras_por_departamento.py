@@ -28,10 +28,16 @@
 
 #################################### 📦 1. Librerías y configuración ####################################
 
-import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import os
+import sys
+
+# Raíz del repositorio en el path para importar los módulos compartidos (utils/)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from utils.artefactos import leer_artefacto
+from utils.figuras import guardar_figura
 
 # 🎨 Estilo visual moderno
 sns.set(style="whitegrid", font_scale=1.2)
@@ -41,7 +47,7 @@ os.makedirs("./output/03. K-means", exist_ok=True)
 
 #################################### 📥 2. Cargar dataset clusterizado ####################################
 
-df = pd.read_csv("./data/procesados/04. clientes_clusterizados.csv")
+df = leer_artefacto("04. clientes_clusterizados")
 
 #################################### 🧹 3. Seleccionar columnas de departamentos ####################################
 
@@ -135,5 +141,4 @@ plt.tight_layout()
 
 #################################### 💾 7. Guardar gráfico ####################################
 
-plt.savefig("./output/03. K-means/06. Preferencias de compra. Proporción de compras por departamento por clúster.png", dpi=300)
-plt.show()
+guardar_figura("./output/03. K-means/06. Preferencias de compra. Proporción de compras por departamento por clúster.png", dpi=300)
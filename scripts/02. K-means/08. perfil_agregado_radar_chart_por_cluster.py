@@ -27,11 +27,17 @@
 ###################################################################################################################
 
 #################################### 📦 1. Librerías y configuración ####################################
-import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
 import os
+import sys
+
+# Raíz del repositorio en el path para importar los módulos compartidos (utils/)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from utils.artefactos import leer_artefacto
+from utils.figuras import guardar_figura
 
 # 🎨 Estilo visual
 sns.set(style="whitegrid", font_scale=1.1)
@@ -40,7 +46,7 @@ sns.set(style="whitegrid", font_scale=1.1)
 os.makedirs("./output/03. K-means", exist_ok=True)
 
 #################################### 📥 2. Cargar dataset clusterizado ####################################
-df = pd.read_csv("./data/procesados/04. clientes_clusterizados.csv")
+df = leer_artefacto("04. clientes_clusterizados")
 
 #################################### 🧮 3. Selección de variables para el radar chart ####################################
 # 🔢 Columnas que se usarán en el gráfico radar
@@ -114,5 +120,4 @@ plt.tight_layout()
 
 
 # 💾 Guardar
-plt.savefig("./output/03. K-means/07. Perfil agregado. Radar Chart por clúster.png", dpi=300)
-plt.show()
+guardar_figura("./output/03. K-means/07. Perfil agregado. Radar Chart por clúster.png", dpi=300)
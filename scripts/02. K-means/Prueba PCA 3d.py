@@ -1,22 +1,20 @@
+import os
+import sys
 import pandas as pd
 import numpy as np
-from sklearn.preprocessing import StandardScaler
-from sklearn.decomposition import PCA
 import plotly.express as px
 
-# 1. Cargar dataset clusterizado
-df = pd.read_csv("./data/procesados/04. clientes_clusterizados.csv")
+# Raíz del repositorio en el path para importar los módulos compartidos (utils/)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
 
-# 2. Separar variables (sin user_id ni cluster)
-X = df.drop(["user_id", "cluster"], axis=1)
+from utils.artefactos import leer_artefacto
+from utils.caracteristicas import CaracteristicasClientes
 
-# 3. Escalar variables
-scaler = StandardScaler()
-X_scaled = scaler.fit_transform(X)
+# 1. Cargar el clúster de cada cliente
+df = leer_artefacto("04. clientes_clusterizados", columnas=["user_id", "cluster"])
 
-# 4. PCA a 3 componentes
-pca_3d = PCA(n_components=3, random_state=42)
-X_pca_3d = pca_3d.fit_transform(X_scaled)
+# 2-4. PCA a 3 componentes de las variables escaladas (ya calculado en 00. caracteristicas_clientes.py)
+X_pca_3d = CaracteristicasClientes().componentes(df["user_id"])
 
 df_pca_3d = pd.DataFrame(X_pca_3d, columns=["PCA1", "PCA2", "PCA3"])
 df_pca_3d["cluster"] = df["cluster"]
@@ -23,62 +23,39 @@
 ###################################################################################################################
 # SALIDA DEL SCRIPT
 # -------------------------------------------------------------------------------------------------
-# 📤 data/procesados/06. reglas_apriori_por_cluster.csv
+# 📤 data/procesados/01b. almacen_transacciones/cluster.npy
+#    (clúster de cada orden, como arreglo lateral del almacén binario de transacciones)
 ###################################################################################################################
 
 #################################### 📦 1. Librerías ####################################
 
-import pandas as pd
+import numpy as np
 import os
+import sys
 
-# 📁 Crear carpeta de salida
-os.makedirs("./data/procesados", exist_ok=True)
+# Raíz del repositorio en el path para importar los módulos compartidos (utils/)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
 
-#################################### 📥 2. Cargar datasets base ####################################
-
-# 🛒 Relación orden-producto
-df_op = pd.read_csv("./data/datos/order_products__prior.csv")
-
-# 👥 Información de órdenes
-df_orders = pd.read_csv("./data/datos/orders.csv")
-
-# 📦 Productos (para nombres)
-df_products = pd.read_csv("./data/datos/products.csv")
-
-# 🧬 Clúster de cada usuario
-df_clusters = pd.read_csv("./data/procesados/04. clientes_clusterizados.csv")
-
-#################################### 🔗 3. Unión de datos ####################################
+from utils.artefactos import leer_artefacto
+from utils.transacciones import AlmacenTransacciones
 
-#################################### 🔁 3. Unión de datos con control de usuarios válidos ####################################
-
-# 🧼 Filtrar solo órdenes donde user_id está presente
-df_orders = df_orders.dropna(subset=["user_id"])
-
-# 🎯 Filtrar solo usuarios que aparecen en los clústeres
-usuarios_validos = df_clusters["user_id"].unique()
-df_orders = df_orders[df_orders["user_id"].isin(usuarios_validos)]
-
-# 🔗 Unir orden-producto con órdenes (para obtener user_id)
-df_op = df_op.merge(df_orders[["order_id", "user_id"]], on="order_id", how="inner")
-
-# 🔗 Agregar clúster de cada usuario
-df_op = df_op.merge(df_clusters[["user_id", "cluster"]], on="user_id", how="inner")
+#################################### 📥 2. Cargar datasets base ####################################
 
-# 🔗 Agregar nombre del producto
-df_op = df_op.merge(df_products[["product_id", "product_name"]], on="product_id", how="left")
+# 🛒 Cestas por orden (almacén CSR generado en el preprocesamiento, con user_id como arreglo lateral)
+almacen = AlmacenTransacciones()
 
-#################################### 🧹 4. Agrupación final de transacciones por clúster ####################################
+# 🧬 Clúster de cada usuario (solo las dos columnas necesarias)
+df_clusters = leer_artefacto("04. clientes_clusterizados", columnas=["user_id", "cluster"])
 
-# 🧼 Filtrar columnas necesarias
-df_apriori_cluster = df_op[["order_id", "cluster", "product_name"]].dropna()
+#################################### 🔁 3. Asignación de clúster a cada orden ####################################
 
-# 📊 Agrupar productos por orden y clúster
-df_grouped = df_apriori_cluster.groupby(["cluster", "order_id"])["product_name"].apply(list).reset_index()
+# 🎯 Solo los usuarios que aparecen en los clústeres reciben clúster; el resto de las órdenes queda en -1.
+# Las cestas no se copian ni se reagrupan: las etapas siguientes filtran el almacén por este arreglo.
+almacen.asignar_clusters(df_clusters["user_id"].to_numpy(), df_clusters["cluster"].to_numpy())
 
-# ✅ Exportar
-df_grouped.to_csv("./data/procesados/06. transacciones_apriori_por_cluster.csv", index=False)
-print("✅ Archivo corregido y exportado: 06. transacciones_apriori_por_cluster.csv")
+#################################### 🧹 4. Resumen de transacciones por clúster ####################################
 
-prueba = pd.read_csv("./data/procesados/06. transacciones_apriori_por_cluster.csv")
-print(prueba["cluster"].value_counts())
\ No newline at end of file
+clusters, conteos = np.unique(almacen.cluster[almacen.cluster >= 0], return_counts=True)
+print("✅ Clúster asignado a cada orden en: 01b. almacen_transacciones/cluster.npy")
+for cluster_id, n in zip(clusters, conteos):
+    print(f"   Clúster {cluster_id}: {n:,} órdenes")
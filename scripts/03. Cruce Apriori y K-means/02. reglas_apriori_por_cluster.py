@@ -1,63 +1,134 @@
 ###################################################################################################################
-############### 07. Cruce Apriori y K-means - Reglas de asociación por clúster (con muestreo aleatorio) ##########
+############### 07. Cruce Apriori y K-means - Reglas de asociación por clúster (todas sus órdenes) ##############
 ###################################################################################################################
 
-from mlxtend.frequent_patterns import apriori, association_rules
-from mlxtend.preprocessing import TransactionEncoder
-import pandas as pd
+from mlxtend.frequent_patterns import association_rules
+import numpy as np
 import os
-import ast
+import pandas as pd
+import sys
+
+# Raíz del repositorio en el path para importar los módulos compartidos (utils/, mineria/)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from utils.artefactos import guardar_artefacto
+from utils.reglas_codificadas import guardar_reglas
+from utils.transacciones import AlmacenTransacciones
+from mineria.codificacion import codificar_disperso
+from mineria.cerrados import reglas_no_redundantes
+from mineria.incremental import guardar_estado
+from mineria.motores import conjuntos_frecuentes
+from mineria.muestreo import muestreo_progresivo
+from mineria.reglas import reglas_top_k
+from mineria.significancia import agregar_significancia
 
 # 📁 Crear carpeta si no existe
 os.makedirs("./data/procesados", exist_ok=True)
 
-# 📥 Cargar dataset
-df = pd.read_csv("./data/procesados/06. transacciones_apriori_por_cluster.csv")
-
-# 🎯 Tamaño de muestra por clúster
-N_MUESTRA = 10000  # Puedes ajustar este valor
-
-# 🔁 Iterar por cada clúster
-for cluster_id in sorted(df["cluster"].unique()):
-    print(f"\n🔍 Procesando clúster {cluster_id}...")
-
-    # 📄 Filtrar las transacciones del clúster
-    df_cluster = df[df["cluster"] == cluster_id].copy()
-
-    # 🧪 Aplicar muestreo aleatorio
-    df_muestra = df_cluster.sample(n=min(N_MUESTRA, len(df_cluster)), random_state=42)
-
-    # 🧼 Convertir strings a listas
-    transacciones = df_muestra["product_name"].apply(ast.literal_eval).tolist()
-
-    if len(transacciones) == 0:
-        print(f"⚠️ Sin transacciones para clúster {cluster_id}, se omite.")
-        continue
-
-    # 🧠 Binarizar con TransactionEncoder
-    try:
-        te = TransactionEncoder()
-        df_bin = pd.DataFrame(te.fit(transacciones).transform(transacciones), columns=te.columns_)
-    except MemoryError as e:
-        print(f"❌ Error de memoria en clúster {cluster_id}: {e}")
-        continue
-
-    # 📊 Apriori
-    itemsets = apriori(df_bin, min_support=0.005, use_colnames=True)
-
-    if itemsets.empty:
-        print(f"⚠️ Sin itemsets frecuentes en clúster {cluster_id}.")
-        continue
-
-    reglas = association_rules(itemsets, metric="confidence", min_threshold=0.15)
-
-    if reglas.empty:
-        print(f"⚠️ Sin reglas generadas para clúster {cluster_id}.")
-        continue
-
-    reglas["cluster"] = cluster_id
-
-    # 💾 Guardar reglas por clúster
-    output_path = f"./data/procesados/07. reglas_apriori_cluster_{cluster_id}.csv"
-    reglas.to_csv(output_path, index=False)
-    print(f"✅ Reglas guardadas en {output_path}")
+# Las reglas se guardan en Parquet; el CSV queda como salida opcional
+EXPORTAR_CSV = False
+
+# ⚙️ Motor de minería (ver mineria/motores.py). Con la codificación dispersa ya no hace falta muestrear:
+# se minan todas las órdenes de cada clúster. dEclat (tid-lists en bits + diffsets) está pensado para este
+# tamaño de problema; "fpgrowth" y "mlxtend" siguen disponibles (comparación en 02.1 benchmark_motores.py).
+MOTOR = "declat"
+
+# Soporte mínimo dentro de cada clúster
+MIN_SUPPORT = 0.005
+
+# 🎲 Muestreo progresivo (mineria/muestreo.py): cada clúster usa solo las órdenes que necesita para que el error
+# de los soportes sea ≤ EPSILON con CONFIANZA, en lugar de todas sus órdenes
+MUESTREO_PROGRESIVO = False
+EPSILON = 0.002
+CONFIANZA = 0.95
+
+# 🏆 Top-k (mineria/reglas.py): en lugar de todas las reglas con confianza ≥ 0.15, solo las TOP_K mejores de cada
+# clúster por METRICA_TOP_K ("lift" o "confidence"), sin generar la tabla completa. None = todas las reglas.
+# El gráfico "05. top_reglas_por_cluster.py" usa las 5 mejores por elevación de cada clúster.
+TOP_K = None
+METRICA_TOP_K = "lift"
+
+# ✂️ Reglas no redundantes (mineria/cerrados.py): solo la base min-max con confianza ≥ 0.15, generada desde los
+# conjuntos cerrados de cada clúster. Las demás reglas se deducen de ellas.
+REGLAS_NO_REDUNDANTES = False
+
+# 📐 Significancia (mineria/significancia.py): cada regla lleva p_value (prueba exacta de Fisher o χ²) y q_value
+# (Benjamini–Hochberg). Con ALFA_SIGNIFICANCIA se descartan las reglas con q_value > alfa; None = se guardan todas.
+PRUEBA_SIGNIFICANCIA = "fisher"
+ALFA_SIGNIFICANCIA = None
+
+# 🧵 Procesos para minar cada clúster (1 = secuencial, -1 = todos los núcleos; ver mineria/paralelo.py)
+N_JOBS = -1
+
+# Guard para spawn (Windows): los procesos de minería reimportan este script
+if __name__ == "__main__":
+    # 📥 Cargar almacén de transacciones (el cruce ya asignó el clúster de cada orden)
+    almacen = AlmacenTransacciones()
+
+    # Tamaño de muestra y cota alcanzada por clúster (solo con MUESTREO_PROGRESIVO)
+    informes = []
+
+    # 🔁 Iterar por cada clúster
+    for cluster_id in np.unique(almacen.cluster[almacen.cluster >= 0]):
+        print(f"\n🔍 Procesando clúster {cluster_id}...")
+
+        # 📄 Órdenes del clúster
+        ordenes_cluster = almacen.ordenes_de_cluster(cluster_id)
+
+        if len(ordenes_cluster) == 0:
+            print(f"⚠️ Sin transacciones para clúster {cluster_id}, se omite.")
+            continue
+
+        # 🧠 Cestas del clúster (CSR compacto copiado desde el almacén)
+        offsets, productos = almacen.subconjunto(ordenes_cluster)
+
+        # 📊 Conjuntos frecuentes
+        if MUESTREO_PROGRESIVO:
+            itemsets, informe = muestreo_progresivo(offsets, productos, MIN_SUPPORT, EPSILON, CONFIANZA,
+                                                    motor=MOTOR, n_jobs=N_JOBS)
+            informes.append({"cluster": cluster_id, **informe})
+            print(f"🎯 {informe['ordenes_muestra']:,} de {len(ordenes_cluster):,} órdenes → {len(itemsets):,} "
+                  f"conjuntos frecuentes (|error de soporte| ≤ {informe['cota_epsilon']:.5f}, "
+                  f"{'garantizada' if informe['garantizada'] else 'cota heurística'})")
+        else:
+            # One-hot disperso de todas las órdenes del clúster
+            matriz = codificar_disperso(offsets, productos, almacen.n_codigos)
+            itemsets = conjuntos_frecuentes(matriz, min_support=MIN_SUPPORT, motor=MOTOR, n_jobs=N_JOBS)
+            print(f"🌳 {len(ordenes_cluster):,} órdenes → {len(itemsets):,} conjuntos frecuentes")
+
+            # 💾 Estado para la actualización incremental (códigos de producto y cuentas)
+            guardar_estado(itemsets, f"07a. itemsets_apriori_cluster_{cluster_id}", len(ordenes_cluster),
+                           MIN_SUPPORT)
+
+        if itemsets.empty:
+            print(f"⚠️ Sin itemsets frecuentes en clúster {cluster_id}.")
+            continue
+
+        if TOP_K:
+            reglas = reglas_top_k(itemsets, TOP_K, METRICA_TOP_K, min_confianza=0.15)
+        elif REGLAS_NO_REDUNDANTES:
+            reglas = reglas_no_redundantes(itemsets, min_confianza=0.15)
+        else:
+            reglas = association_rules(itemsets, metric="confidence", min_threshold=0.15)
+
+        n_minadas = informe["ordenes_muestra"] if MUESTREO_PROGRESIVO else len(ordenes_cluster)
+        reglas = agregar_significancia(reglas, n_minadas, PRUEBA_SIGNIFICANCIA, ALFA_SIGNIFICANCIA)
+
+        if reglas.empty:
+            print(f"⚠️ Sin reglas generadas para clúster {cluster_id}.")
+            continue
+
+        reglas["cluster"] = cluster_id
+
+        # 💾 Guardar reglas por clúster (productos como códigos, ver utils/reglas_codificadas.py)
+        output_path = guardar_reglas(reglas, f"07. reglas_apriori_cluster_{cluster_id}", exportar_csv=EXPORTAR_CSV)
+        print(f"✅ Reglas guardadas en {output_path}")
+
+    # 📋 Resumen del muestreo: cuántas órdenes necesitó cada clúster
+    if informes:
+        resumen = pd.DataFrame(informes)
+        print("\n🎲 Muestreo progresivo por clúster:")
+        print(resumen[["cluster", "ordenes_muestra", "ordenes_total", "fraccion", "cota_epsilon", "garantizada",
+                       "conjuntos"]]
+              .to_string(index=False))
+        guardar_artefacto(resumen, "07m. muestreo_reglas_por_cluster", exportar_csv=EXPORTAR_CSV)
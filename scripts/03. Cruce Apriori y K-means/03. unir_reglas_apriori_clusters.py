@@ -19,34 +19,53 @@
 ###################################################################################################################
 # SALIDA DEL SCRIPT
 # -------------------------------------------------------------------------------------------------
-# 📤 ./data/procesados/08. resumen_reglas_apriori_clusters.csv
+# 📤 ./data/procesados/08. resumen_reglas_apriori_clusters.parquet
 ###################################################################################################################
 
 #################################### 📦 1. Librerías y configuración ####################################
 
 import pandas as pd
 import os
+import sys
 from glob import glob
 
+# Raíz del repositorio en el path para importar los módulos compartidos (utils/)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from utils.reglas_codificadas import guardar_reglas, leer_reglas, reglas_vacias
+
 # 📁 Crear carpeta de salida si no existe
 os.makedirs("./data/procesados", exist_ok=True)
 
+# El resumen se guarda en Parquet; el CSV queda como salida opcional
+EXPORTAR_CSV = False
+
 #################################### 📥 2. Cargar archivos de reglas por clúster ####################################
 
-# 🧠 Todos los archivos CSV de reglas individuales
-archivos = glob("./data/procesados/07. reglas_apriori_cluster_*.csv")
+# 🧠 Todos los artefactos de reglas individuales (productos como códigos, ver utils/reglas_codificadas.py)
+archivos = glob("./data/procesados/07. reglas_apriori_cluster_*.parquet")
+nombres = sorted(os.path.splitext(os.path.basename(a))[0] for a in archivos)
 
 # 📊 Unir en un solo DataFrame
-df_total = pd.DataFrame()
+partes = []
 
-for archivo in archivos:
-    cluster_id = int(os.path.basename(archivo).split("_")[-1].replace(".csv", ""))
-    df = pd.read_csv(archivo)
+for nombre in nombres:
+    cluster_id = int(nombre.split("_")[-1])
+    df = leer_reglas(nombre)
     df["cluster"] = cluster_id
-    df_total = pd.concat([df_total, df], ignore_index=True)
+    partes.append(df)
+
+if partes:
+    df_total = pd.concat(partes, ignore_index=True)
+else:
+    # Sin reglas por clúster (02. reglas_apriori_por_cluster.py no corrió o no encontró reglas): resumen vacío con
+    # las mismas columnas y tipos que uno con reglas, para que los lectores no fallen
+    print("⚠️ No hay archivos 07. reglas_apriori_cluster_*.parquet: el resumen queda sin reglas")
+    df_total = reglas_vacias()
+    df_total["cluster"] = pd.Series(dtype="int64")
 
 #################################### 💾 3. Guardar resultado unificado ####################################
 
-df_total.to_csv("./data/procesados/08. resumen_reglas_apriori_clusters.csv", index=False)
+destino = guardar_reglas(df_total, "08. resumen_reglas_apriori_clusters", exportar_csv=EXPORTAR_CSV)
 
-print("✅ Reglas consolidadas guardadas en ./data/procesados/08. resumen_reglas_apriori_clusters.csv")
+print(f"✅ Reglas consolidadas guardadas en {destino}")
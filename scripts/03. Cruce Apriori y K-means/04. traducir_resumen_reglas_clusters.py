@@ -5,131 +5,43 @@
 ###################################################################################################################
 ###################################################################################################################
 
-import pandas as pd
-import re
-from deep_translator import GoogleTranslator
+# Las reglas guardan los productos como códigos (utils/reglas_codificadas.py): basta el diccionario de los
+# productos que aparecen en el resumen, buscados por código en el catálogo traducido (01. A priori/01.1
+# traduccion_catalogo.py), y 05/06 leen las reglas con ese diccionario.
+#
+# 📤 ./data/procesados/08T. diccionario_productos_clusters.parquet
 
-###################################################################################################################
-# 1. Configuración del traductor
-###################################################################################################################
-
-translator = GoogleTranslator(source="en", target="es")
-
-def traducir_texto(texto: str) -> str:
-    """
-    Traduce una cadena del inglés al español.
-    Si falla, devuelve el texto original.
-    """
-    try:
-        return translator.translate(texto)
-    except Exception:
-        return texto  # fallback en caso de error en la API
-
-
-###################################################################################################################
-# 2. Cargar archivo original
-###################################################################################################################
-
-input_file = "./data/procesados/08. resumen_reglas_apriori_clusters.csv"
-output_file = "./data/procesados/08T. resumen_reglas_apriori_clusters_traducido.csv"
-
-df = pd.read_csv(input_file)
-
-
-###################################################################################################################
-# 3. Traducir nombres de columnas
-###################################################################################################################
-
-map_columnas = {
-    "antecedents": "antecedentes",
-    "consequents": "consecuentes",
-    "antecedent support": "soporte antecedente",
-    "consequent support": "soporte consecuente",
-    "support": "soporte",
-    "confidence": "confianza",
-    "lift": "elevacion",
-    "representativity": "representatividad",
-    "leverage": "apalancamiento",
-    "conviction": "conviccion",
-    "zhangs_metric": "metrica_zhang",
-    "jaccard": "jaccard",
-    "certainty": "certeza",
-    "kulczynski": "kulczynski",
-    "cluster": "cluster"
-}
-
-df.rename(columns=map_columnas, inplace=True)
+import os
+import sys
 
+# Raíz del repositorio en el path para importar los módulos compartidos (utils/)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
 
-###################################################################################################################
-# 4. Extraer todos los textos de los frozenset
-###################################################################################################################
-
-columnas_sets = ["antecedentes", "consecuentes"]
-
-todos_los_items = set()
-
-# Extrae lo que está entre comillas simples dentro de los frozenset
-patron = re.compile(r"'(.*?)'")
-
-for col in columnas_sets:
-    if col in df.columns:
-        for valor in df[col].dropna():
-            valor_str = str(valor)
-            items = patron.findall(valor_str)
-            for it in items:
-                todos_los_items.add(it)
-
-
-###################################################################################################################
-# 5. Crear diccionario de traducciones automáticas
-###################################################################################################################
-
-map_traducciones = {}
-
-for item in todos_los_items:
-    traduccion = traducir_texto(item)
-    map_traducciones[item] = traduccion
-
+from utils.artefactos import guardar_artefacto
+from utils.reglas_codificadas import codigos_en_reglas
+from utils.traduccion import diccionario_productos
 
 ###################################################################################################################
-# 6. Función para traducir frozensets
+# 1. Cargar códigos de producto del resumen
 ###################################################################################################################
 
-def traducir_frozenset(celda):
-    """
-    Recibe algo como "frozenset({'Banana', 'Apple'})"
-    y devuelve "frozenset({'Banana', 'Manzana'})"
-    usando map_traducciones.
-    """
-    if not isinstance(celda, str):
-        celda = str(celda)
-
-    if "frozenset" not in celda:
-        return celda
-
-    items = patron.findall(celda)
-    if not items:
-        return celda
-
-    items_traducidos = [map_traducciones.get(it, it) for it in items]
+input_file = "08. resumen_reglas_apriori_clusters"     # artefacto de reglas (productos como códigos)
+output_file = "08T. diccionario_productos_clusters"    # diccionario de productos traducido
 
-    interior = ", ".join(f"'{it}'" for it in items_traducidos)
-    return f"frozenset({{{interior}}})"
+codigos = codigos_en_reglas(input_file)
 
 
 ###################################################################################################################
-# 7. Aplicar traducción a columnas de sets
+# 2. Buscar sus nombres en el catálogo traducido
 ###################################################################################################################
 
-for col in columnas_sets:
-    if col in df.columns:
-        df[col] = df[col].apply(traducir_frozenset)
+# Los que el catálogo aún no tiene traducidos pasan por el traductor con caché (utils/traduccion.py)
+diccionario = diccionario_productos(codigos)
 
 
 ###################################################################################################################
-# 8. Guardar archivo traducido
+# 3. Guardar diccionario traducido
 ###################################################################################################################
 
-df.to_csv(output_file, index=False, encoding="utf-8-sig")
-print(f"✅ Archivo traducido correctamente → {output_file}")
+destino = guardar_artefacto(diccionario, output_file)
+print(f"✅ {len(diccionario):,} productos traducidos correctamente → {destino}")
@@ -7,27 +7,26 @@
 
 ################################# 1. Importar librerías #################################
 
-import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.ticker as mticker
 import seaborn as sns
+import os
+import sys
 
+# Raíz del repositorio en el path para importar los módulos compartidos (utils/)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
 
-################################# 2. Cargar archivo traducido #################################
+from utils.reglas_codificadas import leer_reglas_traducidas
+from utils.figuras import guardar_figura
 
-ruta_resumen = "./data/procesados/08T. resumen_reglas_apriori_clusters_traducido.csv"
-reglas = pd.read_csv(ruta_resumen)
 
+################################# 2. Cargar reglas con el diccionario traducido #################################
 
-################################# 3. Convertir frozenset a texto limpio #################################
+# Productos como códigos + diccionario traducido: antecedentes / consecuentes llegan como texto "A, B"
+reglas = leer_reglas_traducidas("08. resumen_reglas_apriori_clusters", "08T. diccionario_productos_clusters")
 
-def formatear_productos(fs):
-    if isinstance(fs, str):
-        fs = eval(fs)
-    return ", ".join(fs)
 
-reglas["antecedentes"] = reglas["antecedentes"].apply(formatear_productos)
-reglas["consecuentes"] = reglas["consecuentes"].apply(formatear_productos)
+################################# 3. Texto de cada regla #################################
 
 reglas["regla"] = reglas["antecedentes"] + " → " + reglas["consecuentes"]
 
@@ -120,7 +119,6 @@ plt.tight_layout()
 ################################# 7. Guardar gráfico #################################
 
 output_path = "./output/04. Cruce A priori y K-means/01. Top reglas por clúster.png"
-plt.savefig(output_path, dpi=300)
-plt.close()
+guardar_figura(output_path, dpi=300)
 
 print(f"✅ Gráfico guardado en: {output_path}")
@@ -2,24 +2,26 @@
 ######################## Red Reducida por Clúster (08T traducido – versión mejorada con título y legibilidad) #####
 ###################################################################################################################
 
-import pandas as pd
+import numpy as np
 import networkx as nx
 import matplotlib.pyplot as plt
 import os
+import sys
 
-input_file = "./data/procesados/08T. resumen_reglas_apriori_clusters_traducido.csv"
-output_dir = "./output/04. Cruce A priori y K-means"
-os.makedirs(output_dir, exist_ok=True)
+# Raíz del repositorio en el path para importar los módulos compartidos (utils/)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
 
-df = pd.read_csv(input_file)
+from utils.reglas_codificadas import leer_reglas_traducidas
+from utils.figuras import guardar_figura
+from utils.disposicion import disposicion
+from utils.red_reglas import red_reglas
 
-def convertir_frozenset(fs):
-    if isinstance(fs, str):
-        fs = eval(fs)
-    return list(fs)
+output_dir = "./output/04. Cruce A priori y K-means"
+os.makedirs(output_dir, exist_ok=True)
 
-df["antecedentes"] = df["antecedentes"].apply(convertir_frozenset)
-df["consecuentes"] = df["consecuentes"].apply(convertir_frozenset)
+# Productos como códigos + diccionario traducido: "<lado>_items" trae los productos de cada lado
+df = leer_reglas_traducidas("08. resumen_reglas_apriori_clusters", "08T. diccionario_productos_clusters",
+                 listas=True)
 
 clusters = sorted(df["cluster"].unique())
 
@@ -35,43 +37,20 @@ for cluster_id in clusters:
         print(f"Clúster {cluster_id} no tiene reglas fuertes.")
         continue
 
-    reglas["antecedentes_str"] = reglas["antecedentes"].apply(lambda x: ", ".join(x))
-    reglas["consecuentes_str"] = reglas["consecuentes"].apply(lambda x: ", ".join(x))
-
-    G = nx.DiGraph()
-
-    for _, fila in reglas.iterrows():
-        for ant in fila["antecedentes"]:
-            for cons in fila["consecuentes"]:
-                G.add_edge(ant, cons, weight=fila["elevacion"])
-
-    antecedentes_set = set([x for sub in reglas["antecedentes"] for x in sub])
-    consecuentes_set = set([x for sub in reglas["consecuentes"] for x in sub])
-
-    node_colors = []
-    for nodo in G.nodes():
-        if nodo in antecedentes_set and nodo in consecuentes_set:
-            node_colors.append("#82E0AA")
-        elif nodo in antecedentes_set:
-            node_colors.append("#85C1E9")
-        else:
-            node_colors.append("#F5B041")
+    # Un nodo por producto: aristas antecedente × consecuente, rol y elevación máxima (utils/red_reglas.py)
+    red = red_reglas(reglas, por_item=True)
+    G = red.grafo()
 
-    node_sizes = []
-    for nodo in G.nodes():
-        lifts = []
-        lifts += reglas[reglas["antecedentes_str"].str.contains(nodo, regex=False)]["elevacion"].tolist()
-        lifts += reglas[reglas["consecuentes_str"].str.contains(nodo, regex=False)]["elevacion"].tolist()
+    # azul → antecedente, naranja → consecuente, verde → ambos roles (orden de ROLES)
+    node_colors = np.array(["#85C1E9", "#F5B041", "#82E0AA"])[red.rol].tolist()
 
-        max_lift = max(lifts) if lifts else 1
-        size = min(max_lift * 900, 5000)  # 🔥 límite para evitar monstruos gigantes
-        node_sizes.append(size)
+    node_sizes = np.minimum(red.max_lift * 900, 5000).tolist()  # 🔥 límite para evitar monstruos gigantes
 
-    # 🔥 Layout adaptativo
+    # 🔥 Layout adaptativo (caché de disposiciones: cada clúster se calcula una vez)
     if len(G.nodes()) <= 25:
-        pos = nx.kamada_kawai_layout(G)
+        pos = disposicion(G, "kamada_kawai")
     else:
-        pos = nx.spring_layout(G, k=0.8, iterations=50, seed=42)
+        pos = disposicion(G, "spring", k=0.8, iterations=50, seed=42)
 
     # 🔥 Resolución más alta
     plt.figure(figsize=(16, 12))
@@ -106,7 +85,6 @@ for cluster_id in clusters:
     plt.tight_layout()
 
     output_path = os.path.join(output_dir, f"03T. Red por clúster {cluster_id}.png")
-    plt.savefig(output_path, dpi=350)
-    plt.close()
+    guardar_figura(output_path, dpi=350)
 
     print(f"🚀 Red reducida del clúster {cluster_id} guardada en: {output_path}")
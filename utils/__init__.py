@@ -0,0 +1,7 @@
+"""
+Módulos compartidos por los scripts del pipeline (scripts/) y el dashboard (pages/).
+
+Los scripts se ejecutan desde la raíz del repositorio, por ejemplo:
+    python "scripts/01. A priori/01. preprocessing.py"
+y agregan la raíz al sys.path para poder importar este paquete.
+"""
@@ -0,0 +1,155 @@
+###################################################################################################################
+################################ Artefactos intermedios en formato columnar (Parquet) #############################
+###################################################################################################################
+
+# Cada etapa del pipeline le entregaba a la siguiente un CSV de decenas de millones de filas de texto,
+# que luego había que volver a parsear completo. Este módulo guarda los datasets intermedios como Parquet:
+# - compresión zstd
+# - codificación por diccionario (las columnas category se leen de vuelta como category)
+# - proyección de columnas al leer (solo se decodifican las columnas pedidas)
+#
+# Las columnas con frozenset (antecedents/consequents de mlxtend) se guardan como listas y se reconstruyen
+# al leer. El CSV queda solo como salida lateral opcional (exportar_csv=True).
+
+import json
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+RUTA_PROCESADOS = "./data/procesados/"
+
+# Clave de metadatos donde se anotan las columnas que originalmente eran frozenset
+CLAVE_CONJUNTOS = b"columnas_frozenset"
+
+
+def ruta_artefacto(nombre: str, ruta: str = RUTA_PROCESADOS, extension: str = "parquet") -> str:
+    """
+    Ruta del artefacto, por ejemplo "01. transacciones_apriori" → ./data/procesados/01. transacciones_apriori.parquet
+    """
+    return os.path.join(ruta, f"{nombre}.{extension}")
+
+
+def existe_artefacto(nombre: str, ruta: str = RUTA_PROCESADOS) -> bool:
+    """
+    True si el artefacto existe en Parquet o, como respaldo, en CSV.
+    """
+    return os.path.exists(ruta_artefacto(nombre, ruta)) or os.path.exists(ruta_artefacto(nombre, ruta, "csv"))
+
+
+def _es_columna_de_conjuntos(serie: pd.Series) -> bool:
+    if serie.dtype != object or serie.empty:
+        return False
+    primero = serie.dropna()
+    return not primero.empty and isinstance(primero.iloc[0], (set, frozenset))
+
+
+def guardar_artefacto(df: pd.DataFrame, nombre: str, ruta: str = RUTA_PROCESADOS,
+                      exportar_csv: bool = False, esquema: pa.Schema = None) -> str:
+    """
+    Guarda df como Parquet comprimido y codificado por diccionario. Devuelve la ruta escrita.
+    Si exportar_csv=True también escribe el CSV tradicional al lado (mismo nombre, extensión .csv).
+    esquema fija los tipos de Arrow (ej. listas en una tabla vacía, donde no se pueden inferir).
+    """
+    os.makedirs(ruta, exist_ok=True)
+
+    conjuntos = [col for col in df.columns if _es_columna_de_conjuntos(df[col])]
+    df_arrow = df.copy() if conjuntos else df
+    for col in conjuntos:
+        df_arrow[col] = df_arrow[col].apply(lambda s: sorted(s) if isinstance(s, (set, frozenset)) else s)
+
+    tabla = pa.Table.from_pandas(df_arrow, schema=esquema, preserve_index=False)
+    if conjuntos:
+        metadatos = dict(tabla.schema.metadata or {})
+        metadatos[CLAVE_CONJUNTOS] = json.dumps(conjuntos).encode("utf-8")
+        tabla = tabla.replace_schema_metadata(metadatos)
+
+    destino = ruta_artefacto(nombre, ruta)
+    temporal = destino + ".tmp"
+    pq.write_table(tabla, temporal, compression="zstd", use_dictionary=True)
+    os.replace(temporal, destino)
+
+    if exportar_csv:
+        df.to_csv(ruta_artefacto(nombre, ruta, "csv"), index=False)
+
+    return destino
+
+
+class EscritorArtefacto:
+    """
+    Escritura incremental de un artefacto Parquet: cada llamada a escribir() agrega un row group.
+    Todos los bloques deben tener las mismas columnas y tipos (las category con las mismas categorías).
+    """
+
+    def __init__(self, nombre: str, ruta: str = RUTA_PROCESADOS, exportar_csv: bool = False):
+        os.makedirs(ruta, exist_ok=True)
+        self.destino = ruta_artefacto(nombre, ruta)
+        self.temporal = self.destino + ".tmp"
+        self.ruta_csv = ruta_artefacto(nombre, ruta, "csv") if exportar_csv else None
+        self.escritor = None
+        self.filas = 0
+
+    def escribir(self, df: pd.DataFrame) -> None:
+        tabla = pa.Table.from_pandas(df, preserve_index=False)
+        if self.escritor is None:
+            self.escritor = pq.ParquetWriter(self.temporal, tabla.schema, compression="zstd", use_dictionary=True)
+        self.escritor.write_table(tabla)
+        if self.ruta_csv:
+            df.to_csv(self.ruta_csv, index=False, mode="w" if self.filas == 0 else "a", header=self.filas == 0)
+        self.filas += len(df)
+
+    def cerrar(self) -> str:
+        if self.escritor is not None:
+            self.escritor.close()
+            os.replace(self.temporal, self.destino)
+        return self.destino
+
+
+# Tablas Parquet ya leídas en este proceso (ver activar_cache_lectura)
+_CACHE_TABLAS = None
+
+
+def activar_cache_lectura() -> None:
+    """
+    Guarda en memoria las tablas Arrow leídas, por archivo, fecha de modificación y columnas. La usa el renderizador
+    de figuras (utils/figuras.py): los scripts que corren en un mismo proceso leen cada entrada una sola vez.
+    Las tablas Arrow son inmutables; cada lectura arma su propio DataFrame.
+    """
+    global _CACHE_TABLAS
+    if _CACHE_TABLAS is None:
+        _CACHE_TABLAS = {}
+
+
+def leer_parquet(destino: str, columnas: list = None) -> pa.Table:
+    """
+    pq.read_table, a través de la caché del proceso si está activa.
+    """
+    if _CACHE_TABLAS is None:
+        return pq.read_table(destino, columns=columnas)
+    clave = (os.path.abspath(destino), os.stat(destino).st_mtime_ns, None if columnas is None else tuple(columnas))
+    if clave not in _CACHE_TABLAS:
+        _CACHE_TABLAS[clave] = pq.read_table(destino, columns=columnas)
+    return _CACHE_TABLAS[clave]
+
+
+def leer_artefacto(nombre: str, columnas: list = None, ruta: str = RUTA_PROCESADOS) -> pd.DataFrame:
+    """
+    Lee el artefacto proyectando solo las columnas pedidas.
+    Si todavía no existe el Parquet (resultados antiguos del repositorio) lee el CSV equivalente.
+    """
+    destino = ruta_artefacto(nombre, ruta)
+
+    if not os.path.exists(destino):
+        return pd.read_csv(ruta_artefacto(nombre, ruta, "csv"), usecols=columnas)
+
+    tabla = leer_parquet(destino, columnas)
+    df = tabla.to_pandas()
+
+    metadatos = tabla.schema.metadata or {}
+    if CLAVE_CONJUNTOS in metadatos:
+        for col in json.loads(metadatos[CLAVE_CONJUNTOS]):
+            if col in df.columns:
+                df[col] = df[col].apply(lambda v: frozenset(v) if v is not None else v)
+
+    return df
@@ -0,0 +1,221 @@
+###################################################################################################################
+############################ Almacén de características por cliente (float32, memoria mapeada) ###################
+###################################################################################################################
+
+# 01. validación.py y 02. clustering_clientes.py volvían a leer las ~32M líneas de "02. clientes_clustering" y
+# repetían el mismo groupby("user_id").agg(...) + pd.crosstab(user_id, department); 03 (PCA), "Prueba PCA 3d" y
+# la página K-Means del dashboard después reajustaban el escalado y el PCA sobre el resultado.
+#
+# La matriz de características se materializa una sola vez (00. caracteristicas_clientes.py):
+# - user_id.npy         (int32, n_clientes)
+# - caracteristicas.npy (float32, n_clientes × n_columnas, por columnas / orden Fortran)
+# - pca.npy             (float32, n_clientes × 3): proyección de las características escaladas
+# - meta.json           columnas, media y desviación del escalado (las de StandardScaler), varianza explicada
+#
+# Los .npy se abren con np.load(mmap_mode="r"): cambiar k o agregar un gráfico ya no vuelve a agregar las líneas.
+# Cada archivo se escribe en un temporal y se reemplaza de una vez (os.replace). meta.json se borra antes de
+# reemplazar el primer .npy y se escribe al final: una reconstrucción interrumpida deja la carpeta sin meta.json
+# (CaracteristicasClientes falla y hay que volver a correr 00.), nunca un meta.json que describa otros .npy.
+#
+# Dos modos de construir la tabla (MODOS):
+# - "lineas":  todo desde las ~32M líneas orden-producto de "02. clientes_clustering" (dia_promedio, hora_promedio
+#              y dias_entre_pedidos quedan ponderados por el tamaño de la cesta: cada orden pesa tantas veces
+#              como productos tiene)
+# - "ordenes": los promedios temporales desde orders.csv, una fila por orden (~3.4M), es decir, promedios por
+#              orden; las compras por departamento, con un conteo por bloques sobre el almacén de transacciones
+#              (códigos de producto en memoria mapeada → departamento), sin armar la tabla larga
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from utils.ingesta import PATH_DATOS, leer_tabla
+from utils.transacciones import AlmacenTransacciones
+
+RUTA_CARACTERISTICAS = "./data/procesados/02b. caracteristicas_clientes/"
+
+# Columnas de comportamiento; el resto son las compras por departamento
+COLUMNAS_BASE = ["n_pedidos", "orden_max", "dia_promedio", "hora_promedio", "dias_entre_pedidos"]
+
+# Columnas de "02. clientes_clustering" que usa la agregación
+COLUMNAS_LINEAS = ["user_id", "order_id", "order_number", "order_dow", "order_hour_of_day",
+                   "days_since_prior_order", "department"]
+
+COMPONENTES_PCA = 3
+
+MODOS = ["lineas", "ordenes"]
+
+# Agregación por cliente: columna de origen → (función, nombre de la característica)
+AGREGACIONES = {
+    "order_id": ("nunique", "n_pedidos"),
+    "order_number": ("max", "orden_max"),
+    "order_dow": ("mean", "dia_promedio"),
+    "order_hour_of_day": ("mean", "hora_promedio"),
+    "days_since_prior_order": ("mean", "dias_entre_pedidos"),
+}
+
+# Columnas que son promedios; el resto (n_pedidos, orden_max y las compras por departamento) son conteos enteros
+COLUMNAS_PROMEDIO = [nombre for f, nombre in AGREGACIONES.values() if f == "mean"]
+
+
+def _agregar_temporales(df: pd.DataFrame) -> pd.DataFrame:
+    return (df.groupby("user_id").agg({col: f for col, (f, _) in AGREGACIONES.items()})
+            .rename(columns={col: nombre for col, (_, nombre) in AGREGACIONES.items()}).reset_index())
+
+
+def agregar_por_cliente(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Líneas orden-producto → una fila por cliente: métricas de comportamiento + compras por departamento.
+    """
+    df_agrupado = _agregar_temporales(df)
+
+    pivot_dept = pd.crosstab(df["user_id"], df["department"]).reset_index()
+    pivot_dept.columns = pivot_dept.columns.astype(str)
+    return df_agrupado.merge(pivot_dept, on="user_id")
+
+
+def agregar_por_ordenes(path: str = PATH_DATOS, almacen: AlmacenTransacciones = None,
+                        ordenes_por_bloque: int = 500_000) -> pd.DataFrame:
+    """
+    Misma tabla por cliente que agregar_por_cliente(), con los promedios temporales por orden (orders.csv) y las
+    compras por departamento contadas por bloques de órdenes del almacén de transacciones.
+    """
+    almacen = almacen if almacen is not None else AlmacenTransacciones()
+    orders = leer_tabla("orders", path, reporte=False)
+    products = leer_tabla("products", path, reporte=False)
+    departments = leer_tabla("departments", path, reporte=False)
+
+    # Solo las órdenes con productos: las mismas del almacén (y de "02. clientes_clustering")
+    orders = orders[np.isin(orders["order_id"].to_numpy(), np.asarray(almacen.order_id))]
+    df_agrupado = _agregar_temporales(orders[["user_id", *AGREGACIONES]])
+
+    # 🧭 product_id → código de departamento (orden de las categorías, como las columnas de crosstab)
+    categorias = departments["department"].cat.categories
+    dept_por_id = np.full(int(departments["department_id"].max()) + 1, -1, dtype=np.int64)
+    dept_por_id[departments["department_id"].to_numpy()] = departments["department"].cat.codes.to_numpy()
+    dept_por_producto = np.full(max(almacen.n_codigos, int(products["product_id"].max()) + 1), -1, dtype=np.int64)
+    dept_por_producto[products["product_id"].to_numpy()] = dept_por_id[products["department_id"].to_numpy()]
+
+    usuarios = df_agrupado["user_id"].to_numpy()
+    usuario_por_orden = np.searchsorted(usuarios, np.asarray(almacen.user_id))
+    n_dept = len(categorias)
+    conteos = np.zeros(len(usuarios) * n_dept, dtype=np.int64)
+    for inicio in range(0, almacen.n_ordenes, ordenes_por_bloque):
+        fin = min(inicio + ordenes_por_bloque, almacen.n_ordenes)
+        offsets = np.asarray(almacen.offsets[inicio:fin + 1])
+        dept = dept_por_producto[almacen.productos[offsets[0]:offsets[-1]]]
+        usuario = np.repeat(usuario_por_orden[inicio:fin], np.diff(offsets))
+        validas = dept >= 0
+        conteos += np.bincount(usuario[validas] * n_dept + dept[validas], minlength=len(conteos))
+
+    pivot_dept = pd.DataFrame(conteos.reshape(len(usuarios), n_dept), columns=categorias.astype(str))
+    # Como crosstab: solo los departamentos con alguna compra
+    pivot_dept = pivot_dept.loc[:, pivot_dept.to_numpy().any(axis=0)]
+    return pd.concat([df_agrupado, pivot_dept], axis=1)
+
+
+def _guardar_npy(destino: str, arreglo: np.ndarray) -> None:
+    temporal = destino + ".tmp"
+    # Con un archivo abierto np.save no agrega ".npy" al nombre temporal
+    with open(temporal, "wb") as f:
+        np.save(f, arreglo)
+    os.replace(temporal, destino)
+
+
+def construir_caracteristicas(df_final: pd.DataFrame, ruta: str = RUTA_CARACTERISTICAS,
+                              modo: str = "lineas") -> "CaracteristicasClientes":
+    """
+    Guarda la tabla por cliente (user_id + columnas numéricas) como matriz float32 junto con la media y la
+    desviación del escalado y la proyección PCA de las características escaladas.
+    """
+    from sklearn.decomposition import PCA
+
+    os.makedirs(ruta, exist_ok=True)
+    columnas = [c for c in df_final.columns if c != "user_id"]
+    X = np.asfortranarray(df_final[columnas].to_numpy(dtype=np.float32))
+
+    # Mismo criterio que StandardScaler: desviación poblacional, 1 donde la columna es constante
+    media = X.mean(axis=0, dtype=np.float64)
+    desviacion = X.std(axis=0, dtype=np.float64)
+    desviacion[desviacion == 0] = 1.0
+
+    pca = PCA(n_components=min(COMPONENTES_PCA, len(columnas)), random_state=42)
+    proyeccion = pca.fit_transform(((X - media) / desviacion).astype(np.float32)).astype(np.float32)
+
+    # Sin meta.json mientras se reemplazan los .npy: la carpeta no se puede leer a medio cambiar
+    destino_meta = os.path.join(ruta, "meta.json")
+    if os.path.exists(destino_meta):
+        os.remove(destino_meta)
+
+    _guardar_npy(os.path.join(ruta, "user_id.npy"), df_final["user_id"].to_numpy(dtype=np.int32))
+    _guardar_npy(os.path.join(ruta, "caracteristicas.npy"), X)
+    _guardar_npy(os.path.join(ruta, "pca.npy"), proyeccion)
+
+    # meta.json al final: recién entonces la tabla nueva queda lista para los lectores
+    with open(destino_meta + ".tmp", "w", encoding="utf-8") as f:
+        json.dump({
+            "modo": modo,
+            "n_clientes": int(len(X)),
+            "columnas": columnas,
+            "media": media.tolist(),
+            "desviacion": desviacion.tolist(),
+            "varianza_explicada": pca.explained_variance_ratio_.tolist(),
+        }, f, indent=2, ensure_ascii=False)
+    os.replace(destino_meta + ".tmp", destino_meta)
+
+    return CaracteristicasClientes(ruta)
+
+
+def existe_caracteristicas(ruta: str = RUTA_CARACTERISTICAS) -> bool:
+    return os.path.exists(os.path.join(ruta, "meta.json"))
+
+
+class CaracteristicasClientes:
+    """
+    Acceso de solo lectura (memoria mapeada) a la matriz de características por cliente.
+    """
+
+    def __init__(self, ruta: str = RUTA_CARACTERISTICAS):
+        self.ruta = ruta
+        if not existe_caracteristicas(ruta):
+            raise FileNotFoundError(f"Sin características en {ruta} (o una construcción quedó a medias): "
+                                    f"corre 02. K-means/00. caracteristicas_clientes.py")
+        with open(os.path.join(ruta, "meta.json"), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.columnas = self.meta["columnas"]
+        self.media = np.asarray(self.meta["media"])
+        self.desviacion = np.asarray(self.meta["desviacion"])
+        self.user_id = np.load(os.path.join(ruta, "user_id.npy"), mmap_mode="r")
+        self.X = np.load(os.path.join(ruta, "caracteristicas.npy"), mmap_mode="r")
+        self.pca = np.load(os.path.join(ruta, "pca.npy"), mmap_mode="r")
+
+    def __len__(self) -> int:
+        return self.meta["n_clientes"]
+
+    def escaladas(self) -> np.ndarray:
+        """
+        Características estandarizadas con la media y desviación guardadas (float32), como StandardScaler.
+        """
+        return ((self.X - self.media) / self.desviacion).astype(np.float32)
+
+    def dataframe(self, user_id: bool = True) -> pd.DataFrame:
+        """
+        Tabla por cliente (user_id + columnas), copiada a memoria.
+        """
+        df = pd.DataFrame(np.asarray(self.X), columns=self.columnas)
+        if user_id:
+            df.insert(0, "user_id", np.asarray(self.user_id))
+        return df
+
+    def componentes(self, user_ids=None) -> np.ndarray:
+        """
+        Proyección PCA de cada cliente; con user_ids, en ese orden (NaN para los que no están).
+        """
+        if user_ids is None:
+            return np.asarray(self.pca)
+        posicion = pd.Index(np.asarray(self.user_id)).get_indexer(np.asarray(user_ids))
+        componentes = np.asarray(self.pca)[posicion]
+        componentes[posicion < 0] = np.nan
+        return componentes
@@ -0,0 +1,215 @@
+###################################################################################################################
+############################# Disposición de redes: caché de posiciones y arranque tibio ##########################
+###################################################################################################################
+
+# Las redes de reglas (04.2 / 04.3, 06 del cruce y las páginas Apriori / Cruce del dashboard) calculaban su
+# disposición (spring_layout / kamada_kawai_layout) desde cero cada vez; en el dashboard, en cada movimiento de un
+# slider. Este módulo guarda las posiciones de los nodos:
+# - la clave es la huella del grafo (nodos y aristas con su peso) junto con el algoritmo y sus parámetros
+# - en memoria (las últimas disposiciones del proceso) y en disco, en data/procesados/disposiciones/, así un
+#   script o el dashboard reutilizan lo que otra corrida ya calculó
+# - si el grafo exacto no está pero hay uno de la misma familia (mismo algoritmo y parámetros) con casi los mismos
+#   nodos, la disposición parte de esas posiciones (los nodos nuevos se ubican junto a sus vecinos) y el algoritmo
+#   solo la ajusta: spring_layout con pocas iteraciones, kamada_kawai desde esas posiciones
+#
+# En disco se guardan como mucho max_disco disposiciones por familia: después de cada escritura se borran las más
+# antiguas. La carpeta de disposiciones se puede borrar en cualquier momento: solo se pierde el trabajo ya hecho.
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+
+from utils.artefactos import RUTA_PROCESADOS, guardar_artefacto, leer_artefacto, ruta_artefacto
+
+RUTA_DISPOSICIONES = os.path.join(RUTA_PROCESADOS, "disposiciones")
+
+ALGORITMOS = {"spring": nx.spring_layout, "kamada_kawai": nx.kamada_kawai_layout}
+
+# Fracción mínima de nodos en común (Jaccard) para partir de una disposición anterior
+SOLAPE_MINIMO = 0.5
+
+# Iteraciones de spring_layout cuando parte de posiciones ya ajustadas
+ITERACIONES_TIBIAS = 15
+
+
+def huella_grafo(G: nx.Graph) -> str:
+    """
+    Hash de los nodos y las aristas (con su peso) de G, independiente del orden en que se agregaron.
+    """
+    nodos = sorted(str(n) for n in G.nodes())
+    aristas = sorted((str(u), str(v), repr(float(d.get("weight", 1.0)))) for u, v, d in G.edges(data=True))
+    contenido = json.dumps([G.is_directed(), nodos, aristas], ensure_ascii=False)
+    return hashlib.sha1(contenido.encode("utf-8")).hexdigest()
+
+
+def _familia(algoritmo: str, parametros: dict) -> str:
+    contenido = json.dumps([algoritmo, sorted(parametros.items())], default=str)
+    return hashlib.sha1(contenido.encode("utf-8")).hexdigest()[:12]
+
+
+def _posiciones_iniciales(G: nx.Graph, previas: dict, semilla) -> dict:
+    """
+    Posiciones de partida: las previas para los nodos que ya estaban; los nuevos, en el promedio de sus vecinos ya
+    ubicados (con un pequeño desplazamiento) o al azar si no tienen ninguno.
+    """
+    rng = np.random.default_rng(semilla)
+    inicial = {n: previas[str(n)] for n in G.nodes() if str(n) in previas}
+    nuevos = [n for n in G.nodes() if n not in inicial]
+    no_dirigido = G.to_undirected(as_view=True)
+    # Varias pasadas: un nodo nuevo vecino solo de otros nuevos se ubica cuando ellos ya tienen lugar
+    for _ in range(3):
+        pendientes = []
+        for nodo in nuevos:
+            vecinos = [inicial[v] for v in no_dirigido.neighbors(nodo) if v in inicial]
+            if vecinos:
+                inicial[nodo] = np.mean(vecinos, axis=0) + rng.normal(0.0, 0.05, 2)
+            else:
+                pendientes.append(nodo)
+        nuevos = pendientes
+    for nodo in nuevos:
+        inicial[nodo] = rng.uniform(-1.0, 1.0, 2)
+    return inicial
+
+
+class CacheDisposiciones:
+    """
+    Posiciones de nodos por huella de grafo, algoritmo y parámetros, en memoria (LRU) y en disco (un Parquet por
+    disposición, como mucho max_disco por familia).
+    """
+
+    def __init__(self, ruta: str = RUTA_DISPOSICIONES, max_memoria: int = 256, precargar: int = 16,
+                 max_disco: int = 64):
+        self.ruta = ruta
+        self.max_memoria = max_memoria
+        self.max_disco = max_disco
+        self.precargar = precargar
+        self._memoria = OrderedDict()  # clave → (familia, {nodo: array([x, y])})
+        self._familias_cargadas = set()
+        self._candado = threading.Lock()
+        self.aciertos = 0
+        self.tibias = 0
+        self.completas = 0
+
+    def _recordar(self, clave: str, familia: str, posiciones: dict) -> None:
+        with self._candado:
+            self._memoria[clave] = (familia, posiciones)
+            self._memoria.move_to_end(clave)
+            while len(self._memoria) > self.max_memoria:
+                self._memoria.popitem(last=False)
+
+    def _leer(self, clave: str):
+        if not os.path.exists(ruta_artefacto(clave, self.ruta)):
+            return None
+        try:
+            df = leer_artefacto(clave, ruta=self.ruta)
+        except (OSError, ValueError):
+            return None
+        return dict(zip(df["nodo"], df[["x", "y"]].to_numpy()))
+
+    def _archivos_familia(self, familia: str) -> list:
+        """
+        Archivos de disposiciones de la familia en disco, de la más reciente a la más antigua.
+        """
+        if not os.path.isdir(self.ruta):
+            return []
+        archivos = []
+        for archivo in os.listdir(self.ruta):
+            if archivo.startswith(familia + "_") and archivo.endswith(".parquet"):
+                try:
+                    archivos.append((os.path.getmtime(os.path.join(self.ruta, archivo)), archivo))
+                except OSError:
+                    pass  # borrado por otro proceso mientras se listaba
+        return [archivo for _, archivo in sorted(archivos, reverse=True)]
+
+    def _escribir(self, clave: str, familia: str, posiciones: dict) -> None:
+        df = pd.DataFrame({"nodo": list(posiciones),
+                           "x": [p[0] for p in posiciones.values()],
+                           "y": [p[1] for p in posiciones.values()]})
+        try:
+            guardar_artefacto(df, clave, self.ruta)
+            # Tope por familia: cada slider del dashboard deja una disposición nueva
+            for archivo in self._archivos_familia(familia)[self.max_disco:]:
+                os.remove(os.path.join(self.ruta, archivo))
+        except OSError:
+            pass  # la caché en disco es opcional: sin permisos o con otra escritura en curso solo queda en memoria
+
+    def _cargar_familia(self, familia: str) -> None:
+        """
+        Sube a memoria las disposiciones más recientes de la familia guardadas en disco (candidatas de arranque
+        tibio en un proceso nuevo).
+        """
+        if familia in self._familias_cargadas:
+            return
+        self._familias_cargadas.add(familia)
+        for archivo in reversed(self._archivos_familia(familia)[:self.precargar]):
+            clave = archivo[:-len(".parquet")]
+            if clave not in self._memoria:
+                posiciones = self._leer(clave)
+                if posiciones is not None:
+                    self._recordar(clave, familia, posiciones)
+
+    def _mas_parecida(self, familia: str, nodos: set):
+        with self._candado:
+            candidatas = [p for f, p in self._memoria.values() if f == familia]
+        mejor, mejor_solape = None, SOLAPE_MINIMO
+        for posiciones in candidatas:
+            comunes = len(nodos.intersection(posiciones))
+            solape = comunes / (len(nodos) + len(posiciones) - comunes)
+            if solape >= mejor_solape:
+                mejor, mejor_solape = posiciones, solape
+        return mejor
+
+    def posiciones(self, G: nx.Graph, algoritmo: str = "spring", **parametros) -> dict:
+        """
+        {nodo: array([x, y])} de G con el algoritmo indicado ("spring" o "kamada_kawai") y sus parámetros de
+        networkx. Reutiliza una disposición guardada o parte de la más parecida.
+        """
+        if algoritmo not in ALGORITMOS:
+            raise ValueError(f"Algoritmo desconocido: {algoritmo} (opciones: {list(ALGORITMOS)})")
+        if G.number_of_nodes() == 0:
+            return {}
+
+        familia = _familia(algoritmo, parametros)
+        clave = f"{familia}_{huella_grafo(G)}"
+
+        guardadas = self._memoria.get(clave)
+        posiciones = guardadas[1] if guardadas is not None else self._leer(clave)
+        if posiciones is not None:
+            self.aciertos += 1
+        else:
+            self._cargar_familia(familia)
+            previas = self._mas_parecida(familia, {str(n) for n in G.nodes()})
+            argumentos = dict(parametros)
+            if previas is not None:
+                argumentos["pos"] = _posiciones_iniciales(G, previas, parametros.get("seed"))
+                if algoritmo == "spring":
+                    argumentos["iterations"] = min(parametros.get("iterations", 50), ITERACIONES_TIBIAS)
+                self.tibias += 1
+            else:
+                self.completas += 1
+            calculadas = ALGORITMOS[algoritmo](G, **argumentos)
+            posiciones = {str(n): np.asarray(p, dtype=np.float64) for n, p in calculadas.items()}
+            self._escribir(clave, familia, posiciones)
+
+        self._recordar(clave, familia, posiciones)
+        return {n: posiciones[str(n)] for n in G.nodes()}
+
+
+# Caché compartida por los llamadores del proceso (scripts y páginas del dashboard)
+_CACHE = None
+
+
+def disposicion(G: nx.Graph, algoritmo: str = "spring", **parametros) -> dict:
+    """
+    Posiciones de los nodos de G a través de la caché del proceso (ver CacheDisposiciones.posiciones).
+    """
+    global _CACHE
+    if _CACHE is None:
+        _CACHE = CacheDisposiciones()
+    return _CACHE.posiciones(G, algoritmo, **parametros)
@@ -0,0 +1,100 @@
+###################################################################################################################
+############################### Figuras estáticas: guardado atómico y render por lotes ############################
+###################################################################################################################
+
+# Los gráficos de 01. A priori/04.x, 02. K-means/ y 05/06 del cruce son scripts independientes que leían sus
+# entradas, dibujaban con matplotlib y terminaban con plt.show(), que deja la ejecución esperando una ventana.
+# - guardar_figura(): escribe la imagen en un temporal de la misma carpeta y lo reemplaza de una vez (os.replace),
+#   así nunca queda un PNG a medio escribir, y cierra la figura en lugar de mostrarla
+# - renderizar(): corre los scripts de figuras en un pool de procesos con el backend Agg (sin ventanas). Cada proceso
+#   activa la caché de lectura de utils/artefactos.py, de modo que las entradas compartidas (reglas, diccionarios,
+#   clientes clusterizados) se leen una vez por proceso y no una vez por script
+
+import os
+import runpy
+import sys
+import tempfile
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def guardar_figura(ruta: str, fig=None, **kwargs) -> str:
+    """
+    plt.savefig atómico (temporal + os.replace) de la figura indicada o la actual, que luego se cierra.
+    kwargs pasa a savefig (dpi, bbox_inches, ...).
+    """
+    fig = fig if fig is not None else plt.gcf()
+    carpeta = os.path.dirname(ruta) or "."
+    os.makedirs(carpeta, exist_ok=True)
+    extension = os.path.splitext(ruta)[1]
+    descriptor, temporal = tempfile.mkstemp(suffix=extension, dir=carpeta)
+    os.close(descriptor)
+    try:
+        fig.savefig(temporal, format=extension.lstrip(".") or None, **kwargs)
+        os.replace(temporal, ruta)
+    except BaseException:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        raise
+    finally:
+        plt.close(fig)
+    return ruta
+
+
+def _iniciar_proceso() -> None:
+    from utils.artefactos import activar_cache_lectura
+
+    os.environ["MPLBACKEND"] = "Agg"
+    activar_cache_lectura()
+
+
+def _renderizar_script(script: str) -> tuple:
+    """
+    Corre un script de figuras en este proceso. Devuelve (script, segundos, error o None).
+    """
+    inicio = time.perf_counter()
+    # Cada script parte del estilo por defecto (sns.set / rcParams de un script no pasan al siguiente)
+    plt.close("all")
+    matplotlib.rcdefaults()
+    try:
+        runpy.run_path(os.path.join(RAIZ, script), run_name="__main__")
+        error = None
+    except BaseException:
+        error = traceback.format_exc()
+    finally:
+        plt.close("all")
+    return script, time.perf_counter() - inicio, error
+
+
+def renderizar(scripts: list, trabajadores: int = None) -> bool:
+    """
+    Corre los scripts de figuras (rutas relativas a la raíz del repositorio) en paralelo, sin ventanas, desde el
+    directorio actual (como ejecutar_pipeline.py, los scripts leen ./data y escriben en ./output).
+    Devuelve True si todos terminaron bien.
+    """
+    if RAIZ not in sys.path:
+        sys.path.insert(0, RAIZ)
+    inicio = time.perf_counter()
+    fallidos = []
+    with ProcessPoolExecutor(max_workers=trabajadores, initializer=_iniciar_proceso) as pool:
+        futuros = [pool.submit(_renderizar_script, script) for script in scripts]
+        for futuro in as_completed(futuros):
+            script, segundos, error = futuro.result()
+            if error is None:
+                print(f"🖼️ {script} ({segundos:.1f} s)")
+            else:
+                fallidos.append(script)
+                print(f"❌ {script} ({segundos:.1f} s)\n{error}")
+
+    print(f"\n⏱️ {len(scripts) - len(fallidos)} de {len(scripts)} scripts de figuras en "
+          f"{time.perf_counter() - inicio:.1f} s")
+    return not fallidos
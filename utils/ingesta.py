@@ -0,0 +1,165 @@
+###################################################################################################################
+############################### Ingesta tipada de las tablas crudas de Instacart ##################################
+###################################################################################################################
+
+# Con los tipos por defecto de pandas cada id y cada campo pequeño queda como int64 y cada texto como object,
+# y el merge de 32,4M filas llega a ~2.9 GB. Este módulo lee cada tabla con un esquema explícito:
+# - ids en int32
+# - día, hora, reordered en int8; add_to_cart_order y order_number en uint8 (máximos observados: 145 y 100)
+# - days_since_prior_order en float32
+# - textos como category directamente desde el lector
+#
+# La lectura se hace por bloques para que la memoria de trabajo del parser quede acotada por un presupuesto
+# configurable, y se imprime un reporte de memoria antes/después por tabla.
+
+import sys
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+PATH_DATOS = "./data/datos/"
+
+# 🧮 Presupuesto por defecto (MB) para cada bloque de lectura
+PRESUPUESTO_MB = 256
+
+# ⚠️ read_csv no valida desbordes: un 145 leído como int8 queda en -111 sin avisar.
+# Por eso add_to_cart_order (máx. 145) y order_number (máx. 100) van en uint8.
+ESQUEMAS = {
+    "orders": {
+        "order_id": "int32",
+        "user_id": "int32",
+        "eval_set": "category",
+        "order_number": "uint8",
+        "order_dow": "int8",
+        "order_hour_of_day": "int8",
+        "days_since_prior_order": "float32",
+    },
+    "order_products__prior": {
+        "order_id": "int32",
+        "product_id": "int32",
+        "add_to_cart_order": "uint8",
+        "reordered": "int8",
+    },
+    "order_products__train": {
+        "order_id": "int32",
+        "product_id": "int32",
+        "add_to_cart_order": "uint8",
+        "reordered": "int8",
+    },
+    "products": {
+        "product_id": "int32",
+        "product_name": "category",
+        "aisle_id": "int16",
+        "department_id": "int8",
+    },
+    "departments": {
+        "department_id": "int8",
+        "department": "category",
+    },
+    "aisles": {
+        "aisle_id": "int16",
+        "aisle": "category",
+    },
+}
+
+# El parser de C necesita varias veces el tamaño final del bloque (texto crudo + tokens)
+FACTOR_PARSER = 8
+
+
+def bytes_por_fila(esquema: dict) -> int:
+    """
+    Bytes por fila del esquema ya tipado (las categorías cuentan como códigos int32).
+    """
+    total = 0
+    for tipo in esquema.values():
+        total += 4 if tipo == "category" else np.dtype(tipo).itemsize
+    return total
+
+
+def filas_por_bloque(esquema: dict, presupuesto_mb: float = PRESUPUESTO_MB) -> int:
+    """
+    Cantidad de filas por bloque para que cada lectura quede dentro de presupuesto_mb.
+    """
+    presupuesto = presupuesto_mb * 1024 ** 2
+    return max(int(presupuesto // (bytes_por_fila(esquema) * FACTOR_PARSER)), 1_000)
+
+
+def memoria_mb(df: pd.DataFrame) -> float:
+    """
+    Memoria real del DataFrame en MB (incluye strings).
+    """
+    return df.memory_usage(deep=True).sum() / 1024 ** 2
+
+
+def memoria_sin_esquema_mb(df: pd.DataFrame) -> float:
+    """
+    Estima la memoria que ocuparía el mismo bloque leído con los tipos por defecto:
+    int64/float64 para números y un objeto str por celda para los textos.
+    """
+    total = 0
+    for col in df.columns:
+        serie = df[col]
+        if isinstance(serie.dtype, pd.CategoricalDtype):
+            tamaños = np.array([sys.getsizeof(str(c)) for c in serie.cat.categories], dtype=np.int64)
+            codigos = serie.cat.codes.to_numpy()
+            total += 8 * len(serie) + tamaños[codigos[codigos >= 0]].sum()
+        else:
+            total += 8 * len(serie)
+    return total / 1024 ** 2
+
+
+def _concatenar_bloques(columnas: dict) -> pd.DataFrame:
+    """
+    Une los bloques columna por columna, liberando cada lista apenas se usa para no duplicar la tabla completa.
+    Las categorías de cada bloque pueden diferir, por eso se unen con union_categoricals.
+    """
+    datos = {}
+    for col in list(columnas):
+        partes = columnas.pop(col)
+        if isinstance(partes[0], pd.Categorical):
+            datos[col] = union_categoricals(partes)
+        else:
+            datos[col] = np.concatenate(partes)
+        del partes
+    return pd.DataFrame(datos)
+
+
+def leer_bloques(nombre: str, path: str = PATH_DATOS, presupuesto_mb: float = PRESUPUESTO_MB):
+    """
+    Itera data/datos/<nombre>.csv en bloques tipados con ESQUEMAS[nombre], cada uno acotado por presupuesto_mb.
+    """
+    esquema = ESQUEMAS[nombre]
+    return pd.read_csv(
+        path + f"{nombre}.csv",
+        usecols=list(esquema),
+        dtype=esquema,
+        chunksize=filas_por_bloque(esquema, presupuesto_mb),
+    )
+
+
+def leer_tabla(nombre: str, path: str = PATH_DATOS, presupuesto_mb: float = PRESUPUESTO_MB,
+               reporte: bool = True) -> pd.DataFrame:
+    """
+    Lee data/datos/<nombre>.csv con el esquema de ESQUEMAS[nombre], por bloques acotados por presupuesto_mb.
+    Si reporte=True imprime la memoria estimada con tipos por defecto y la memoria final tipada.
+    """
+    esquema = ESQUEMAS[nombre]
+    columnas = {col: [] for col in esquema}
+    antes_mb = 0.0
+    for bloque in leer_bloques(nombre, path, presupuesto_mb):
+        antes_mb += memoria_sin_esquema_mb(bloque)
+        for col in esquema:
+            serie = bloque[col]
+            columnas[col].append(serie.array if esquema[col] == "category" else serie.to_numpy())
+        del bloque
+
+    df = _concatenar_bloques(columnas)
+
+    if reporte:
+        despues_mb = memoria_mb(df)
+        cambio = 100 * (despues_mb / antes_mb - 1) if antes_mb else 0.0
+        print(f"📏 {nombre}: {antes_mb:,.1f} MB (tipos por defecto, estimado) → "
+              f"{despues_mb:,.1f} MB (esquema tipado) | {cambio:+.1f}%")
+
+    return df
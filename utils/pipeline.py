@@ -0,0 +1,289 @@
+###################################################################################################################
+########################## Ejecutor del pipeline (grafo de etapas con huellas de contenido) ######################
+###################################################################################################################
+
+# Los scripts numerados se ejecutaban a mano y en orden, y cada uno recalculaba todo.
+# Este módulo ejecuta el pipeline como un grafo (DAG) de etapas:
+# - cada etapa declara su script, sus entradas y sus salidas (rutas o patrones glob relativos a la raíz)
+# - las dependencias se deducen solas: una etapa depende de las que producen alguna de sus entradas
+# - la firma de una etapa es el hash del contenido del script, de los módulos utils/ y mineria/ que importa
+#   y de sus entradas; si la firma y las salidas coinciden con la última ejecución, la etapa se omite
+# - las salidas compartidas (que otro script puede reescribir, ej. 02.2 actualizacion_incremental.py sobre las
+#   reglas y los estados de la minería) solo tienen que existir: reescribirlas no vuelve a correr (ni deshace) la
+#   etapa que las produjo, pero sí las etapas que las leen, porque cambió su entrada
+# - las etapas independientes se ejecutan en paralelo en un pool de procesos (cada una en su propio
+#   intérprete, con MPLBACKEND=Agg para que plt.show() no bloquee)
+#
+# Los hashes de archivos se memorizan por (tamaño, mtime), así que un archivo sin cambios no se vuelve a leer.
+
+import fnmatch
+import glob
+import hashlib
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+RUTA_ESTADO = os.path.join(RAIZ, "data", "procesados", ".pipeline")
+
+# Paquetes propios cuyos módulos forman parte de la firma de una etapa
+PAQUETES_PROPIOS = ("utils", "mineria")
+_IMPORTACION = re.compile(r"^\s*(?:from|import)\s+(" + "|".join(PAQUETES_PROPIOS) + r")\.(\w+)", re.MULTILINE)
+
+
+@dataclass
+class Etapa:
+    """
+    Un script del pipeline con sus entradas y salidas declaradas. compartidas: salidas (de las declaradas) que otros
+    scripts pueden reescribir; de ellas solo se revisa que existan. redibujable=False deja fuera del render por
+    lotes (renderizar_figuras.py) a las etapas de figuras que además hacen un cálculo costoso.
+    """
+    script: str
+    entradas: list = field(default_factory=list)
+    salidas: list = field(default_factory=list)
+    compartidas: list = field(default_factory=list)
+    redibujable: bool = True
+
+    @property
+    def nombre(self) -> str:
+        return os.path.splitext(os.path.relpath(self.script, "scripts"))[0]
+
+
+################################################ Huellas de contenido ################################################
+
+
+def _expandir(patron: str) -> list:
+    """
+    Archivos que corresponden a una ruta, un directorio (todos sus archivos) o un patrón glob.
+    """
+    ruta = os.path.join(RAIZ, patron)
+    if os.path.isdir(ruta):
+        return sorted(os.path.join(d, f) for d, _, fs in os.walk(ruta) for f in fs)
+    return sorted(glob.glob(ruta))
+
+
+class Huellas:
+    """
+    Hash de archivos memorizado por (tamaño, mtime) entre ejecuciones.
+    """
+
+    def __init__(self, memo: dict):
+        self.memo = memo
+
+    def archivo(self, ruta: str) -> str:
+        info = os.stat(ruta)
+        clave = os.path.relpath(ruta, RAIZ)
+        previo = self.memo.get(clave)
+        if previo and previo[0] == info.st_size and previo[1] == info.st_mtime_ns:
+            return previo[2]
+
+        h = hashlib.blake2b(digest_size=16)
+        with open(ruta, "rb") as f:
+            for bloque in iter(lambda: f.read(1 << 20), b""):
+                h.update(bloque)
+        self.memo[clave] = [info.st_size, info.st_mtime_ns, h.hexdigest()]
+        return h.hexdigest()
+
+    def patrones(self, patrones: list) -> dict:
+        """
+        Hash de cada archivo cubierto por los patrones (None si un patrón no corresponde a ningún archivo).
+        """
+        resultado = {}
+        for patron in patrones:
+            archivos = _expandir(patron)
+            if not archivos:
+                resultado[patron] = None
+            for ruta in archivos:
+                resultado[os.path.relpath(ruta, RAIZ)] = self.archivo(ruta)
+        return resultado
+
+
+def modulos_importados(script: str) -> list:
+    """
+    Módulos de utils/ y mineria/ que usa el script, incluidos los que importan esos módulos.
+    """
+    pendientes, vistos = [os.path.join(RAIZ, script)], set()
+    while pendientes:
+        with open(pendientes.pop(), encoding="utf-8") as f:
+            codigo = f.read()
+        for paquete, modulo in _IMPORTACION.findall(codigo):
+            ruta = os.path.join(RAIZ, paquete, f"{modulo}.py")
+            if ruta not in vistos and os.path.exists(ruta):
+                vistos.add(ruta)
+                pendientes.append(ruta)
+    return sorted(os.path.relpath(r, RAIZ) for r in vistos)
+
+
+def firma(etapa: Etapa, huellas: Huellas) -> str:
+    """
+    Hash del script, de los módulos propios que importa y del contenido de sus entradas.
+    """
+    partes = huellas.patrones([etapa.script] + modulos_importados(etapa.script) + etapa.entradas)
+    return hashlib.blake2b(json.dumps(partes, sort_keys=True).encode("utf-8"), digest_size=16).hexdigest()
+
+
+################################################ Grafo de etapas ################################################
+
+
+def _se_solapan(a: str, b: str) -> bool:
+    a, b = a.rstrip("/"), b.rstrip("/")
+    return (a == b or fnmatch.fnmatch(a, b) or fnmatch.fnmatch(b, a)
+            or a.startswith(b + "/") or b.startswith(a + "/"))
+
+
+def dependencias(etapas: list) -> dict:
+    """
+    nombre → nombres de las etapas que producen alguna de sus entradas.
+    """
+    deps = {}
+    for etapa in etapas:
+        deps[etapa.nombre] = {
+            otra.nombre for otra in etapas
+            if otra is not etapa and any(_se_solapan(e, s) for e in etapa.entradas for s in otra.salidas)
+        }
+    return deps
+
+
+def orden_topologico(etapas: list) -> list:
+    """
+    Nombres de las etapas en un orden compatible con sus dependencias (error si hay un ciclo).
+    """
+    deps = dependencias(etapas)
+    orden, listas = [], set()
+    while len(orden) < len(etapas):
+        nuevas = [e.nombre for e in etapas if e.nombre not in listas and deps[e.nombre] <= listas]
+        if not nuevas:
+            raise ValueError(f"Ciclo entre etapas: {sorted(set(deps) - listas)}")
+        orden.extend(nuevas)
+        listas.update(nuevas)
+    return orden
+
+
+def _con_ancestros(objetivos: list, deps: dict) -> set:
+    seleccion, pendientes = set(), list(objetivos)
+    while pendientes:
+        nombre = pendientes.pop()
+        if nombre not in seleccion:
+            seleccion.add(nombre)
+            pendientes.extend(deps[nombre])
+    return seleccion
+
+
+################################################ Ejecución ################################################
+
+
+def _ejecutar_script(script: str, ruta_log: str) -> tuple:
+    """
+    Corre un script en un intérprete propio desde la raíz del repositorio. Devuelve (código, segundos).
+    """
+    entorno = dict(os.environ, MPLBACKEND="Agg", PYTHONIOENCODING="utf-8")
+    inicio = time.perf_counter()
+    with open(ruta_log, "w", encoding="utf-8") as log:
+        proceso = subprocess.run([sys.executable, script], cwd=RAIZ, env=entorno,
+                                 stdout=log, stderr=subprocess.STDOUT)
+    return proceso.returncode, time.perf_counter() - inicio
+
+
+def _salidas_al_dia(etapa: Etapa, huellas: Huellas) -> dict:
+    """
+    Hash de las salidas propias de la etapa; las compartidas solo cuentan como presentes o ausentes (None).
+    """
+    salidas = huellas.patrones([s for s in etapa.salidas if s not in etapa.compartidas])
+    salidas.update({patron: "compartida" if _expandir(patron) else None for patron in etapa.compartidas})
+    return salidas
+
+
+def _cargar_estado() -> dict:
+    ruta = os.path.join(RUTA_ESTADO, "estado.json")
+    if not os.path.exists(ruta):
+        return {"archivos": {}, "etapas": {}}
+    with open(ruta, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _guardar_estado(estado: dict) -> None:
+    ruta = os.path.join(RUTA_ESTADO, "estado.json")
+    with open(ruta + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(estado, f, indent=1, ensure_ascii=False)
+    os.replace(ruta + ".tmp", ruta)
+
+
+def ejecutar(etapas: list, objetivos: list = None, forzar: bool = False, trabajadores: int = None) -> bool:
+    """
+    Ejecuta las etapas (o solo los objetivos y sus ancestros) omitiendo las que no cambiaron.
+    Devuelve True si todas terminaron bien.
+    """
+    os.makedirs(os.path.join(RUTA_ESTADO, "logs"), exist_ok=True)
+    por_nombre = {e.nombre: e for e in etapas}
+    deps = dependencias(etapas)
+    orden = orden_topologico(etapas)
+    seleccion = _con_ancestros(objetivos, deps) if objetivos else set(orden)
+
+    estado = _cargar_estado()
+    huellas = Huellas(estado["archivos"])
+    terminadas, fallidas, en_curso = set(), set(), {}
+    inicio = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=trabajadores) as pool:
+        while True:
+            # 🚦 Etapas listas: todas sus dependencias terminaron (o quedaron fuera de la selección)
+            for nombre in orden:
+                if nombre in terminadas or nombre in fallidas or nombre in en_curso.values():
+                    continue
+                if nombre not in seleccion:
+                    terminadas.add(nombre)
+                    continue
+                if deps[nombre] & fallidas:
+                    print(f"⛔ {nombre}: omitida (falló una dependencia)")
+                    fallidas.add(nombre)
+                    continue
+                if not deps[nombre] <= terminadas:
+                    continue
+
+                etapa = por_nombre[nombre]
+                actual = firma(etapa, huellas)
+                previo = estado["etapas"].get(nombre, {})
+                salidas = _salidas_al_dia(etapa, huellas)
+                if (not forzar and previo.get("firma") == actual and previo.get("salidas") == salidas
+                        and None not in salidas.values()):
+                    print(f"⏭️  {nombre}: sin cambios")
+                    terminadas.add(nombre)
+                    continue
+
+                print(f"▶️  {nombre}")
+                ruta_log = os.path.join(RUTA_ESTADO, "logs", f"{nombre.replace(os.sep, ' - ')}.log")
+                en_curso[pool.submit(_ejecutar_script, etapa.script, ruta_log)] = nombre
+
+            if not en_curso:
+                break
+
+            hechas, _ = wait(en_curso, return_when=FIRST_COMPLETED)
+            for futuro in hechas:
+                nombre = en_curso.pop(futuro)
+                etapa = por_nombre[nombre]
+                codigo, segundos = futuro.result()
+                if codigo != 0:
+                    print(f"❌ {nombre}: falló (código {codigo}, ver logs en data/procesados/.pipeline/logs/)")
+                    fallidas.add(nombre)
+                    estado["etapas"].pop(nombre, None)
+                    continue
+
+                # La firma se calcula después de correr: las entradas no cambian mientras la etapa se ejecuta
+                estado["etapas"][nombre] = {
+                    "firma": firma(etapa, huellas),
+                    "salidas": _salidas_al_dia(etapa, huellas),
+                    "segundos": round(segundos, 2),
+                }
+                _guardar_estado(estado)
+                print(f"✅ {nombre} ({segundos:.1f} s)")
+                terminadas.add(nombre)
+
+    _guardar_estado(estado)
+    print(f"\n🏁 Pipeline terminado en {time.perf_counter() - inicio:.1f} s "
+          f"({len(terminadas & seleccion)} etapas al día, {len(fallidas)} con error)")
+    return not fallidas
@@ -0,0 +1,141 @@
+###################################################################################################################
+############################### Red de reglas: aristas, roles y elevación por nodo ###############################
+###################################################################################################################
+
+# Cada red de reglas (04.2 / 04.3, 06 del cruce y las páginas Apriori / Cruce) agregaba las aristas con iterrows y
+# después, para el tamaño de cada nodo, volvía a filtrar todas las reglas por nodo (igualdad en 04.3, str.contains
+# en 06): cuadrático en la cantidad de nodos. red_reglas() arma todo en una pasada sobre arreglos:
+# - aristas: una por regla (nodo = etiqueta "A, B" de cada lado) o, con por_item=True, el producto cartesiano
+#   antecedente × consecuente de cada regla sobre los itemsets explotados (nodo = producto)
+# - rol de cada nodo (antecedente, consecuente o ambos) y su elevación máxima, con un único groupby sobre los
+#   extremos de las aristas
+# - las aristas repetidas (varias reglas entre los mismos nodos) quedan una vez, con la elevación máxima
+#
+# Los nodos quedan en el orden en que aparecen en las reglas, el mismo en que los agregaba add_edge.
+
+from dataclasses import dataclass
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+
+ROLES = np.array(["antecedente", "consecuente", "ambos"])
+
+
+@dataclass
+class RedReglas:
+    """
+    Red de reglas como arreglos: nodos[i] con rol[i] (índice en ROLES) y elevación máxima max_lift[i]; aristas
+    origen[j] → destino[j] (índices de nodo) con peso[j].
+    """
+    nodos: np.ndarray
+    rol: np.ndarray
+    max_lift: np.ndarray
+    origen: np.ndarray
+    destino: np.ndarray
+    peso: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.nodos)
+
+    def grados(self) -> np.ndarray:
+        """
+        Grado de cada nodo (aristas de entrada + salida), como G.degree.
+        """
+        return (np.bincount(self.origen, minlength=len(self)) + np.bincount(self.destino, minlength=len(self)))
+
+    def subred(self, max_nodos: int) -> "RedReglas":
+        """
+        Solo los max_nodos nodos de mayor grado (empates en orden de aparición) y las aristas entre ellos.
+        """
+        if len(self) <= max_nodos:
+            return self
+        quedan = np.zeros(len(self), dtype=bool)
+        quedan[np.argsort(-self.grados(), kind="stable")[:max_nodos]] = True
+        nuevo_indice = np.cumsum(quedan) - 1
+        aristas = quedan[self.origen] & quedan[self.destino]
+        return RedReglas(self.nodos[quedan], self.rol[quedan], self.max_lift[quedan],
+                         nuevo_indice[self.origen[aristas]], nuevo_indice[self.destino[aristas]], self.peso[aristas])
+
+    def grafo(self) -> nx.DiGraph:
+        """
+        DiGraph de networkx con los nodos en orden y la elevación como weight de cada arista.
+        """
+        G = nx.DiGraph()
+        G.add_nodes_from(self.nodos.tolist())
+        G.add_weighted_edges_from(zip(self.nodos[self.origen].tolist(), self.nodos[self.destino].tolist(),
+                                      self.peso.tolist()))
+        return G
+
+    def coordenadas(self, pos: dict):
+        """
+        (aristas_x, aristas_y, nodos_x, nodos_y) para plotly desde las posiciones {nodo: (x, y)}: cada arista es
+        un par de puntos seguido de un NaN que corta la línea.
+        """
+        xy = np.array([pos[n] for n in self.nodos], dtype=np.float64).reshape(-1, 2)
+        segmentos = np.full((len(self.origen), 3, 2), np.nan)
+        segmentos[:, 0] = xy[self.origen]
+        segmentos[:, 1] = xy[self.destino]
+        segmentos = segmentos.reshape(-1, 2)
+        return segmentos[:, 0], segmentos[:, 1], xy[:, 0], xy[:, 1]
+
+
+def _explotar(items: pd.Series):
+    """
+    Itemsets de cada regla aplanados: (elementos, largo de cada itemset).
+    """
+    largos = items.map(len).to_numpy(dtype=np.int64)
+    elementos = items.explode().to_numpy()
+    # explode deja un NaN por cada lista vacía
+    return elementos[np.repeat(largos, np.maximum(largos, 1)) > 0], largos
+
+
+def _aristas_por_item(reglas: pd.DataFrame, metrica: str):
+    """
+    Producto cartesiano antecedente × consecuente de cada regla, sin recorrer filas.
+    """
+    antecedentes, largo_a = _explotar(reglas["antecedentes_items"])
+    consecuentes, largo_c = _explotar(reglas["consecuentes_items"])
+    inicio_c = np.cumsum(largo_c) - largo_c
+
+    regla_de_antecedente = np.repeat(np.arange(len(reglas)), largo_a)
+    repeticiones = largo_c[regla_de_antecedente]
+    total = int(repeticiones.sum())
+    # Para cada elemento del antecedente, los consecuentes de su regla uno tras otro
+    desplazamiento = np.arange(total) - np.repeat(np.cumsum(repeticiones) - repeticiones, repeticiones)
+    origen = np.repeat(antecedentes, repeticiones)
+    destino = consecuentes[np.repeat(inicio_c[regla_de_antecedente], repeticiones) + desplazamiento]
+    peso = np.repeat(reglas[metrica].to_numpy(dtype=np.float64)[regla_de_antecedente], repeticiones)
+    return origen, destino, peso
+
+
+def red_reglas(reglas: pd.DataFrame, por_item: bool = False, metrica: str = "elevacion") -> RedReglas:
+    """
+    Red de las reglas (leer_reglas / leer_reglas_traducidas). Sin por_item cada lado "A, B" es un nodo; con
+    por_item=True cada producto es un nodo (requiere listas=True: columnas antecedentes_items / consecuentes_items).
+    """
+    if por_item:
+        origen, destino, peso = _aristas_por_item(reglas, metrica)
+    else:
+        origen = reglas["antecedentes"].to_numpy(dtype=object)
+        destino = reglas["consecuentes"].to_numpy(dtype=object)
+        peso = reglas[metrica].to_numpy(dtype=np.float64)
+
+    # Extremos intercalados (origen, destino, origen, ...): los códigos siguen el orden de aparición
+    extremos = np.empty(2 * len(origen), dtype=object)
+    extremos[0::2], extremos[1::2] = origen, destino
+    codigos, nodos = pd.factorize(extremos)
+    codigos = codigos.reshape(-1, 2)
+
+    # Un solo groupby por nodo sobre ambos extremos: en qué lados aparece y su elevación máxima
+    por_nodo = pd.DataFrame({"nodo": codigos.ravel(), "destino": np.tile([False, True], len(peso)),
+                             "peso": np.repeat(peso, 2)}).groupby("nodo")
+    max_lift = por_nodo["peso"].max().to_numpy()
+    es_consecuente = por_nodo["destino"].any().to_numpy()
+    es_antecedente = ~por_nodo["destino"].all().to_numpy()
+    rol = es_antecedente.astype(np.int8) + 2 * es_consecuente.astype(np.int8) - 1
+
+    aristas = (pd.DataFrame({"origen": codigos[:, 0], "destino": codigos[:, 1], "peso": peso})
+               .groupby(["origen", "destino"], sort=False)["peso"].max().reset_index())
+    return RedReglas(np.asarray(nodos, dtype=object), rol, max_lift, aristas["origen"].to_numpy(),
+                     aristas["destino"].to_numpy(), aristas["peso"].to_numpy())
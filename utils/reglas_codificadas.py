@@ -0,0 +1,153 @@
+###################################################################################################################
+################################ Reglas con productos como códigos enteros + diccionario ##########################
+###################################################################################################################
+
+# Las reglas se guardaban como texto "frozenset({'Banana'})" y cada consumidor las volvía a interpretar fila por
+# fila (regex en los traductores, str.strip("frozenset({})") en los gráficos 04.x, eval en 05/06 del cruce).
+# Ahora:
+# - guardar_reglas() escribe las reglas como artefacto Parquet, con antecedentes / consecuentes como listas de
+#   códigos de producto (list<int32>: offsets + códigos en Arrow) y las métricas con nombres en español
+# - los nombres viven en un diccionario de productos (product_id, product_name, product_name_es) que escriben
+#   los traductores para los productos de cada juego de reglas
+# - leer_reglas() arma las etiquetas "A, B" de cada lado con take + binary_join de Arrow sobre el arreglo de
+#   nombres indexado por código: sin parsear texto ni recorrer filas en Python
+#
+# Si todavía no existen el Parquet o el diccionario, leer_reglas_traducidas() puede leer un CSV traducido antiguo
+# (respaldo) del repositorio.
+
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from utils.artefactos import RUTA_PROCESADOS, guardar_artefacto, leer_artefacto, leer_parquet, ruta_artefacto
+
+# Columnas de association_rules() → nombres en español de los archivos de reglas
+MAPA_COLUMNAS = {
+    "antecedents": "antecedentes",
+    "consequents": "consecuentes",
+    "antecedent support": "soporte antecedente",
+    "consequent support": "soporte consecuente",
+    "support": "soporte",
+    "confidence": "confianza",
+    "lift": "elevacion",
+    "representativity": "representatividad",
+    "leverage": "apalancamiento",
+    "conviction": "conviccion",
+    "zhangs_metric": "metrica_zhang",
+    "jaccard": "jaccard",
+    "certainty": "certeza",
+    "kulczynski": "kulczynski",
+}
+
+COLUMNAS_ITEMS = ["antecedentes", "consecuentes"]
+
+# Columnas de un archivo de reglas: las de association_rules() más la significancia (mineria/significancia.py)
+COLUMNAS_REGLAS = [*MAPA_COLUMNAS.values(), "p_value", "q_value"]
+
+
+def guardar_reglas(reglas: pd.DataFrame, nombre: str, ruta: str = RUTA_PROCESADOS, exportar_csv: bool = False) -> str:
+    """
+    Guarda reglas de association_rules() cuyos itemsets son códigos de producto (o listas de códigos).
+    """
+    df = reglas.rename(columns=MAPA_COLUMNAS)
+    for col in [c for c in COLUMNAS_ITEMS if c in df]:
+        df[col] = pd.Series([np.sort(np.fromiter(s, dtype=np.int32, count=len(s))) for s in df[col]],
+                            index=df.index, dtype=object)
+    esquema = None
+    if df.empty:
+        # Sin filas no se puede inferir el tipo de las listas: se fija list<int32> como en un archivo con reglas
+        esquema = pa.Schema.from_pandas(df, preserve_index=False)
+        for col in [c for c in COLUMNAS_ITEMS if c in df]:
+            esquema = esquema.set(esquema.get_field_index(col), pa.field(col, pa.list_(pa.int32())))
+    return guardar_artefacto(df, nombre, ruta, exportar_csv=exportar_csv, esquema=esquema)
+
+
+def reglas_vacias() -> pd.DataFrame:
+    """
+    Tabla de reglas sin filas con las columnas de un archivo de reglas (itemsets como object, métricas float64).
+    """
+    return pd.DataFrame({col: pd.Series(dtype=object if col in COLUMNAS_ITEMS else np.float64)
+                         for col in COLUMNAS_REGLAS})
+
+
+def _listas(tabla: pa.Table, col: str) -> pa.ListArray:
+    return tabla[col].combine_chunks().cast(pa.list_(pa.int32()))
+
+
+def codigos_en_reglas(nombre: str, ruta: str = RUTA_PROCESADOS) -> np.ndarray:
+    """
+    Códigos de producto (ordenados, sin repetir) que aparecen en algún antecedente o consecuente.
+    """
+    tabla = leer_parquet(ruta_artefacto(nombre, ruta), COLUMNAS_ITEMS)
+    return np.unique(np.concatenate([pc.list_flatten(_listas(tabla, col)).to_numpy() for col in COLUMNAS_ITEMS]))
+
+
+def nombres_diccionario(nombre: str, idioma: str = "es", ruta: str = RUTA_PROCESADOS) -> np.ndarray:
+    """
+    Arreglo de nombres indexado por código de producto desde un diccionario (product_id, product_name,
+    product_name_es). Los productos sin traducción quedan con el nombre original.
+    """
+    dicc = leer_artefacto(nombre, ruta=ruta)
+    textos = dicc["product_name"]
+    if idioma == "es" and "product_name_es" in dicc:
+        textos = dicc["product_name_es"].fillna(textos)
+    nombres = np.full(int(np.max(dicc["product_id"].to_numpy(), initial=-1)) + 1, None, dtype=object)
+    nombres[dicc["product_id"].to_numpy()] = textos.astype(str).to_numpy()
+    return nombres
+
+
+def _leer_respaldo(nombre: str, columnas: list, listas: bool, ruta: str) -> pd.DataFrame:
+    """
+    CSV traducido antiguo ("frozenset({'A', 'B'})" como texto) con el mismo formato que leer_reglas().
+    """
+    df = pd.read_csv(ruta_artefacto(nombre, ruta, "csv"), encoding="utf-8-sig").rename(columns=MAPA_COLUMNAS)
+    for col in COLUMNAS_ITEMS:
+        items = df[col].astype(str).str.findall(r"'(.*?)'")
+        df[col] = items.str.join(", ")
+        if listas:
+            df[f"{col}_items"] = items
+    if columnas is not None:
+        df = df[[c for c in df.columns if c in columnas or c.removesuffix("_items") in columnas]]
+    return df
+
+
+def leer_reglas(nombre: str, nombres: np.ndarray = None, columnas: list = None, listas: bool = False,
+                ruta: str = RUTA_PROCESADOS) -> pd.DataFrame:
+    """
+    Lee reglas guardadas con guardar_reglas(). Con nombres (arreglo indexado por código, ej. nombres_diccionario)
+    antecedentes / consecuentes son etiquetas "A, B" y, con listas=True, también <columna>_items con los nombres
+    de cada lado; sin nombres son arreglos de códigos.
+    """
+    tabla = leer_parquet(ruta_artefacto(nombre, ruta), columnas)
+    items = [col for col in COLUMNAS_ITEMS if col in tabla.column_names]
+    df = tabla.drop(items).to_pandas()
+
+    etiquetas = None if nombres is None else pa.array(np.asarray(nombres, dtype=object), type=pa.string())
+    decodificadas = {}
+    for col in items:
+        codigos = _listas(tabla, col)
+        if etiquetas is None:
+            decodificadas[col] = codigos.to_pandas()
+            continue
+        offsets = np.zeros(len(codigos) + 1, dtype=np.int32)
+        np.cumsum(pc.list_value_length(codigos).to_numpy(zero_copy_only=False), out=offsets[1:])
+        textos = pa.ListArray.from_arrays(pa.array(offsets), etiquetas.take(pc.list_flatten(codigos)))
+        decodificadas[col] = pc.binary_join(textos, ", ").to_pandas()
+        if listas:
+            decodificadas[f"{col}_items"] = textos.to_pandas()
+    return pd.concat([pd.DataFrame(decodificadas, index=df.index), df], axis=1)
+
+
+def leer_reglas_traducidas(nombre: str, diccionario: str, columnas: list = None, listas: bool = False,
+                           ruta: str = RUTA_PROCESADOS, respaldo: str = None) -> pd.DataFrame:
+    """
+    leer_reglas() con los nombres en español del diccionario. Si faltan las reglas o el diccionario y se indica
+    respaldo, lee ese CSV traducido antiguo.
+    """
+    # Solo Parquet: los CSV antiguos con el mismo nombre tienen los productos como texto
+    if respaldo is not None and not all(os.path.exists(ruta_artefacto(n, ruta)) for n in (nombre, diccionario)):
+        return _leer_respaldo(respaldo, columnas, listas, ruta)
+    return leer_reglas(nombre, nombres_diccionario(diccionario, ruta=ruta), columnas, listas, ruta)
@@ -0,0 +1,126 @@
+###################################################################################################################
+############################ Preprocesamiento en streaming (sin la tabla ancha full_data) #########################
+###################################################################################################################
+
+# El preprocesamiento completo une products, aisles, departments y orders sobre las 32M filas de
+# order_products__prior (15 columnas) para luego quedarse con dos proyecciones angostas:
+# - 01. transacciones_apriori: order_id, product_name
+# - 02. clientes_clustering: user_id, order_id, order_number, order_dow, order_hour_of_day,
+#                            days_since_prior_order, department
+#
+# Aquí order_products__prior se procesa por bloques. Cada bloque se une mediante arreglos de búsqueda densos
+# indexados por product_id y por order_id (un acceso por posición, sin merge por hash) y ambas salidas,
+# junto con el almacén binario de transacciones, se escriben de forma incremental.
+#
+# Como el modo completo (drop_duplicates sobre full_data), se descartan las líneas repetidas: misma fila de
+# order_products__prior (order_id, product_id, add_to_cart_order, reordered; el resto de full_data sale de ellas).
+# Las repetidas se buscan dentro de cada bloque y contra las líneas de la última orden del bloque anterior, que
+# puede quedar partida entre dos bloques: alcanza porque order_products__prior viene agrupado por order_id.
+
+import numpy as np
+import pandas as pd
+
+from utils.ingesta import leer_tabla, leer_bloques, PATH_DATOS, PRESUPUESTO_MB
+from utils.artefactos import EscritorArtefacto, RUTA_PROCESADOS
+from utils.transacciones import ConstructorAlmacen
+
+# Columnas de order_products__prior que identifican una línea (las que compara drop_duplicates en el modo completo)
+COLUMNAS_LINEA = ["order_id", "product_id", "add_to_cart_order", "reordered"]
+
+
+def _busqueda_densa(claves: np.ndarray, valores: np.ndarray, relleno, dtype) -> np.ndarray:
+    """
+    Arreglo indexado por clave: busqueda[clave] = valor, y relleno en las claves que no existen.
+    """
+    busqueda = np.full(int(claves.max()) + 1, relleno, dtype=dtype)
+    busqueda[claves] = valores
+    return busqueda
+
+
+def preprocesar_en_streaming(path: str = PATH_DATOS, output_path: str = RUTA_PROCESADOS,
+                             presupuesto_mb: float = PRESUPUESTO_MB, exportar_csv: bool = False) -> None:
+    """
+    Genera 01. transacciones_apriori, 02. clientes_clustering y 01b. almacen_transacciones/
+    leyendo order_products__prior por bloques.
+    """
+    orders = leer_tabla("orders", path, presupuesto_mb)
+    products = leer_tabla("products", path, presupuesto_mb)
+    departments = leer_tabla("departments", path, presupuesto_mb)
+
+    # 🧭 Búsquedas por product_id: código de nombre y código de departamento
+    nombres = products["product_name"].cat.categories
+    pid = products["product_id"].to_numpy()
+    codigo_nombre = _busqueda_densa(pid, products["product_name"].cat.codes.to_numpy(), -1, np.int32)
+
+    departamentos = departments["department"].cat.categories
+    codigo_dept_por_id = _busqueda_densa(
+        departments["department_id"].to_numpy(), departments["department"].cat.codes.to_numpy(), -1, np.int16
+    )
+    dept_id = products["department_id"].to_numpy().astype(np.int64)
+    codigo_dept = _busqueda_densa(pid, codigo_dept_por_id[dept_id], -1, np.int16)
+
+    # 🧭 Búsqueda por order_id: fila de la orden en orders
+    fila_orden = _busqueda_densa(orders["order_id"].to_numpy(), np.arange(len(orders)), -1, np.int64)
+    columnas_orden = {
+        col: orders[col].to_numpy()
+        for col in ["user_id", "order_number", "order_dow", "order_hour_of_day", "days_since_prior_order"]
+    }
+
+    escritor_apriori = EscritorArtefacto("01. transacciones_apriori", output_path, exportar_csv)
+    escritor_clustering = EscritorArtefacto("02. clientes_clustering", output_path, exportar_csv)
+    constructor = ConstructorAlmacen(output_path + "01b. almacen_transacciones/")
+
+    n_lineas = 0
+    n_repetidas = 0
+    cola = None  # líneas de la última orden del bloque anterior
+    for bloque in leer_bloques("order_products__prior", path, presupuesto_mb):
+        lineas = bloque[COLUMNAS_LINEA]
+        del bloque
+        order_id = lineas["order_id"].to_numpy()
+        product_id = lineas["product_id"].to_numpy()
+
+        # 🧼 Igual que el modo completo: se descartan líneas sin nombre de producto (o sin orden conocida)
+        en_rango_p = product_id < len(codigo_nombre)
+        en_rango_o = order_id < len(fila_orden)
+        cod_nombre = np.where(en_rango_p, codigo_nombre[np.where(en_rango_p, product_id, 0)], -1)
+        fila = np.where(en_rango_o, fila_orden[np.where(en_rango_o, order_id, 0)], -1)
+        validas = (cod_nombre >= 0) & (fila >= 0)
+
+        # 🧼 Líneas repetidas (dentro del bloque o de la orden que viene del bloque anterior)
+        lineas = lineas[validas]
+        previas = 0 if cola is None else len(cola)
+        repetidas = (lineas if cola is None else pd.concat([cola, lineas])).duplicated().to_numpy()[previas:]
+        lineas = lineas[~repetidas]
+        if len(lineas):
+            cola = lineas[lineas["order_id"].to_numpy() == lineas["order_id"].iloc[-1]]
+        n_repetidas += int(repetidas.sum())
+        validas[validas] = ~repetidas
+
+        order_id, product_id = order_id[validas], product_id[validas]
+        cod_nombre, fila = cod_nombre[validas], fila[validas]
+
+        escritor_apriori.escribir(pd.DataFrame({
+            "order_id": order_id,
+            "product_name": pd.Categorical.from_codes(cod_nombre, categories=nombres),
+        }))
+
+        escritor_clustering.escribir(pd.DataFrame({
+            "user_id": columnas_orden["user_id"][fila],
+            "order_id": order_id,
+            "order_number": columnas_orden["order_number"][fila],
+            "order_dow": columnas_orden["order_dow"][fila],
+            "order_hour_of_day": columnas_orden["order_hour_of_day"][fila],
+            "days_since_prior_order": columnas_orden["days_since_prior_order"][fila],
+            "department": pd.Categorical.from_codes(codigo_dept[product_id], categories=departamentos),
+        }))
+
+        constructor.agregar(order_id, product_id)
+        n_lineas += len(order_id)
+
+    escritor_apriori.cerrar()
+    escritor_clustering.cerrar()
+    print(f"📤 Exportado (streaming): 01. transacciones_apriori.parquet y 02. clientes_clustering.parquet "
+          f"({n_lineas:,} líneas, {n_repetidas:,} repetidas descartadas)")
+
+    almacen = constructor.finalizar(orders, products)
+    print(f"📤 Exportado: 01b. almacen_transacciones/ ({almacen.n_ordenes:,} órdenes, {almacen.meta['n_lineas']:,} líneas)")
@@ -0,0 +1,240 @@
+###################################################################################################################
+############################# Servicio de traducción con caché persistente (SQLite) ###############################
+###################################################################################################################
+
+# Los dos traductores (03. traductor_reglas_apriori.py y 04. traducir_resumen_reglas_clusters.py) creaban su propio
+# GoogleTranslator y traducían cada producto con una llamada síncrona, en cada corrida. Este módulo los reúne:
+# - caché en disco (SQLite) por texto de origen e idiomas: un nombre ya traducido nunca se vuelve a pedir
+# - los textos que faltan se envían en lotes a un pool de hilos, con un límite de llamadas por segundo compartido
+#   entre los hilos: cada servicio espera su turno justo antes de cada llamada remota
+# - el servicio remoto es intercambiable: ServicioGoogle (deep_translator) o ServicioDiccionario (sin red, para
+#   pruebas o para completar a mano)
+#
+# Si una llamada falla se devuelve el texto original y no se guarda en la caché, así la próxima corrida lo reintenta.
+#
+# El catálogo completo se traduce una vez (01.1 traduccion_catalogo.py → "01c. catalogo_traducido"); con él,
+# diccionario_productos() resuelve los productos de un archivo de reglas con una búsqueda por código y solo manda al
+# servicio los que el catálogo todavía no tiene traducidos.
+
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from utils.artefactos import RUTA_PROCESADOS, leer_artefacto, ruta_artefacto
+from utils.transacciones import AlmacenTransacciones
+
+RUTA_CACHE = os.path.join(RUTA_PROCESADOS, "cache_traducciones.sqlite")
+CATALOGO_TRADUCIDO = "01c. catalogo_traducido"
+
+
+class ServicioTraduccion(ABC):
+    """
+    Interfaz de los servicios: traducir_lote() recibe una lista de textos y devuelve sus traducciones en el mismo
+    orden (None donde no pudo traducir). Con limite, llama a limite.esperar() antes de cada llamada remota.
+    """
+
+    def __init__(self, origen: str = "en", destino: str = "es"):
+        self.origen = origen
+        self.destino = destino
+
+    @abstractmethod
+    def traducir_lote(self, textos: list, limite: "LimiteLlamadas" = None) -> list:
+        ...
+
+
+class ServicioGoogle(ServicioTraduccion):
+    """
+    Google Translate a través de deep_translator (una llamada por texto), con un GoogleTranslator por hilo.
+    """
+
+    def __init__(self, origen: str = "en", destino: str = "es"):
+        super().__init__(origen, destino)
+        # Import local: deep_translator solo hace falta si se traduce en línea
+        from deep_translator import GoogleTranslator
+        self._clase = GoogleTranslator
+        self._por_hilo = threading.local()
+
+    def _traductor(self):
+        # GoogleTranslator no es seguro entre hilos: translate() modifica sus parámetros de la petición antes de
+        # enviarla, así que cada hilo del pool usa el suyo
+        traductor = getattr(self._por_hilo, "traductor", None)
+        if traductor is None:
+            traductor = self._por_hilo.traductor = self._clase(source=self.origen, target=self.destino)
+        return traductor
+
+    def traducir_lote(self, textos: list, limite: "LimiteLlamadas" = None) -> list:
+        traductor = self._traductor()
+        traducciones = []
+        for texto in textos:
+            if limite is not None:
+                limite.esperar()
+            try:
+                traducciones.append(traductor.translate(texto))
+            except Exception:
+                traducciones.append(None)  # fallback en caso de error de la API
+        return traducciones
+
+
+class ServicioDiccionario(ServicioTraduccion):
+    """
+    Traducciones desde un diccionario en memoria, sin red. Los textos que no están quedan sin traducir.
+    """
+
+    def __init__(self, diccionario: dict = None, origen: str = "en", destino: str = "es"):
+        super().__init__(origen, destino)
+        self.diccionario = dict(diccionario or {})
+
+    def traducir_lote(self, textos: list, limite: "LimiteLlamadas" = None) -> list:
+        # Sin llamadas remotas: el límite no aplica
+        return [self.diccionario.get(texto) for texto in textos]
+
+
+class CacheTraducciones:
+    """
+    Traducciones ya obtenidas, por (origen, destino, texto), en un archivo SQLite.
+    """
+
+    def __init__(self, ruta: str = RUTA_CACHE):
+        self.ruta = ruta
+        if os.path.dirname(ruta):
+            os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        with self._conectar() as conexion:
+            conexion.execute("CREATE TABLE IF NOT EXISTS traducciones (origen TEXT, destino TEXT, texto TEXT, "
+                             "traduccion TEXT, PRIMARY KEY (origen, destino, texto))")
+
+    def _conectar(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.ruta)
+
+    def buscar(self, textos: list, origen: str, destino: str) -> dict:
+        """
+        {texto: traducción} de los textos que ya están en la caché.
+        """
+        encontrados = {}
+        conexion = self._conectar()
+        try:
+            # SQLite limita la cantidad de parámetros por consulta
+            for inicio in range(0, len(textos), 500):
+                parte = textos[inicio:inicio + 500]
+                filas = conexion.execute(
+                    f"SELECT texto, traduccion FROM traducciones WHERE origen = ? AND destino = ? "
+                    f"AND texto IN ({', '.join('?' * len(parte))})", [origen, destino, *parte])
+                encontrados.update(filas)
+        finally:
+            conexion.close()
+        return encontrados
+
+    def guardar(self, traducciones: dict, origen: str, destino: str) -> None:
+        with self._conectar() as conexion:
+            conexion.executemany("INSERT OR REPLACE INTO traducciones VALUES (?, ?, ?, ?)",
+                                 [(origen, destino, texto, t) for texto, t in traducciones.items()])
+
+
+class LimiteLlamadas:
+    """
+    Espaciado mínimo entre llamadas, compartido por todos los hilos.
+    """
+
+    def __init__(self, por_segundo: float):
+        self.intervalo = 1.0 / por_segundo if por_segundo else 0.0
+        self._siguiente = 0.0
+        self._candado = threading.Lock()
+
+    def esperar(self) -> None:
+        with self._candado:
+            ahora = time.monotonic()
+            turno = max(ahora, self._siguiente)
+            self._siguiente = turno + self.intervalo
+        if turno > ahora:
+            time.sleep(turno - ahora)
+
+
+class Traductor:
+    """
+    Traduce listas de textos: primero la caché, y solo lo que falta al servicio, en lotes concurrentes.
+    """
+
+    def __init__(self, servicio: ServicioTraduccion = None, cache: CacheTraducciones = None, hilos: int = 8,
+                 por_segundo: float = 5.0, tamaño_lote: int = 20):
+        self.servicio = servicio if servicio is not None else ServicioGoogle()
+        self.cache = cache if cache is not None else CacheTraducciones()
+        self.hilos = hilos
+        self.tamaño_lote = tamaño_lote
+        self.limite = LimiteLlamadas(por_segundo)
+        self.llamadas = 0
+
+    def _traducir_lote(self, textos: list) -> list:
+        # El servicio espera su turno antes de cada llamada remota (ServicioGoogle hace una por texto), así el
+        # límite se reparte entre los hilos llamada a llamada y no se reserva un lote entero de una vez
+        return self.servicio.traducir_lote(textos, self.limite)
+
+    def buscar(self, textos) -> list:
+        """
+        Traducciones que ya están en la caché, sin llamar al servicio (None donde falta).
+        """
+        textos = [str(t) for t in textos]
+        traducidos = self.cache.buscar(list(dict.fromkeys(textos)), self.servicio.origen, self.servicio.destino)
+        return [traducidos.get(t) for t in textos]
+
+    def traducir(self, textos) -> list:
+        """
+        Traducciones de los textos en el mismo orden. Los que no se pudieron traducir quedan como el original.
+        """
+        textos = [str(t) for t in textos]
+        unicos = list(dict.fromkeys(textos))
+        origen, destino = self.servicio.origen, self.servicio.destino
+
+        traducidos = self.cache.buscar(unicos, origen, destino)
+        faltantes = [t for t in unicos if t not in traducidos]
+        if faltantes:
+            lotes = [faltantes[i:i + self.tamaño_lote] for i in range(0, len(faltantes), self.tamaño_lote)]
+            with ThreadPoolExecutor(max_workers=self.hilos) as pool:
+                # La caché se escribe desde este hilo a medida que terminan los lotes
+                for lote, resultado in zip(lotes, pool.map(self._traducir_lote, lotes)):
+                    nuevos = {texto: t for texto, t in zip(lote, resultado) if t}
+                    self.cache.guardar(nuevos, origen, destino)
+                    traducidos.update(nuevos)
+            self.llamadas += len(faltantes)
+
+        print(f"🌐 {len(unicos):,} textos: {len(unicos) - len(faltantes):,} desde la caché, "
+              f"{len(faltantes):,} enviados al servicio ({len(faltantes) - sum(t in traducidos for t in faltantes):,} "
+              f"sin traducir)")
+        return [traducidos.get(t, t) for t in textos]
+
+
+def _por_codigo(codigos: np.ndarray, valores: np.ndarray, largo: int) -> np.ndarray:
+    arreglo = np.full(largo, None, dtype=object)
+    arreglo[codigos] = valores
+    return arreglo
+
+
+def diccionario_productos(codigos, traductor: Traductor = None, ruta: str = RUTA_PROCESADOS) -> pd.DataFrame:
+    """
+    Diccionario (product_id, product_name, product_name_es) de los códigos de producto indicados, buscados en el
+    catálogo traducido. Solo los que el catálogo no tiene traducidos (o todos, si aún no existe) pasan por el
+    traductor.
+    """
+    codigos = np.asarray(codigos, dtype=np.int64)
+    if os.path.exists(ruta_artefacto(CATALOGO_TRADUCIDO, ruta)):
+        catalogo = leer_artefacto(CATALOGO_TRADUCIDO, ["product_id", "product_name", "product_name_es"], ruta)
+        ids = catalogo["product_id"].to_numpy()
+        largo = int(max(ids.max(initial=-1), codigos.max(initial=-1))) + 1
+        ingles = _por_codigo(ids, catalogo["product_name"].astype(str).to_numpy(), largo)
+        espanol = _por_codigo(ids, catalogo["product_name_es"].astype(object).to_numpy(), largo)
+    else:
+        ingles = AlmacenTransacciones().nombres_productos()
+        espanol = np.full(len(ingles), None, dtype=object)
+
+    diccionario = pd.DataFrame({"product_id": codigos, "product_name": ingles[codigos],
+                                "product_name_es": espanol[codigos]})
+    faltan = diccionario["product_name_es"].isna().to_numpy()
+    print(f"🔎 {len(diccionario) - faltan.sum():,} de {len(diccionario):,} productos desde el catálogo traducido")
+    if faltan.any():
+        traductor = traductor if traductor is not None else Traductor()
+        diccionario.loc[faltan, "product_name_es"] = traductor.traducir(diccionario.loc[faltan, "product_name"])
+    return diccionario
@@ -0,0 +1,235 @@
+###################################################################################################################
+############################ Almacén binario de transacciones (CSR en memoria mapeada) ############################
+###################################################################################################################
+
+# La estructura de cestas (orden → lista de productos) se reconstruía en cada etapa desde filas largas:
+# groupby(...).apply(list) en Apriori y listas guardadas como texto + ast.literal_eval en el cruce por clúster.
+#
+# Este módulo la construye una sola vez en el preprocesamiento, en formato CSR:
+# - offsets.npy   (int64, n_ordenes + 1): la cesta i ocupa productos[offsets[i]:offsets[i + 1]]
+# - productos.npy (int32): códigos de producto (= product_id), ordenados dentro de cada cesta
+# - arreglos laterales por orden: order_id, user_id, cluster (-1 sin asignar), dow y hora
+# - productos.parquet: diccionario product_id → product_name
+#
+# Todos los .npy se abren con np.load(mmap_mode="r"), así que cada cesta es una vista sin copia.
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from utils.artefactos import guardar_artefacto, leer_artefacto
+
+RUTA_ALMACEN = "./data/procesados/01b. almacen_transacciones/"
+
+ARREGLOS = ["offsets", "productos", "order_id", "user_id", "cluster", "dow", "hora"]
+
+
+def _guardar(ruta: str, nombre: str, arreglo: np.ndarray) -> None:
+    np.save(os.path.join(ruta, f"{nombre}.npy"), arreglo)
+
+
+def agrupar_cestas(order_id: np.ndarray, product_id: np.ndarray):
+    """
+    Líneas orden-producto (formato largo) → (ids de orden, offsets, productos) en CSR, con las órdenes por
+    order_id y los productos ordenados dentro de cada cesta.
+    """
+    order_id = np.asarray(order_id, dtype=np.int32)
+    product_id = np.asarray(product_id, dtype=np.int32)
+
+    # 🔢 Orden por (order_id, product_id): cesta contigua y productos ordenados dentro de cada cesta
+    orden = np.lexsort((product_id, order_id))
+    order_id = order_id[orden]
+    productos = product_id[orden]
+    del orden
+
+    ids, conteos = np.unique(order_id, return_counts=True)
+    offsets = np.zeros(len(ids) + 1, dtype=np.int64)
+    np.cumsum(conteos, out=offsets[1:])
+    return ids, offsets, productos
+
+
+def construir_almacen(order_id: np.ndarray, product_id: np.ndarray, orders: pd.DataFrame,
+                      products: pd.DataFrame, ruta: str = RUTA_ALMACEN) -> "AlmacenTransacciones":
+    """
+    Construye el almacén a partir de las líneas orden-producto (formato largo).
+    orders aporta user_id, order_dow y order_hour_of_day por orden; products el nombre de cada product_id.
+    """
+    os.makedirs(ruta, exist_ok=True)
+
+    ids, offsets, productos = agrupar_cestas(order_id, product_id)
+
+    # 🧭 Arreglos laterales por orden mediante un arreglo de búsqueda denso indexado por order_id
+    posicion = np.full(int(max(ids.max(), orders["order_id"].max())) + 1, -1, dtype=np.int64)
+    posicion[orders["order_id"].to_numpy()] = np.arange(len(orders))
+    fila = posicion[ids]
+    del posicion
+
+    def lateral(columna, dtype, relleno):
+        valores = orders[columna].to_numpy()
+        salida = np.full(len(ids), relleno, dtype=dtype)
+        validas = fila >= 0
+        salida[validas] = valores[fila[validas]]
+        return salida
+
+    _guardar(ruta, "offsets", offsets)
+    _guardar(ruta, "productos", productos)
+    _guardar(ruta, "order_id", ids.astype(np.int32))
+    _guardar(ruta, "user_id", lateral("user_id", np.int32, -1))
+    _guardar(ruta, "dow", lateral("order_dow", np.int8, -1))
+    _guardar(ruta, "hora", lateral("order_hour_of_day", np.int8, -1))
+    _guardar(ruta, "cluster", np.full(len(ids), -1, dtype=np.int8))
+
+    guardar_artefacto(products[["product_id", "product_name"]], "productos", ruta)
+
+    with open(os.path.join(ruta, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump({
+            "n_ordenes": int(len(ids)),
+            "n_lineas": int(len(productos)),
+            "n_codigos": int(max(productos.max(), products["product_id"].max())) + 1,
+        }, f, indent=2)
+
+    return AlmacenTransacciones(ruta)
+
+
+class ConstructorAlmacen:
+    """
+    Construcción incremental del almacén: los bloques (order_id, product_id) se agregan a archivos binarios
+    temporales y el CSR se arma al final, sin tener nunca la tabla ancha en memoria.
+    """
+
+    def __init__(self, ruta: str = RUTA_ALMACEN):
+        os.makedirs(ruta, exist_ok=True)
+        self.ruta = ruta
+        self._rutas_tmp = [os.path.join(ruta, "order_id.tmp"), os.path.join(ruta, "product_id.tmp")]
+        self._archivos = [open(r, "wb") for r in self._rutas_tmp]
+
+    def agregar(self, order_id: np.ndarray, product_id: np.ndarray) -> None:
+        self._archivos[0].write(np.asarray(order_id, dtype=np.int32).tobytes())
+        self._archivos[1].write(np.asarray(product_id, dtype=np.int32).tobytes())
+
+    def finalizar(self, orders: pd.DataFrame, products: pd.DataFrame) -> "AlmacenTransacciones":
+        for f in self._archivos:
+            f.close()
+        order_id = np.fromfile(self._rutas_tmp[0], dtype=np.int32)
+        product_id = np.fromfile(self._rutas_tmp[1], dtype=np.int32)
+        almacen = construir_almacen(order_id, product_id, orders, products, self.ruta)
+        del order_id, product_id
+        for r in self._rutas_tmp:
+            os.remove(r)
+        return almacen
+
+
+class AlmacenTransacciones:
+    """
+    Acceso de solo lectura (memoria mapeada) al almacén CSR de cestas.
+    """
+
+    def __init__(self, ruta: str = RUTA_ALMACEN):
+        self.ruta = ruta
+        with open(os.path.join(ruta, "meta.json"), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self._abrir()
+
+    def _abrir(self) -> None:
+        for nombre in ARREGLOS:
+            setattr(self, nombre, np.load(os.path.join(self.ruta, f"{nombre}.npy"), mmap_mode="r"))
+
+    def _cerrar(self) -> None:
+        # En Windows no se puede reemplazar un archivo mientras siga mapeado
+        for nombre in ARREGLOS:
+            setattr(self, nombre, None)
+
+    @property
+    def n_ordenes(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def n_codigos(self) -> int:
+        return self.meta["n_codigos"]
+
+    def tamaños(self) -> np.ndarray:
+        """
+        Cantidad de productos de cada cesta.
+        """
+        return np.diff(self.offsets)
+
+    def cesta(self, i: int) -> np.ndarray:
+        """
+        Códigos de producto de la orden i (vista sin copia).
+        """
+        return self.productos[self.offsets[i]:self.offsets[i + 1]]
+
+    def cestas(self, indices=None):
+        """
+        Itera las cestas (vistas sin copia) de las órdenes indicadas, o de todas si indices es None.
+        """
+        if indices is None:
+            indices = range(self.n_ordenes)
+        offsets, productos = self.offsets, self.productos
+        for i in indices:
+            yield productos[offsets[i]:offsets[i + 1]]
+
+    def subconjunto(self, indices: np.ndarray):
+        """
+        Devuelve (offsets, productos) de un subconjunto de órdenes como un nuevo par CSR compacto.
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        inicios = self.offsets[indices]
+        largos = self.offsets[indices + 1] - inicios
+        offsets = np.zeros(len(indices) + 1, dtype=np.int64)
+        np.cumsum(largos, out=offsets[1:])
+        # Posición de cada línea en el arreglo original: inicio de su cesta + desplazamiento dentro de ella
+        desplazamiento = np.arange(offsets[-1], dtype=np.int64) - np.repeat(offsets[:-1], largos)
+        productos = np.asarray(self.productos)[np.repeat(inicios, largos) + desplazamiento]
+        return offsets, productos
+
+    def muestra_top(self, n_productos: int = 100, n_ordenes: int = 20000):
+        """
+        Muestra del flujo Apriori original: las primeras n_ordenes órdenes (por order_id) con algún producto del
+        top n_productos, conservando solo esos productos. Devuelve (offsets, productos) en CSR.
+        """
+        frecuencias = np.bincount(self.productos, minlength=self.n_codigos)
+        es_frecuente = np.zeros(self.n_codigos, dtype=bool)
+        es_frecuente[np.argsort(-frecuencias, kind="stable")[:n_productos]] = True
+
+        lineas_frecuentes = es_frecuente[self.productos]
+        ordenes = np.flatnonzero(np.add.reduceat(lineas_frecuentes, self.offsets[:-1]) > 0)[:n_ordenes]
+
+        offsets, productos = self.subconjunto(ordenes)
+        mantener = es_frecuente[productos]
+        fila = np.repeat(np.arange(len(ordenes)), np.diff(offsets))[mantener]
+        nuevos = np.zeros(len(ordenes) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(fila, minlength=len(ordenes)), out=nuevos[1:])
+        return nuevos, productos[mantener]
+
+    def nombres_productos(self) -> np.ndarray:
+        """
+        Arreglo de nombres indexado por código de producto (posiciones sin producto quedan en None).
+        """
+        dicc = leer_artefacto("productos", ruta=self.ruta)
+        nombres = np.full(self.n_codigos, None, dtype=object)
+        nombres[dicc["product_id"].to_numpy()] = dicc["product_name"].astype(str).to_numpy()
+        return nombres
+
+    def ordenes_de_cluster(self, cluster_id: int) -> np.ndarray:
+        """
+        Índices de las órdenes cuyo usuario pertenece al clúster indicado.
+        """
+        return np.flatnonzero(np.asarray(self.cluster) == cluster_id)
+
+    def asignar_clusters(self, user_id: np.ndarray, cluster: np.ndarray) -> None:
+        """
+        Escribe el arreglo lateral cluster a partir de la asignación usuario → clúster.
+        Las órdenes de usuarios sin clúster quedan en -1.
+        """
+        user_id = np.asarray(user_id, dtype=np.int64)
+        usuarios = np.asarray(self.user_id)
+        busqueda = np.full(int(max(user_id.max(), usuarios.max())) + 1, -1, dtype=np.int8)
+        busqueda[user_id] = np.asarray(cluster, dtype=np.int8)
+        nuevo = np.where(usuarios >= 0, busqueda[np.maximum(usuarios, 0)], -1).astype(np.int8)
+
+        self._cerrar()
+        _guardar(self.ruta, "cluster", nuevo)
+        self._abrir()